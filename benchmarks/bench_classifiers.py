@@ -0,0 +1,96 @@
+"""
+Reconocedores por reglas vs clasificador aprendido
+Evalúa cada reconocedor sobre un archivo de muestras etiquetadas y reporta
+exactitud (sobre las etiquetas que ese reconocedor conoce) y latencia por
+mano, incluida la inferencia en lote del modelo.
+
+Uso: python benchmarks/bench_classifiers.py --data data/samples.npz [--model models/landmark_classifier.npz]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.hand_features import extract_features  # noqa: E402
+from utils.landmark_classifier import DEFAULT_MODEL_PATH, NONE_LABEL, LearnedRecognizer  # noqa: E402
+from utils.samples import load_samples  # noqa: E402
+
+
+def rule_recognizers():
+    """Reconocedores por reglas de cada app como funciones features -> símbolo"""
+    import main
+    import main2
+    import program
+
+    recognizers = {
+        'main.py (reglas)': main.SignLanguageRecognizer().recognize,
+        'main2.py (reglas)': main2.SignLanguageRecognizer().recognize_letter,
+    }
+    program_recognizer = program.SignLanguageRecognizer()
+    recognizers['program.py (reglas)'] = lambda f: program_recognizer.recognize_letter(f)[0]
+    return recognizers
+
+
+def evaluate(recognize, features, labels, known):
+    """Exactitud sobre las muestras con etiqueta conocida y µs por mano"""
+    predictions = []
+    t0 = time.perf_counter()
+    for f in features:
+        predictions.append(recognize(f) or NONE_LABEL)
+    elapsed = time.perf_counter() - t0
+
+    mask = np.isin(labels, list(known))
+    predictions = np.array(predictions)
+    accuracy = float((predictions[mask] == labels[mask]).mean()) if mask.any() else float('nan')
+    return accuracy, int(mask.sum()), elapsed / len(features) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exactitud y latencia de los reconocedores")
+    parser.add_argument('--data', default=os.path.join('data', 'samples.npz'))
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--batch', type=int, default=2, help="manos por llamada en lote")
+    args = parser.parse_args()
+
+    points, labels = load_samples(args.data)
+    features = [extract_features(p) for p in points]
+    all_labels = set(labels)
+    print(f"{len(labels)} muestras, {len(all_labels)} etiquetas")
+
+    rows = []
+    try:
+        recognizers = rule_recognizers()
+    except ImportError as e:
+        print(f"No se pudieron importar las apps ({e}); solo se evalúa el modelo")
+        recognizers = {}
+    for name, recognize in recognizers.items():
+        # Las reglas no declaran su alfabeto: se evalúan sobre todas las etiquetas
+        rows.append((name, *evaluate(recognize, features, labels, all_labels), None))
+
+    if os.path.exists(args.model):
+        learned = LearnedRecognizer.load(args.model)
+        known = set(learned.classifier.labels.tolist())
+        accuracy, count, single_us = evaluate(learned.recognize, features, labels, known)
+
+        t0 = time.perf_counter()
+        for start in range(0, len(points), args.batch):
+            learned.recognize_batch(list(points[start:start + args.batch]))
+        batch_us = (time.perf_counter() - t0) / len(points) * 1e6
+        rows.append(('modelo (NumPy)', accuracy, count, single_us, batch_us))
+    else:
+        print(f"Sin modelo en {args.model}: entrenar con tools/train_classifier.py")
+
+    print(f"{'reconocedor':<22} {'exactitud':>9} {'muestras':>9} {'µs/mano':>9} {'µs/mano lote':>13}")
+    for name, accuracy, count, single_us, batch_us in rows:
+        batch = f"{batch_us:13.1f}" if batch_us is not None else f"{'-':>13}"
+        print(f"{name:<22} {accuracy:9.3f} {count:9d} {single_us:9.1f} {batch}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Abrir el historial: JSON sueltos vs base indexada
+Crea N sesiones en un directorio temporal y mide lo que cuesta mostrar la
+primera página del historial: con los session_*.json (listar, abrir y
+ordenar todos) y con SessionStore (una consulta por índice).
+
+Uso: python benchmarks/bench_history.py [--sessions 10 1000 20000] [--page 20]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.session_store import SessionStore  # noqa: E402
+
+
+def fake_sessions(n, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    for i in range(n):
+        t = start + timedelta(minutes=rng.randrange(0, 60 * 24 * 365))
+        yield {
+            'start_time': t.isoformat(),
+            'end_time': (t + timedelta(minutes=5)).isoformat(),
+            'text': ''.join(rng.choice('ABCDEFGHILOUVWY ') for _ in range(rng.randrange(5, 40))),
+            'letters_detected': rng.randrange(5, 40),
+            'accuracy': rng.uniform(60, 95),
+        }
+
+
+def load_json_dir(directory):
+    """La carga anterior: todos los archivos, ordenados en memoria"""
+    sessions = []
+    for filename in os.listdir(directory):
+        if filename.endswith('.json'):
+            with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                sessions.append(json.load(f))
+    return sorted(sessions, key=lambda x: x.get('start_time', ''), reverse=True)
+
+
+def best_of(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo de abrir el historial según la cantidad de sesiones")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[10, 1000, 20000])
+    parser.add_argument('--page', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'sesiones':>9} {'JSON sueltos':>14} {'base indexada':>14}")
+    for n in args.sessions:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SessionStore(os.path.join(tmp, 'sessions.db'))
+            for i, session in enumerate(fake_sessions(n)):
+                with open(os.path.join(tmp, f'session_{i:07d}.json'), 'w', encoding='utf-8') as f:
+                    json.dump(session, f, indent=2)
+            store.import_json_dir(tmp)
+
+            json_s = best_of(lambda: load_json_dir(tmp)[:args.page])
+            store_s = best_of(lambda: store.page(args.page))
+            store.close()
+        print(f"{n:9d} {json_s * 1000:11.1f} ms {store_s * 1000:11.2f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Arranque en frío del clasificador: runtime NumPy vs TensorFlow
+Cada variante corre en un proceso nuevo y mide el tiempo hasta la primera
+predicción y la memoria máxima (RSS) del proceso. La variante TensorFlow
+solo corre si está instalado (requirements-train.txt).
+
+Uso: python benchmarks/bench_model_startup.py [--model models/landmark_classifier.npz] [--runs 3]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.landmark_classifier import DEFAULT_MODEL_PATH  # noqa: E402
+
+# Cada script imprime un JSON con los segundos hasta la primera predicción y el RSS máximo
+_PRELUDE = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+"""
+
+_REPORT = """
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'seconds': time.perf_counter() - t0, 'rss_mb': rss / 1024,
+                  'tensorflow': 'tensorflow' in sys.modules}))
+"""
+
+NUMPY_SCRIPT = """
+import numpy as np
+from utils.landmark_classifier import LandmarkClassifier
+classifier = LandmarkClassifier.load({model!r})
+classifier.predict(np.random.rand(1, 21, 3).astype(np.float32))
+"""
+
+KERAS_SCRIPT = """
+import numpy as np
+from tensorflow import keras
+from utils.landmark_classifier import LandmarkClassifier, normalize_landmarks
+source = LandmarkClassifier.load({model!r})
+model = keras.Sequential([keras.Input(shape=(source.layers[0][0].shape[0],))]
+                         + [keras.layers.Dense(w.shape[1], activation=a)
+                            for (w, _), a in zip(source.layers, source.activations)])
+for layer, (w, b) in zip(model.layers, source.runtime_layers):
+    layer.set_weights([w, b])
+model(normalize_landmarks(np.random.rand(1, 21, 3)), training=False).numpy()
+"""
+
+
+def run(body, model):
+    script = _PRELUDE.format(root=ROOT) + body.format(model=model) + _REPORT
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True)
+    if output.returncode != 0:
+        return None, output.stderr.strip().splitlines()[-1]
+    return json.loads(output.stdout.strip().splitlines()[-1]), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo y memoria hasta la primera predicción")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model):
+        print(f"Sin modelo en {args.model}: entrenar con tools/train_classifier.py")
+        return 1
+
+    print(f"{'runtime':<12} {'primera predicción':>19} {'RSS máx':>10} {'importa TF':>11}")
+    for name, body in (('NumPy', NUMPY_SCRIPT), ('TensorFlow', KERAS_SCRIPT)):
+        results = []
+        for _ in range(args.runs):
+            result, error = run(body, args.model)
+            if error:
+                print(f"{name:<12} no disponible: {error}")
+                break
+            results.append(result)
+        if results:
+            seconds = min(r['seconds'] for r in results)
+            rss = max(r['rss_mb'] for r in results)
+            print(f"{name:<12} {seconds * 1000:16.0f} ms {rss:7.0f} MB {str(results[0]['tensorflow']):>11}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Regresión de los reconocedores sin cámara
+Pasa un conjunto de landmarks etiquetados por el reconocedor de cada app
+(main.py, main2.py, program.py y sign.py) y reporta latencia por llamada
+(p50/p95/p99), llamadas por segundo, exactitud, exactitud por letra y la
+matriz de confusión. Con --baseline compara contra una corrida guardada con
+--save-baseline y termina con código 1 si la exactitud baja o la latencia
+sube más de lo tolerado.
+
+Datos: .npz de muestras (tools/record_samples.py) o grabaciones .slmk de
+program.py, cuya etiqueta es la letra que reconoció la app al grabar (sirve
+para detectar cambios de comportamiento, no para medir exactitud real).
+
+Uso: python benchmarks/bench_recognizers.py --data data/samples.npz [--apps main2 sign] [--save-baseline base.json | --baseline base.json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.hand_features import extract_features  # noqa: E402
+from utils.landmark_classifier import NONE_LABEL, select_recognizer  # noqa: E402
+from utils.samples import load_samples  # noqa: E402
+
+# Módulo, clase y método de reconocimiento de cada app
+APPS = {
+    'main': ('main', 'SignLanguageRecognizer', 'recognize'),
+    'main2': ('main2', 'SignLanguageRecognizer', 'recognize_letter'),
+    'program': ('program', 'SignLanguageRecognizer', 'recognize_letter'),
+    'sign': ('sign', 'SignLanguageTranslator', 'recognize_letter'),
+}
+
+PERCENTILES = (50, 95, 99)
+
+
+def load_dataset(paths):
+    """Landmarks (N, 21, 3) y etiquetas en mayúsculas de .npz de muestras y/o grabaciones .slmk"""
+    from utils.landmark_recording import LandmarkRecording
+
+    points, labels = [], []
+    for path in paths:
+        if path.endswith('.slmk'):
+            with LandmarkRecording(path) as recording:
+                for block in recording.blocks:
+                    # Primera mano de cada frame; sin símbolo reconocido = sin seña
+                    keep = block['num_hands'] > 0
+                    points.append(block['landmarks'][keep, 0].astype(np.float32))
+                    labels.append(np.array([s.decode('utf-8') or NONE_LABEL for s in block['symbol'][keep]]))
+        else:
+            p, l = load_samples(path)
+            points.append(p)
+            labels.append(l)
+    if not points:
+        return np.zeros((0, 21, 3), np.float32), np.array([], str)
+    return np.concatenate(points), np.char.upper(np.concatenate(labels).astype(str))
+
+
+def dataset_fingerprint(points, labels):
+    """Hash corto del conjunto: una línea base solo se compara sobre los mismos datos"""
+    digest = hashlib.sha1(np.ascontiguousarray(points, np.float32).tobytes())
+    digest.update('\n'.join(labels.tolist()).encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+def load_recognizer(app_name, mode):
+    """Función features -> símbolo con el reconocedor de la app"""
+    import importlib
+
+    module_name, class_name, method = APPS[app_name]
+    rules = getattr(importlib.import_module(module_name), class_name)()
+    return getattr(select_recognizer(rules, mode), method)
+
+
+def run(recognize, features, warmup=20):
+    """Predicciones (mayúsculas, NONE_LABEL si no hay) y latencia de cada llamada en ns"""
+    for f in features[:warmup]:
+        recognize(f)
+    predictions = []
+    latencies = np.empty(len(features), np.int64)
+    clock = time.perf_counter_ns
+    wall0 = time.perf_counter()
+    for i, f in enumerate(features):
+        t0 = clock()
+        result = recognize(f)
+        latencies[i] = clock() - t0
+        if isinstance(result, tuple):
+            result = result[0]
+        predictions.append(result.upper() if result else NONE_LABEL)
+    wall = time.perf_counter() - wall0
+    return np.array(predictions), latencies, wall
+
+
+def confusion_matrix(labels, predictions):
+    """(clases, matriz) con filas = etiqueta real y columnas = predicción"""
+    classes = sorted(set(labels.tolist()) | set(predictions.tolist()))
+    index = {c: i for i, c in enumerate(classes)}
+    matrix = np.zeros((len(classes), len(classes)), np.int64)
+    np.add.at(matrix, ([index[c] for c in labels], [index[c] for c in predictions]), 1)
+    return classes, matrix
+
+
+def evaluate(recognize, features, labels):
+    predictions, latencies, wall = run(recognize, features)
+    classes, matrix = confusion_matrix(labels, predictions)
+    per_letter = {}
+    for i, c in enumerate(classes):
+        total = int(matrix[i].sum())
+        if total:
+            per_letter[c] = {'accuracy': float(matrix[i, i] / total), 'samples': total}
+    return {
+        'samples': len(labels),
+        'accuracy': float((predictions == labels).mean()) if len(labels) else float('nan'),
+        'per_letter': per_letter,
+        'latency_us': {f'p{p}': float(np.percentile(latencies, p) / 1000) for p in PERCENTILES},
+        'calls_per_s': len(labels) / wall if wall else 0.0,
+        'confusion': {'classes': classes, 'matrix': matrix.tolist()},
+    }
+
+
+def print_confusion(confusion):
+    classes, matrix = confusion['classes'], np.array(confusion['matrix'])
+    width = max(4, max(len(c) for c in classes) + 1, len(str(matrix.max())) + 1)
+    print("    real \\ pred " + "".join(f"{c:>{width}}" for c in classes))
+    for c, row in zip(classes, matrix):
+        # Solo las etiquetas presentes en los datos (las demás columnas son predicciones)
+        if not row.any():
+            continue
+        print(f"    {c:>13} " + "".join(f"{v:>{width}}" if v else f"{'.':>{width}}" for v in row))
+
+
+def compare(name, result, baseline, args):
+    """Mensajes de regresión contra la línea base de ese reconocedor"""
+    problems = []
+    drop = baseline['accuracy'] - result['accuracy']
+    if drop > args.max_accuracy_drop:
+        problems.append(f"exactitud {baseline['accuracy']:.3f} -> {result['accuracy']:.3f}")
+    for letter, old in baseline['per_letter'].items():
+        new = result['per_letter'].get(letter)
+        if old['samples'] < args.min_letter_samples or new is None:
+            continue
+        if old['accuracy'] - new['accuracy'] > args.max_letter_drop:
+            problems.append(f"letra {letter}: {old['accuracy']:.2f} -> {new['accuracy']:.2f}")
+    if args.max_latency_ratio:
+        old_p95, new_p95 = baseline['latency_us']['p95'], result['latency_us']['p95']
+        if old_p95 and new_p95 / old_p95 > args.max_latency_ratio:
+            problems.append(f"latencia p95 {old_p95:.1f} -> {new_p95:.1f} µs")
+    return [f"{name}: {p}" for p in problems]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia, exactitud y regresiones de los reconocedores")
+    parser.add_argument('--data', nargs='+', default=[os.path.join('data', 'samples.npz')],
+                        help=".npz de muestras y/o grabaciones .slmk")
+    parser.add_argument('--apps', nargs='+', choices=sorted(APPS), default=sorted(APPS))
+    parser.add_argument('--recognizer', choices=['reglas', 'modelo'], default='reglas')
+    parser.add_argument('--confusion', action='store_true', help="imprimir la matriz de confusión")
+    parser.add_argument('--out', help="guardar los resultados completos en JSON")
+    parser.add_argument('--save-baseline', help="guardar esta corrida como línea base")
+    parser.add_argument('--baseline', help="comparar contra una línea base y fallar si hay regresiones")
+    parser.add_argument('--max-accuracy-drop', type=float, default=0.01)
+    parser.add_argument('--max-letter-drop', type=float, default=0.05)
+    parser.add_argument('--min-letter-samples', type=int, default=20,
+                        help="letras con menos muestras no se comparan")
+    parser.add_argument('--max-latency-ratio', type=float, default=1.5,
+                        help="p95 nuevo / p95 base tolerado (0 = no comparar latencia)")
+    args = parser.parse_args()
+
+    try:
+        points, labels = load_dataset(args.data)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"No se pudieron cargar los datos: {e}")
+        return 1
+    if not len(labels):
+        print("No hay muestras en los datos")
+        return 1
+    features = [extract_features(p) for p in points]
+    fingerprint = dataset_fingerprint(points, labels)
+    print(f"{len(labels)} muestras, {len(set(labels.tolist()))} etiquetas (datos {fingerprint})")
+
+    results = {}
+    print(f"{'reconocedor':<22} {'exactitud':>9} " + " ".join(f"{f'p{p} µs':>9}" for p in PERCENTILES)
+          + f" {'llamadas/s':>11}")
+    for app_name in args.apps:
+        name = f"{app_name}.py ({args.recognizer})"
+        try:
+            recognize = load_recognizer(app_name, args.recognizer)
+        except ImportError as e:
+            print(f"{name:<22} no disponible: {e}")
+            continue
+        result = evaluate(recognize, features, labels)
+        results[name] = result
+        latency = result['latency_us']
+        print(f"{name:<22} {result['accuracy']:9.3f} "
+              + " ".join(f"{latency[f'p{p}']:9.1f}" for p in PERCENTILES)
+              + f" {result['calls_per_s']:11.0f}")
+        letters = sorted(result['per_letter'].items())
+        print("    " + " ".join(f"{c}:{v['accuracy']:.2f}" for c, v in letters))
+        if args.confusion:
+            print_confusion(result['confusion'])
+
+    run_info = {'data': fingerprint, 'recognizer': args.recognizer, 'results': results}
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(run_info, f, indent=2, ensure_ascii=False)
+            print(f"Resultados guardados en {path}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('data') != fingerprint:
+        print(f"La línea base se tomó con otros datos ({baseline.get('data')}); no se compara")
+        return 1
+    regressions = []
+    for name, result in results.items():
+        if name in baseline['results']:
+            regressions += compare(name, result, baseline['results'][name], args)
+        else:
+            print(f"{name}: sin línea base")
+    if regressions:
+        print(f"\n*** {len(regressions)} REGRESIONES contra {args.baseline} ***")
+        for message in regressions:
+            print(f"  ✗ {message}")
+        return 1
+    print(f"Sin regresiones contra {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Benchmark de la inferencia recortada (ROIHandTracker) contra el frame completo
+Procesa el mismo video con ambos caminos y reporta ms/frame, coincidencia de
+detecciones y error medio de los landmarks respecto al frame completo.
+
+Uso: python benchmarks/bench_roi.py video.mp4 [--max-hands 2] [--frames 600]
+     python benchmarks/bench_roi.py 0          (cámara 0)
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.frames import FramePreparer  # noqa: E402
+from utils.hand_features import landmarks_to_array  # noqa: E402
+from utils.roi_tracker import ROIHandTracker  # noqa: E402
+
+
+def create_hands(max_hands):
+    return mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=max_hands,
+        min_detection_confidence=0.7,
+        min_tracking_confidence=0.5,
+    )
+
+
+def hand_points(results):
+    """Arreglos (21, 3) de cada mano detectada"""
+    if not results.multi_hand_landmarks:
+        return []
+    return [landmarks_to_array(hand) for hand in results.multi_hand_landmarks]
+
+
+def match_error(reference, candidate, width, height):
+    """Error medio en píxeles emparejando cada mano con la más cercana"""
+    errors = []
+    for ref in reference:
+        best = None
+        for cand in candidate:
+            diff = (ref[:, :2] - cand[:, :2]) * (width, height)
+            err = float(np.sqrt((diff ** 2).sum(axis=1)).mean())
+            best = err if best is None else min(best, err)
+        if best is not None:
+            errors.append(best)
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recorte por región de interés vs frame completo")
+    parser.add_argument('source', help="ruta de video o índice de cámara")
+    parser.add_argument('--max-hands', type=int, default=2)
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--padding', type=float, default=0.35)
+    args = parser.parse_args()
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        print(f"No se pudo abrir {args.source}")
+        return 1
+
+    full_hands = create_hands(args.max_hands)
+    tracker = ROIHandTracker(create_hands(args.max_hands), max_num_hands=args.max_hands,
+                             padding=args.padding)
+    preparer = FramePreparer()
+
+    full_ms = []
+    roi_ms = []
+    agree = 0
+    errors = []
+    frames = 0
+    while frames < args.frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames += 1
+        _, rgb = preparer.prepare(frame)
+        height, width = rgb.shape[:2]
+
+        t0 = time.perf_counter()
+        reference = hand_points(full_hands.process(rgb))
+        t1 = time.perf_counter()
+        candidate = hand_points(tracker.process(rgb))
+        t2 = time.perf_counter()
+
+        full_ms.append((t1 - t0) * 1000)
+        roi_ms.append((t2 - t1) * 1000)
+        agree += len(reference) == len(candidate)
+        errors.extend(match_error(reference, candidate, width, height))
+    cap.release()
+
+    if not frames:
+        print("Sin frames")
+        return 1
+
+    print(f"{frames} frames, max_num_hands={args.max_hands}")
+    for name, values in (('frame completo', full_ms), ('recorte', roi_ms)):
+        values = np.array(values)
+        print(f"  {name:<15} media {values.mean():6.2f} ms  p50 {np.percentile(values, 50):6.2f}  "
+              f"p95 {np.percentile(values, 95):6.2f}")
+    print(f"  detecciones coincidentes: {agree / frames:.1%}")
+    if errors:
+        print(f"  error de landmarks: media {np.mean(errors):.2f} px, p95 {np.percentile(errors, 95):.2f} px")
+    print(f"  recorte: {tracker.metrics()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
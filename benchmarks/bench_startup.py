@@ -0,0 +1,210 @@
+"""
+Tiempo de arranque de las apps
+Modo headless (por omisión): en un proceso nuevo por corrida importa la app y
+la construye (todo lo que ocurre antes de pintar la ventana), luego espera la
+carga en segundo plano y, con --video, pasa frames hasta el primer
+reconocimiento. Se compara con la carga anterior, que importaba OpenCV,
+MediaPipe y pyttsx3 y construía Hands antes de pintar. La columna del primer
+frame es lo que tarda la primera inferencia con una mano (con y sin el
+calentamiento de utils/warmup.py).
+
+Modo --live: lanza la app real con SIGNS_STARTUP_REPORT y
+SIGNS_AUTOSTART_CAMERA y lee sus marcas (primer pintado, modelos listos,
+primer reconocimiento y botón -> primer frame anotado). Necesita pantalla,
+cámara y una mano frente a ella.
+
+Uso: python benchmarks/bench_startup.py [--apps main main2 program sign] [--runs 3] [--video clip.mp4] [--live]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.startup import AUTOSTART_ENV, REPORT_ENV, process_start_time  # noqa: E402
+
+# Clase principal, atributo del reconocedor y método de reconocimiento de cada app
+APPS = {
+    'main': ('HandDetectionApp', 'recognizer', 'recognize'),
+    'main2': ('HandDetectionApp', 'recognizer', 'recognize_letter'),
+    'program': ('SignLanguageApp', 'recognizer', 'recognize_letter'),
+    'sign': ('SignLanguageTranslator', 'letter_recognizer', 'recognize_letter'),
+}
+
+MARKS = ('primer_pintado', 'modelos_listos', 'primer_reconocimiento')
+DURATIONS = ('primer_frame', 'boton_a_primer_frame')
+
+
+def first_frame_seconds(hands):
+    """Duración de la primera inferencia con una mano sintética"""
+    from utils.warmup import synthetic_hand_frame
+
+    frame = synthetic_hand_frame(seed=99)
+    t0 = time.perf_counter()
+    hands.process(frame)
+    return time.perf_counter() - t0
+
+
+def child_headless(app_name, video):
+    """Corre dentro del proceso medido; imprime las marcas en JSON"""
+    t0 = time.time()
+    origin = process_start_time() or t0
+    marks = {}
+
+    import importlib
+    module = importlib.import_module(app_name)
+    class_name, recognizer_attr, method = APPS[app_name]
+    app = getattr(module, class_name)()
+    marks['primer_pintado'] = time.time() - origin
+
+    from utils.startup import BackgroundLoader
+    loader = getattr(app, 'loader', None) or BackgroundLoader(app.load_steps())
+    loader.start()
+    if not loader.wait():
+        raise SystemExit(f"La carga falló: {loader.error}")
+    marks['modelos_listos'] = time.time() - origin
+    marks['pasos'] = loader.durations
+    marks['durations'] = {'primer_frame': first_frame_seconds(app.hands)}
+
+    if video:
+        import cv2
+        from utils.hand_features import extract_features
+
+        cap = cv2.VideoCapture(video)
+        recognize = getattr(getattr(app, recognizer_attr), method)
+        while 'primer_reconocimiento' not in marks:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            _, rgb = app.frame_preparer.prepare(frame)
+            results = app.hand_tracker.process(rgb)
+            for hand in results.multi_hand_landmarks or []:
+                result = recognize(extract_features(hand))
+                if isinstance(result, tuple):
+                    result = result[0]
+                if result:
+                    marks['primer_reconocimiento'] = time.time() - origin
+                    break
+        cap.release()
+    print(json.dumps(marks))
+
+
+def child_eager():
+    """Lo que antes ocurría antes de pintar: imports pesados y Hands en __init__"""
+    t0 = time.time()
+    origin = process_start_time() or t0
+    import cv2  # noqa: F401
+    import mediapipe as mp
+    try:
+        import pyttsx3
+        pyttsx3.init().stop()
+    except Exception:
+        pass
+    hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=1)
+    marks = {'primer_pintado': time.time() - origin}
+    marks['durations'] = {'primer_frame': first_frame_seconds(hands)}
+    print(json.dumps(marks))
+
+
+def run_child(args):
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), *args],
+                            capture_output=True, text=True, cwd=ROOT)
+    if output.returncode != 0:
+        lines = (output.stderr or output.stdout).strip().splitlines()
+        return None, lines[-1] if lines else f"código {output.returncode}"
+    return json.loads(output.stdout.strip().splitlines()[-1]), None
+
+
+def run_live(app_name, timeout):
+    """Lanza la app real y espera su informe hasta el primer reconocimiento"""
+    with tempfile.TemporaryDirectory() as tmp:
+        report = os.path.join(tmp, 'startup.json')
+        env = dict(os.environ, **{REPORT_ENV: report, AUTOSTART_ENV: '1'})
+        process = subprocess.Popen([sys.executable, f'{app_name}.py'], cwd=ROOT, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        marks = {}
+        deadline = time.time() + timeout
+        try:
+            while time.time() < deadline and 'primer_reconocimiento' not in marks:
+                time.sleep(0.1)
+                try:
+                    with open(report) as f:
+                        data = json.load(f)
+                    marks = dict(data['marks'], durations=data.get('durations', {}))
+                except (OSError, ValueError, KeyError):
+                    pass
+        finally:
+            process.terminate()
+            process.wait(10)
+        return marks, None if marks else "sin informe (¿falta pantalla o cámara?)"
+
+
+def summarize(name, runs):
+    cells = []
+    for mark in MARKS:
+        values = [r[mark] for r in runs if mark in r]
+        cells.append(f"{statistics.median(values) * 1000:9.0f} ms" if values else f"{'-':>12}")
+    for duration in DURATIONS:
+        values = [r['durations'][duration] for r in runs if duration in r.get('durations', {})]
+        cells.append(f"{statistics.median(values) * 1000:9.0f} ms" if values else f"{'-':>12}")
+    print(f"{name:<16} " + " ".join(cells))
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        if sys.argv[2] == 'eager':
+            child_eager()
+        else:
+            child_headless(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+        return 0
+
+    parser = argparse.ArgumentParser(description="Tiempo hasta el primer pintado y el primer reconocimiento")
+    parser.add_argument('--apps', nargs='+', choices=sorted(APPS), default=sorted(APPS))
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--video', help="video con una seña para medir el primer reconocimiento")
+    parser.add_argument('--live', action='store_true', help="lanzar las apps reales con cámara")
+    parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args()
+
+    headers = ('pintado', 'modelos', '1er reconoc.', 'primer frame', 'botón->frame')
+    print(f"{'app':<16} " + " ".join(f"{m:>12}" for m in headers))
+    if not args.live:
+        runs = []
+        for _ in range(args.runs):
+            result, error = run_child(['--child', 'eager'])
+            if error:
+                print(f"{'carga anterior':<16} no disponible: {error}")
+                break
+            runs.append(result)
+        if runs:
+            summarize('carga anterior', runs)
+
+    for app_name in args.apps:
+        runs = []
+        for _ in range(args.runs):
+            if args.live:
+                result, error = run_live(app_name, args.timeout)
+            else:
+                child_args = ['--child', app_name] + ([os.path.abspath(args.video)] if args.video else [])
+                result, error = run_child(child_args)
+            if error:
+                print(f"{app_name:<16} no disponible: {error}")
+                break
+            runs.append(result)
+        if runs:
+            summarize(app_name, runs)
+            steps = runs[-1].get('pasos')
+            if steps:
+                print("    " + ", ".join(f"{k}: {v * 1000:.0f} ms" for k, v in steps.items()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Keras fp32 vs TFLite fp32 / fp16 / int8 en la CPU de esta máquina
+Reconstruye el clasificador del .npz en Keras, lo exporta a TFLite en cada
+cuantización (int8 calibrado con una parte de las muestras) y compara
+exactitud y latencia por mano, de a una y en lote. El runtime NumPy se
+incluye como referencia. Requiere requirements-train.txt.
+
+Uso: python benchmarks/bench_tflite.py --data data/samples.npz [--model models/landmark_classifier.npz] [--threads 1 4]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+
+from export_tflite import export  # noqa: E402
+from utils.landmark_classifier import DEFAULT_MODEL_PATH, LandmarkClassifier, normalize_landmarks  # noqa: E402
+from utils.model_export import classifier_to_keras  # noqa: E402
+from utils.samples import load_samples  # noqa: E402
+from utils.tflite_runtime import TFLiteClassifier  # noqa: E402
+
+
+def measure(predict_proba, points, labels, batch):
+    """Exactitud y µs por mano con lotes de 1 y de batch"""
+    predict_proba(points[:batch])  # calentamiento
+    t0 = time.perf_counter()
+    for i in range(len(points)):
+        predict_proba(points[i:i + 1])
+    single_us = (time.perf_counter() - t0) / len(points) * 1e6
+
+    predictions = []
+    t0 = time.perf_counter()
+    for start in range(0, len(points), batch):
+        predictions.append(predict_proba(points[start:start + batch]).argmax(axis=1))
+    batch_us = (time.perf_counter() - t0) / len(points) * 1e6
+    accuracy = float((np.concatenate(predictions) == labels).mean())
+    return accuracy, single_us, batch_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia y exactitud de Keras vs TFLite")
+    parser.add_argument('--data', default=os.path.join('data', 'samples.npz'))
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--batch', type=int, default=2, help="manos por llamada en lote")
+    parser.add_argument('--limit', type=int, default=2000, help="muestras a evaluar")
+    parser.add_argument('--calibration', type=float, default=0.2, help="fracción de muestras para calibrar int8")
+    args = parser.parse_args()
+
+    classifier = LandmarkClassifier.load(args.model)
+    points, labels = load_samples(args.data)
+    rng = np.random.default_rng(0)
+    order = rng.permutation(len(points))
+    n_calibration = int(len(order) * args.calibration)
+    calibration = points[order[:n_calibration]]
+    test = order[n_calibration:n_calibration + args.limit]
+    points, labels = points[test], labels[test]
+
+    # Índice de clase del modelo para cada etiqueta; las desconocidas nunca aciertan
+    index = {label: i for i, label in enumerate(classifier.labels.tolist())}
+    targets = np.array([index.get(label, -1) for label in labels])
+    print(f"{len(points)} muestras de prueba, {n_calibration} de calibración, CPU con {os.cpu_count()} núcleos")
+
+    rows = [('NumPy', '-', *measure(classifier.predict_proba, points, targets, args.batch))]
+
+    keras_model = classifier_to_keras(classifier)
+    rows.append(('Keras fp32', '-', *measure(
+        lambda p: keras_model(normalize_landmarks(p), training=False).numpy(), points, targets, args.batch)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for quantization in ('fp32', 'fp16', 'int8'):
+            path = os.path.join(tmp, f'model_{quantization}.tflite')
+            size = export(classifier, path, quantization, calibration)
+            for threads in sorted(set(args.threads)):
+                runtime = TFLiteClassifier(path, num_threads=threads)
+                name = f"TFLite {quantization} ({size / 1024:.0f} KB)"
+                rows.append((name, threads, *measure(runtime.predict_proba, points, targets, args.batch)))
+
+    print(f"{'modelo':<26} {'hilos':>5} {'exactitud':>9} {'µs/mano':>9} {'µs/mano lote':>13}")
+    for name, threads, accuracy, single_us, batch_us in rows:
+        print(f"{name:<26} {threads:>5} {accuracy:9.3f} {single_us:9.1f} {batch_us:13.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
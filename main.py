@@ -1,438 +1,169 @@
 import flet as ft
-import cv2
 import base64
 import threading
-import time
-import mediapipe as mp
 import numpy as np
-from collections import deque
+from utils.frame_skipping import InferenceSkipper
+from utils.frames import FramePreparer, mirror_in_place
+from utils.hand_features import FINGER_TIPS, FINGER_PIPS, FINGER_MCPS, as_features, extract_features
+from utils.jpeg_encoder import AdaptiveJPEGEncoder
+from utils.landmark_classifier import recognize_hands, select_recognizer
+from utils.pacing import FramePacer
+from utils.pipeline import FramePipeline
+from utils.roi_tracker import ROIHandTracker
+from utils.sign_rules import combined_table, finger_states, letter_table, number_table
+from utils.stability import StabilityVoter
+from utils.stage_timing import StageTimer
+from utils.startup import (BackgroundLoader, OneShotTimer, StartupTimer, autostart_requested, lazy_import, preload,
+                           recognizer_mode_requested)
+from utils.ui_updates import UIRefresher
+from utils.video_stream import start_stream_for_page
+from utils.warmup import warm_up_hands
+
+# Módulos pesados: se cargan en segundo plano después de pintar la interfaz
+cv2 = lazy_import('cv2')
+mp = lazy_import('mediapipe')
+
+STARTUP = StartupTimer('main.py')
 
 class SignLanguageRecognizer:
     """Clase para reconocer letras y números del lenguaje de señas"""
     
     def __init__(self):
-        self.finger_tips = [4, 8, 12, 16, 20]
-        self.finger_pips = [3, 6, 10, 14, 18]
-        self.finger_mcps = [2, 5, 9, 13, 17]
+        self.finger_tips = FINGER_TIPS
+        self.finger_pips = FINGER_PIPS
+        self.finger_mcps = FINGER_MCPS
+        
+        # Reglas por patrón de dedos en orden de prioridad (ver utils/sign_rules.py)
+        self.number_rules = number_table()
+        self.letter_rules = letter_table()
+        self.rules = combined_table()
         
     def get_finger_states(self, landmarks):
         """Determina qué dedos están extendidos"""
-        states = []
-        
-        # Pulgar (lógica horizontal mejorada)
-        thumb_tip = landmarks[4]
-        thumb_ip = landmarks[3]
-        thumb_mcp = landmarks[2]
-        wrist = landmarks[0]
-        
-        # Determinar orientación de la mano
-        hand_is_right = landmarks[17].x < landmarks[5].x
-        
-        if hand_is_right:
-            thumb_extended = thumb_tip.x < thumb_ip.x
-        else:
-            thumb_extended = thumb_tip.x > thumb_ip.x
-            
-        states.append(thumb_extended)
-        
-        # Resto de dedos (lógica vertical mejorada)
-        for i, (tip, pip) in enumerate(zip(self.finger_tips[1:], self.finger_pips[1:])):
-            extended = landmarks[tip].y < landmarks[pip].y - 0.02
-            states.append(extended)
-        
-        return states
-    
-    def get_distance(self, p1, p2):
-        """Calcula distancia euclidiana entre dos puntos"""
-        return np.sqrt((p1.x - p2.x)**2 + (p1.y - p2.y)**2)
-    
-    def get_angle(self, p1, p2, p3):
-        """Calcula el ángulo formado por tres puntos"""
-        v1 = np.array([p1.x - p2.x, p1.y - p2.y])
-        v2 = np.array([p3.x - p2.x, p3.y - p2.y])
-        
-        cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-6)
-        angle = np.arccos(np.clip(cos_angle, -1.0, 1.0))
-        return np.degrees(angle)
+        return finger_states(landmarks)
     
     def recognize_number(self, landmarks):
         """Reconoce números del 0-17"""
-        states = self.get_finger_states(landmarks)
-        thumb, index, middle, ring, pinky = states
-        
-        # Calcular distancias importantes
-        thumb_index_dist = self.get_distance(landmarks[4], landmarks[8])
-        thumb_middle_dist = self.get_distance(landmarks[4], landmarks[12])
-        index_middle_dist = self.get_distance(landmarks[8], landmarks[12])
-        
-        # 0 - Círculo con pulgar e índice (OK sign)
-        if not thumb and not index and middle and ring and pinky:
-            if thumb_index_dist < 0.06:
-                return '0'
-        
-        # 1 - Solo índice extendido
-        if not thumb and index and not middle and not ring and not pinky:
-            return '1'
-        
-        # 2 - Índice y medio extendidos (forma de V)
-        if not thumb and index and middle and not ring and not pinky:
-            if index_middle_dist > 0.08:  # Dedos separados
-                return '2'
-        
-        # 3 - Pulgar, índice y medio extendidos
-        if thumb and index and middle and not ring and not pinky:
-            if index_middle_dist > 0.08:
-                return '3'
-        
-        # 4 - Cuatro dedos extendidos (sin pulgar)
-        if not thumb and index and middle and ring and pinky:
-            return '4'
-        
-        # 5 - Todos los dedos extendidos
-        if thumb and index and middle and ring and pinky:
-            return '5'
-        
-        # 6 - Pulgar y meñique extendidos, resto doblados
-        if thumb and not index and not middle and not ring and pinky:
-            return '6'
-        
-        # 7 - Pulgar, índice y medio extendidos, meñique doblado
-        if thumb and index and middle and not ring and not pinky:
-            return '7'
-        
-        # 8 - Pulgar, índice, medio y anular extendidos
-        if thumb and index and middle and ring and not pinky:
-            return '8'
-        
-        # 9 - Todos extendidos menos el pulgar
-        if not thumb and index and middle and ring and pinky:
-            fingers_together = (
-                self.get_distance(landmarks[8], landmarks[12]) < 0.06 and
-                self.get_distance(landmarks[12], landmarks[16]) < 0.06
-            )
-            if fingers_together:
-                return '9'
-        
-        # 10 - Puño cerrado con pulgar extendido hacia arriba
-        if thumb and not index and not middle and not ring and not pinky:
-            if landmarks[4].y < landmarks[2].y - 0.05:
-                return '10'
-        
-        # 11 - Índice y pulgar extendidos (forma de pistola)
-        if thumb and index and not middle and not ring and not pinky:
-            if thumb_index_dist > 0.15:
-                return '11'
-        
-        # 12 - Índice, medio y pulgar formando un 3
-        if thumb and index and middle and not ring and not pinky:
-            if self.get_distance(landmarks[8], landmarks[12]) < 0.06:
-                return '12'
-        
-        # 13 - Similar a 12 pero dedos más juntos
-        if thumb and index and middle and ring and not pinky:
-            fingers_together = (
-                self.get_distance(landmarks[8], landmarks[12]) < 0.06 and
-                self.get_distance(landmarks[12], landmarks[16]) < 0.06
-            )
-            if fingers_together:
-                return '13'
-        
-        # 14 - Cuatro dedos juntos sin pulgar
-        if not thumb and index and middle and ring and pinky:
-            fingers_together = (
-                self.get_distance(landmarks[8], landmarks[12]) < 0.06 and
-                self.get_distance(landmarks[12], landmarks[16]) < 0.06 and
-                self.get_distance(landmarks[16], landmarks[20]) < 0.06
-            )
-            if fingers_together:
-                return '14'
-        
-        # 15 - Todos los dedos extendidos y juntos
-        if thumb and index and middle and ring and pinky:
-            fingers_together = (
-                self.get_distance(landmarks[8], landmarks[12]) < 0.06 and
-                self.get_distance(landmarks[12], landmarks[16]) < 0.06 and
-                self.get_distance(landmarks[16], landmarks[20]) < 0.06
-            )
-            if fingers_together:
-                return '15'
-        
-        return None
+        f = as_features(landmarks)
+        return self.number_rules.classify(self.get_finger_states(f), f)
     
     def recognize_letter(self, landmarks):
         """Reconoce la letra basándose en los landmarks (MEJORADO)"""
-        states = self.get_finger_states(landmarks)
-        thumb, index, middle, ring, pinky = states
-        
-        # Calcular distancias importantes
-        thumb_index_dist = self.get_distance(landmarks[4], landmarks[8])
-        thumb_middle_dist = self.get_distance(landmarks[4], landmarks[12])
-        index_middle_dist = self.get_distance(landmarks[8], landmarks[12])
-        middle_ring_dist = self.get_distance(landmarks[12], landmarks[16])
-        ring_pinky_dist = self.get_distance(landmarks[16], landmarks[20])
-        
-        # A - Puño cerrado con pulgar al lado
-        if not index and not middle and not ring and not pinky and thumb:
-            if landmarks[4].y > landmarks[6].y:  # Pulgar al costado
-                return 'A'
-        
-        # B - Mano abierta, dedos juntos, pulgar cruzado (CORREGIDO)
-        if not thumb and index and middle and ring and pinky:
-            fingers_together = (
-                index_middle_dist < 0.05 and
-                middle_ring_dist < 0.05 and
-                ring_pinky_dist < 0.05
-            )
-            # Verificar que pulgar está doblado hacia dentro
-            thumb_folded = landmarks[4].x > landmarks[5].x - 0.05 and landmarks[4].x < landmarks[17].x + 0.05
-            if fingers_together and thumb_folded:
-                return 'B'
-        
-        # C - Mano en forma de C (CORREGIDO)
-        if not index and not middle and not ring and not pinky:
-            # Verificar forma de C: dedos curvados
-            curve_check = (
-                landmarks[8].x < landmarks[5].x and
-                landmarks[12].x < landmarks[9].x and
-                0.1 < thumb_index_dist < 0.25
-            )
-            if curve_check:
-                return 'C'
-        
-        # D - Índice arriba, resto forma O (MEJOR DETECCIÓN)
-        if index and not middle and not ring and not pinky:
-            # Verificar que los otros dedos forman un círculo con el pulgar
-            circle_formed = thumb_middle_dist < 0.08
-            if circle_formed and landmarks[8].y < landmarks[6].y:
-                return 'D'
-        
-        # E - Todos los dedos doblados (CORREGIDO)
-        if not thumb and not index and not middle and not ring and not pinky:
-            # Verificar que todos están realmente doblados
-            all_bent = (
-                landmarks[8].y > landmarks[6].y and
-                landmarks[12].y > landmarks[10].y and
-                landmarks[16].y > landmarks[14].y and
-                landmarks[20].y > landmarks[18].y
-            )
-            if all_bent:
-                return 'E'
-        
-        # F - OK sign (CORREGIDO)
-        if middle and ring and pinky:
-            # Verificar que pulgar e índice se tocan
-            if thumb_index_dist < 0.06:
-                return 'F'
-        
-        # G - Índice y pulgar horizontales apuntando
-        if thumb and index and not middle and not ring and not pinky:
-            horizontal = abs(landmarks[4].y - landmarks[8].y) < 0.08
-            perpendicular = abs(landmarks[4].x - landmarks[8].x) > 0.15
-            if horizontal and perpendicular:
-                return 'G'
-        
-        # H - Índice y medio horizontales juntos
-        if not thumb and index and middle and not ring and not pinky:
-            horizontal = abs(landmarks[8].y - landmarks[12].y) < 0.05
-            together = index_middle_dist < 0.08
-            pointing_side = abs(landmarks[8].x - landmarks[6].x) > 0.1
-            if horizontal and together and pointing_side:
-                return 'H'
-        
-        # I - Meñique arriba, resto cerrado
-        if not thumb and not index and not middle and not ring and pinky:
-            if landmarks[20].y < landmarks[18].y:
-                return 'I'
-        
-        # J - I con movimiento (detectamos solo la posición base)
-        # Similar a I, requeriría detección de movimiento
-        
-        # K - Índice y medio en V, pulgar en medio (CORREGIDO)
-        if thumb and index and middle and not ring and not pinky:
-            v_shape = index_middle_dist > 0.1
-            # Pulgar debe estar entre índice y medio
-            thumb_between = (
-                landmarks[4].y > landmarks[8].y and
-                landmarks[4].y < landmarks[6].y
-            )
-            if v_shape and thumb_between:
-                return 'K'
-        
-        # L - L con índice y pulgar
-        if thumb and index and not middle and not ring and not pinky:
-            # Verificar ángulo de 90 grados
-            angle = self.get_angle(landmarks[4], landmarks[2], landmarks[8])
-            if 70 < angle < 110:  # Aproximadamente 90 grados
-                return 'L'
-        
-        # M - Tres dedos sobre pulgar (CORREGIDO)
-        if not thumb and not index and not middle and not ring:
-            # Verificar que el pulgar está debajo de los tres primeros dedos
-            thumb_under = (
-                landmarks[4].y > landmarks[6].y and
-                landmarks[4].x > landmarks[5].x - 0.03 and
-                landmarks[4].x < landmarks[9].x + 0.03
-            )
-            if thumb_under:
-                return 'M'
-        
-        # N - Dos dedos sobre pulgar (CORREGIDO)
-        if not thumb and not index and not middle:
-            # Verificar que pulgar está debajo de índice y medio
-            thumb_under = (
-                landmarks[4].y > landmarks[6].y and
-                landmarks[4].x > landmarks[5].x - 0.03 and
-                landmarks[4].x < landmarks[9].x + 0.03
-            )
-            # Anular y meñique deben estar extendidos
-            if thumb_under and ring and pinky:
-                return 'N'
-        
-        # O - Todos los dedos formando O (CORREGIDO)
-        if not index and not middle and not ring and not pinky:
-            # Verificar forma circular
-            circle = (
-                thumb_index_dist < 0.08 and
-                thumb_middle_dist < 0.12 and
-                landmarks[8].x < landmarks[5].x
-            )
-            if circle:
-                return 'O'
-        
-        # P - Como K pero apuntando hacia abajo
-        if thumb and index and middle and not ring and not pinky:
-            pointing_down = landmarks[8].y > landmarks[6].y
-            v_shape = index_middle_dist > 0.08
-            if pointing_down and v_shape:
-                return 'P'
-        
-        # Q - Similar a G pero apuntando hacia abajo
-        if thumb and index and not middle and not ring and not pinky:
-            pointing_down = landmarks[8].y > landmarks[0].y
-            if pointing_down and thumb_index_dist > 0.1:
-                return 'Q'
-        
-        # R - Índice y medio cruzados
-        if not thumb and index and middle and not ring and not pinky:
-            # Verificar cruce
-            crossed = (
-                abs(landmarks[8].x - landmarks[12].x) < 0.04 and
-                abs(landmarks[8].y - landmarks[12].y) < 0.04
-            )
-            if crossed:
-                return 'R'
-        
-        # S - Puño con pulgar sobre dedos
-        if not index and not middle and not ring and not pinky:
-            thumb_on_top = (
-                landmarks[4].y < landmarks[6].y and
-                landmarks[4].x > landmarks[5].x and
-                landmarks[4].x < landmarks[17].x
-            )
-            if thumb_on_top:
-                return 'S'
-        
-        # T - Pulgar entre índice y medio
-        if not index and not middle and not ring and not pinky:
-            thumb_between = (
-                landmarks[4].y > landmarks[5].y and
-                landmarks[4].y < landmarks[9].y and
-                landmarks[4].x > landmarks[6].x - 0.03 and
-                landmarks[4].x < landmarks[6].x + 0.03
-            )
-            if thumb_between:
-                return 'T'
-        
-        # U - Índice y medio juntos arriba
-        if not thumb and index and middle and not ring and not pinky:
-            together = index_middle_dist < 0.05
-            pointing_up = landmarks[8].y < landmarks[6].y
-            if together and pointing_up:
-                return 'U'
-        
-        # V - Índice y medio en V separados (CORREGIDO)
-        if not thumb and index and middle and not ring and not pinky:
-            v_shape = index_middle_dist > 0.08
-            pointing_up = (
-                landmarks[8].y < landmarks[6].y and
-                landmarks[12].y < landmarks[10].y
-            )
-            if v_shape and pointing_up:
-                return 'V'
-        
-        # W - Tres dedos arriba separados
-        if not thumb and index and middle and ring and not pinky:
-            separated = (
-                index_middle_dist > 0.06 and
-                middle_ring_dist > 0.06
-            )
-            if separated:
-                return 'W'
-        
-        # X - Índice doblado formando gancho
-        if not thumb and not middle and not ring and not pinky:
-            # Índice doblado en la articulación
-            hooked = (
-                landmarks[8].y > landmarks[7].y and
-                landmarks[8].y < landmarks[6].y
-            )
-            if hooked:
-                return 'X'
-        
-        # Y - Pulgar y meñique extendidos
-        if thumb and not index and not middle and not ring and pinky:
-            spread = self.get_distance(landmarks[4], landmarks[20]) > 0.2
-            if spread:
-                return 'Y'
-        
-        # Z - Similar a D pero con movimiento en Z (detectamos posición base)
-        # Requeriría tracking de movimiento
-        
-        return None
+        f = as_features(landmarks)
+        return self.letter_rules.classify(self.get_finger_states(f), f)
     
     def recognize(self, landmarks):
         """Reconoce tanto letras como números"""
-        # Primero intentar reconocer números
-        number = self.recognize_number(landmarks)
-        if number:
-            return number
-        
-        # Si no es número, intentar letra
-        letter = self.recognize_letter(landmarks)
-        return letter
+        # Una sola consulta a la tabla combinada: primero números, luego letras
+        f = as_features(landmarks)
+        return self.rules.classify(self.get_finger_states(f), f)
 
 
 class HandDetectionApp:
-    def __init__(self):
+    def __init__(self, recognizer_mode="reglas"):
+        """recognizer_mode: 'reglas' (umbrales escritos a mano) o 'modelo' (clasificador entrenado)"""
         self.cap = None
         self.camera_active = False
         self.camera_thread = None
+        self.pipeline = None
+        self.video_stream = None
+        self.encoder = AdaptiveJPEGEncoder(quality=85)
+        self.ui = None
+        self.pacer = None
+        self.target_fps = 30
+        # Última detección para los frames que no pasan por la inferencia;
+        # la escribe el hilo de inferencia y la lee el de captura (mirror_frame)
+        self.last_hand_landmarks = []
+        self.last_overlay_text = None
+        self.overlay_lock = threading.Lock()
+        self.frame_preparer = FramePreparer()
         self.page = None
         
-        # Configurar MediaPipe
+        # MediaPipe y el reconocedor se cargan en segundo plano (ver load_models)
+        self.recognizer_mode = recognizer_mode
+        self.mp_hands = None
+        self.hands = None
+        self.hand_tracker = None
+        self.mp_draw = None
+        self.recognizer = None
+        self.loader = BackgroundLoader([
+            ("Cargando OpenCV", self.load_opencv),
+            ("Cargando MediaPipe", self.load_hands),
+            ("Calentando MediaPipe", self.warm_up),
+            ("Cargando reconocedor", self.load_recognizer),
+        ], on_progress=self.on_load_progress, on_done=self.on_load_done)
+        # Inferencia cada N frames según la velocidad de la mano (enabled=False: todos)
+        self.skipper = InferenceSkipper(max_interval=4, enabled=True)
+        # Tiempo desde "Activar Cámara" hasta el primer frame anotado
+        self.camera_timer = OneShotTimer()
+        # Percentiles por etapa (captura, MediaPipe, dibujo, codificación, ...)
+        self.timing = StageTimer('main.py')
+        
+        # Buffer para estabilizar detección
+        # Ventana en segundos: a 30 FPS equivale a la original (12 frames / umbral 7),
+        # pero la confirmación no depende de la frecuencia de cuadros
+        self.symbol_voter = StabilityVoter.timed(window_s=0.4, threshold_s=0.23)
+        
+        # Texto acumulado
+        self.accumulated_text = ""
+        
+    def load_opencv(self):
+        preload('cv2')
+    
+    def load_hands(self):
+        """Configura MediaPipe (el paso más lento del arranque)"""
         self.mp_hands = mp.solutions.hands
+        self.mp_draw = mp.solutions.drawing_utils
         self.hands = self.mp_hands.Hands(
             static_image_mode=False,
             max_num_hands=1,
             min_detection_confidence=0.7,
             min_tracking_confidence=0.6
         )
-        self.mp_draw = mp.solutions.drawing_utils
-        
-        # Reconocedor de señas
-        self.recognizer = SignLanguageRecognizer()
-        
-        # Buffer para estabilizar detección
-        self.symbol_buffer = deque(maxlen=12)
-        self.last_detected_symbol = None
-        self.symbol_stable_count = 0
-        self.stability_threshold = 7
-        
-        # Texto acumulado
-        self.accumulated_text = ""
-        
+        # Recorte a la región de la mano del frame anterior (enabled=False: frame completo)
+        self.hand_tracker = ROIHandTracker(self.hands, max_num_hands=1, enabled=True)
+    
+    def warm_up(self):
+        """Frames sintéticos por Hands: el primer frame real no paga la inicialización del grafo"""
+        report = warm_up_hands(self.hands)
+        print(f"MediaPipe calentado: {report['frames']} frames en {report['total_ms']:.0f} ms "
+              f"(primero {report['first_ms']:.0f} ms)")
+    
+    def load_recognizer(self):
+        self.recognizer = select_recognizer(SignLanguageRecognizer(), self.recognizer_mode)
+    
+    def on_load_progress(self, fraction, description):
+        """Muestra el avance de la carga en segundo plano"""
+        if not self.page:
+            return
+        self.load_progress.value = fraction
+        if description:
+            self.status_text.value = f"{description}..."
+        self.page.update(self.load_progress, self.status_text)
+    
+    def on_load_done(self, error):
+        """Habilita la cámara cuando MediaPipe y el reconocedor están listos"""
+        if error:
+            self.load_progress.visible = False
+            self.show_error(f"Error cargando modelos: {error}")
+            return
+        STARTUP.mark('modelos_listos')
+        self.load_progress.visible = False
+        self.toggle_button.disabled = False
+        self.status_text.value = "Cámara desactivada"
+        self.status_text.color = ft.Colors.GREY_600
+        if self.page:
+            self.page.update()
+        if autostart_requested():
+            self.toggle_camera(None)
+    
     def main(self, page: ft.Page):
         self.page = page
+        self.ui = UIRefresher(page)
+        self.video_stream = start_stream_for_page(page)
+        if self.video_stream:
+            # Presupuesto de salida compartido por todos los navegadores (~24 Mbit/s)
+            self.encoder.bandwidth_budget = 3 * 1024 * 1024
         page.title = "Detector de Lenguaje de Señas (Letras y Números)"
         page.window_width = 1150
         page.window_height = 850
@@ -445,7 +176,8 @@ class HandDetectionApp:
             border_radius=10
         )
         
-        self.status_text = ft.Text("Cámara desactivada", size=16, weight=ft.FontWeight.BOLD)
+        self.status_text = ft.Text("Cargando...", size=16, weight=ft.FontWeight.BOLD)
+        self.load_progress = ft.ProgressBar(width=150, value=0, color=ft.Colors.PURPLE_400)
         
         self.detected_symbol = ft.Text(
             "",
@@ -471,6 +203,7 @@ class HandDetectionApp:
             text="Activar Cámara",
             icon=ft.Icons.VIDEOCAM,
             on_click=self.toggle_camera,
+            disabled=not self.loader.loaded,
             style=ft.ButtonStyle(
                 color=ft.Colors.WHITE,
                 bgcolor=ft.Colors.GREEN,
@@ -544,6 +277,7 @@ class HandDetectionApp:
                             self.delete_button,
                             ft.Container(width=20),
                             self.status_text,
+                            self.load_progress,
                         ], alignment=ft.MainAxisAlignment.CENTER),
                         margin=ft.Margin(0, 0, 0, 15)
                     ),
@@ -628,6 +362,10 @@ class HandDetectionApp:
                 padding=25
             )
         )
+        STARTUP.mark('primer_pintado')
+        
+        # Con la ventana ya pintada, MediaPipe y el reconocedor cargan en segundo plano
+        self.loader.start()
     
     def clear_text(self, e):
         """Limpia el texto acumulado"""
@@ -651,73 +389,86 @@ class HandDetectionApp:
             if self.page:
                 self.page.update()
     
-    def frame_to_base64(self, frame):
-        """Convierte frame a base64 para Flet"""
+    def encode_frame(self, frame):
+        """Codifica el frame a JPEG (bytes crudos, sin base64)"""
         try:
-            _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-            jpg_base64 = base64.b64encode(buffer.tobytes()).decode('utf-8')
-            return jpg_base64
+            # Cada cliente del flujo suma al ancho de banda de salida
+            viewers = self.video_stream.clients if self.video_stream else 1
+            # Percentiles sobre el video (solo con SIGNS_STAGE_OVERLAY)
+            frame = self.timing.draw_overlay(frame)
+            with self.timing.stage('codificacion'):
+                return self.encoder.encode(frame, viewers=viewers)
         except Exception as e:
-            print(f"Error convirtiendo frame a base64: {e}")
-            return ""
+            print(f"Error codificando frame: {e}")
+            return None
     
     def process_frame(self, frame):
         """Procesa el frame para detectar manos y reconocer símbolos"""
         try:
-            # Convertir BGR a RGB para MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            rgb_frame = cv2.flip(rgb_frame, 1)
-            frame = cv2.flip(frame, 1)
+            if self.skipper.should_infer():
+                # Espejo en el mismo buffer y RGB en un buffer reutilizado para MediaPipe
+                with self.timing.stage('preparacion'):
+                    frame, rgb_frame = self.frame_preparer.prepare(frame)
+                # Al pacer solo le cuentan las llamadas reales a MediaPipe
+                with self.timing.stage('mediapipe'), self.pacer.measure():
+                    results = self.hand_tracker.process(rgb_frame)
+                self.skipper.observe(results)
+            else:
+                # Frame intermedio: landmarks extrapolados sin pasar por MediaPipe,
+                # los buffers de estabilidad siguen avanzando un paso por frame
+                frame = mirror_in_place(frame)
+                results = self.skipper.predict()
             
-            results = self.hands.process(rgb_frame)
+            overlay_text = None
             
             detected_symbol = None
             
             if results.multi_hand_landmarks:
                 for hand_landmarks in results.multi_hand_landmarks:
                     # Dibujar landmarks
-                    self.mp_draw.draw_landmarks(
-                        frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
-                        self.mp_draw.DrawingSpec(color=(0, 0, 255), thickness=2, circle_radius=3),
-                        self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2)
-                    )
-                    
-                    # Reconocer símbolo (letra o número)
-                    symbol = self.recognizer.recognize(hand_landmarks.landmark)
+                    with self.timing.stage('dibujo'):
+                        self.mp_draw.draw_landmarks(
+                            frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
+                            self.mp_draw.DrawingSpec(color=(0, 0, 255), thickness=2, circle_radius=3),
+                            self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2)
+                        )
+                
+                # Reconocer símbolo (letra o número) de todas las manos en una llamada
+                with self.timing.stage('reconocimiento'):
+                    hands = [extract_features(h) for h in results.multi_hand_landmarks]
+                    symbols = recognize_hands(self.recognizer, 'recognize', hands)
+                for symbol in symbols:
                     if symbol:
                         detected_symbol = symbol
+                        STARTUP.mark('primer_reconocimiento')
                         
                         # Determinar si es letra o número
                         symbol_type = "Número" if symbol.isdigit() else "Letra"
                         
                         # Mostrar en el frame
-                        cv2.putText(frame, f"{symbol_type}: {symbol}", (10, 50),
+                        overlay_text = f"{symbol_type}: {symbol}"
+                        cv2.putText(frame, overlay_text, (10, 50),
                                   cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 255, 0), 3)
             
+            # Última detección, reutilizada en los frames que omiten la inferencia
+            with self.overlay_lock:
+                self.last_hand_landmarks = results.multi_hand_landmarks or []
+                self.last_overlay_text = overlay_text
+            
             # Sistema de estabilización mejorado
             if detected_symbol:
-                self.symbol_buffer.append(detected_symbol)
-                
-                if len(self.symbol_buffer) >= self.stability_threshold:
-                    most_common = max(set(self.symbol_buffer), key=self.symbol_buffer.count)
-                    count = self.symbol_buffer.count(most_common)
-                    
-                    if count >= self.stability_threshold:
-                        if most_common != self.last_detected_symbol:
-                            # Nuevo símbolo detectado de forma estable
-                            self.accumulated_text += most_common
-                            self.accumulated_display.value = self.accumulated_text
-                            self.last_detected_symbol = most_common
-                            self.symbol_stable_count = 0
+                stable = self.symbol_voter.push(detected_symbol)
+                if stable:
+                    # Nuevo símbolo detectado de forma estable
+                    self.symbol_voter.commit(stable)
+                    self.accumulated_text += stable
+                    self.ui.set(self.accumulated_display, value=self.accumulated_text)
                 
-                self.detected_symbol.value = detected_symbol
+                self.ui.set(self.detected_symbol, value=detected_symbol)
             else:
-                if len(self.symbol_buffer) > 0:
-                    self.symbol_buffer.popleft()
-                
-                if len(self.symbol_buffer) == 0:
-                    self.last_detected_symbol = None
-                    self.detected_symbol.value = ""
+                # Sin mano: la ventana se vacía y la misma seña puede repetirse
+                if self.symbol_voter.miss():
+                    self.ui.set(self.detected_symbol, value="")
             
             return frame
             
@@ -726,30 +477,74 @@ class HandDetectionApp:
             return frame
     
     def camera_loop(self):
-        """Bucle principal de la cámara"""
-        while self.camera_active and self.cap:
-            try:
-                ret, frame = self.cap.read()
-                if ret:
-                    processed_frame = self.process_frame(frame)
-                    base64_image = self.frame_to_base64(processed_frame)
-                    if base64_image:
-                        self.image_display.src_base64 = base64_image
-                    
-                    if self.page:
-                        self.page.update()
-                else:
-                    print("No se pudo leer frame de la cámara")
-                    break
-            except Exception as e:
-                print(f"Error en camera_loop: {e}")
-                break
-            
-            time.sleep(0.033)
+        """Bucle principal de la cámara: captura, inferencia, codificación y render en paralelo"""
+        self.pacer = FramePacer(target_fps=self.target_fps)
+        self.pipeline = FramePipeline(
+            source=self.read_frame,
+            pacer=self.pacer,
+            bypass=self.mirror_frame,
+            stages=[
+                ('inferencia', self.process_frame),
+                ('codificacion', self.encode_frame),
+                ('render', self.render_frame),
+            ],
+        )
+        self.pipeline.run()
+    
+    def read_frame(self):
+        """Etapa de captura: devuelve el siguiente frame o None para terminar"""
+        cap = self.cap
+        if not self.camera_active or cap is None:
+            return None
+        
+        with self.timing.stage('captura'):
+            ret, frame = cap.read()
+        if not ret:
+            if self.camera_active:
+                print("No se pudo leer frame de la cámara")
+            return None
+        return frame
+    
+    def mirror_frame(self, frame):
+        """Frame en espejo sin inferencia, con la última detección dibujada encima"""
+        frame = mirror_in_place(frame)
+        with self.overlay_lock:
+            hand_landmarks_list, overlay_text = self.last_hand_landmarks, self.last_overlay_text
+        for hand_landmarks in hand_landmarks_list:
+            with self.timing.stage('dibujo'):
+                self.mp_draw.draw_landmarks(
+                    frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
+                    self.mp_draw.DrawingSpec(color=(0, 0, 255), thickness=2, circle_radius=3),
+                    self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2)
+                )
+        if overlay_text:
+            cv2.putText(frame, overlay_text, (10, 50),
+                      cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 255, 0), 3)
+        return frame
+    
+    def render_frame(self, jpeg_bytes):
+        """Etapa de render: publica el frame codificado en la interfaz"""
+        if jpeg_bytes:
+            if self.video_stream:
+                # El control Image lee el flujo MJPEG: sin base64 por frame
+                self.video_stream.publish(jpeg_bytes)
+            else:
+                with self.timing.stage('base64'):
+                    self.image_display.src_base64 = base64.b64encode(jpeg_bytes).decode('utf-8')
+                self.ui.mark(self.image_display, immediate=True)
+        
+        # Solo se envían los controles que cambiaron, no todo el árbol
+        with self.timing.stage('render'):
+            self.ui.flush()
+        
+        elapsed = self.camera_timer.stop()
+        if elapsed is not None:
+            STARTUP.record('boton_a_primer_frame', elapsed)
     
     def toggle_camera(self, e):
         """Activa/desactiva la cámara"""
         if not self.camera_active:
+            self.camera_timer.start()
             try:
                 self.cap = cv2.VideoCapture(0)
                 
@@ -761,6 +556,12 @@ class HandDetectionApp:
                 self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
                 
                 self.camera_active = True
+                self.hand_tracker.reset()
+                self.skipper.reset()
+                if self.video_stream:
+                    self.image_display.src = self.video_stream.url(fresh=True)
+                    self.image_display.src_base64 = None
+                self.timing.start()
                 self.camera_thread = threading.Thread(target=self.camera_loop, daemon=True)
                 self.camera_thread.start()
                 
@@ -773,10 +574,14 @@ class HandDetectionApp:
                 self.show_error(f"Error: {str(ex)}")
         else:
             self.camera_active = False
+            if self.pipeline:
+                self.pipeline.stop()
             if self.cap:
                 self.cap.release()
                 self.cap = None
+            self.timing.stop()
             
+            self.image_display.src = None
             self.image_display.src_base64 = ""
             self.toggle_button.text = "Activar Cámara"
             self.toggle_button.icon = ft.Icons.VIDEOCAM
@@ -799,12 +604,17 @@ class HandDetectionApp:
         """Maneja eventos de ventana"""
         if e.data == "close":
             self.camera_active = False
+            if self.pipeline:
+                self.pipeline.stop()
             if self.cap:
                 self.cap.release()
+            if self.video_stream:
+                self.video_stream.stop()
+            self.timing.stop()
 
 
 def main(page: ft.Page):
-    app = HandDetectionApp()
+    app = HandDetectionApp(recognizer_mode=recognizer_mode_requested())
     app.main(page)
 
 if __name__ == "__main__":
@@ -1,67 +1,60 @@
 import flet as ft
-import cv2
 import base64
 import threading
-import time
-import mediapipe as mp
 import numpy as np
-from collections import deque
-import pyttsx3
+from utils.frame_skipping import InferenceSkipper
+from utils.frames import FramePreparer, mirror_in_place
+from utils.hand_features import FINGER_TIPS, FINGER_PIPS, FINGER_MCPS, as_features, extract_features
+from utils.jpeg_encoder import AdaptiveJPEGEncoder
+from utils.landmark_classifier import recognize_hands, select_recognizer
+from utils.pacing import FramePacer
+from utils.pipeline import FramePipeline
+from utils.roi_tracker import ROIHandTracker
+from utils.stability import StabilityVoter
+from utils.stage_timing import StageTimer
+from utils.startup import (BackgroundLoader, OneShotTimer, StartupTimer, autostart_requested, lazy_import, preload,
+                           recognizer_mode_requested)
+from utils.tts_worker import TTSWorker
+from utils.ui_updates import UIRefresher
+from utils.video_stream import start_stream_for_page
+from utils.warmup import warm_up_hands
+
+# Módulos pesados: se cargan en segundo plano después de pintar la interfaz
+cv2 = lazy_import('cv2')
+mp = lazy_import('mediapipe')
+
+STARTUP = StartupTimer('main2.py')
 
 class SignLanguageRecognizer:
     """Clase para reconocer letras del lenguaje de señas"""
     
     def __init__(self):
-        self.finger_tips = [4, 8, 12, 16, 20]
-        self.finger_pips = [3, 6, 10, 14, 18]
-        self.finger_mcps = [2, 5, 9, 13, 17]
+        self.finger_tips = FINGER_TIPS
+        self.finger_pips = FINGER_PIPS
+        self.finger_mcps = FINGER_MCPS
         
     def get_finger_states(self, landmarks):
         """Determina qué dedos están extendidos"""
-        states = []
-        
-        # Pulgar (lógica horizontal)
-        thumb_extended = landmarks[4].x < landmarks[3].x if landmarks[9].x < landmarks[0].x else landmarks[4].x > landmarks[3].x
-        states.append(thumb_extended)
-        
-        # Resto de dedos (lógica vertical)
-        for tip, pip in zip(self.finger_tips[1:], self.finger_pips[1:]):
-            extended = landmarks[tip].y < landmarks[pip].y
-            states.append(extended)
-        
-        return states
+        # Pulgar (lógica horizontal) y resto de dedos (lógica vertical)
+        return as_features(landmarks).finger_states()
     
     def get_finger_angles(self, landmarks):
         """Calcula ángulos relativos de los dedos"""
-        angles = []
-        for i in range(5):
-            tip = self.finger_tips[i]
-            mcp = self.finger_mcps[i]
-            angle = np.arctan2(
-                landmarks[tip].y - landmarks[mcp].y,
-                landmarks[tip].x - landmarks[mcp].x
-            )
-            angles.append(angle)
-        return angles
+        return as_features(landmarks).finger_angles
     
     def recognize_letter(self, landmarks):
         """Reconoce la letra basándose en los landmarks"""
-        states = self.get_finger_states(landmarks)
-        angles = self.get_finger_angles(landmarks)
+        f = as_features(landmarks)
+        states = f.finger_states()
+        angles = f.finger_angles
+        x, y, d = f.x, f.y, f.dist
         
         # [Pulgar, Índice, Medio, Anular, Meñique]
         thumb, index, middle, ring, pinky = states
         
         # Calcular distancias para gestos específicos
-        thumb_index_dist = np.sqrt(
-            (landmarks[4].x - landmarks[8].x)**2 + 
-            (landmarks[4].y - landmarks[8].y)**2
-        )
-        
-        thumb_middle_dist = np.sqrt(
-            (landmarks[4].x - landmarks[12].x)**2 + 
-            (landmarks[4].y - landmarks[12].y)**2
-        )
+        thumb_index_dist = d[4, 8]
+        thumb_middle_dist = d[4, 12]
         
         # A - Puño cerrado con pulgar al lado
         if not index and not middle and not ring and not pinky and thumb:
@@ -71,9 +64,9 @@ class SignLanguageRecognizer:
         if not thumb and index and middle and ring and pinky:
             # Verificar que los dedos estén relativamente juntos
             fingers_together = (
-                abs(landmarks[8].x - landmarks[12].x) < 0.05 and
-                abs(landmarks[12].x - landmarks[16].x) < 0.05 and
-                abs(landmarks[16].x - landmarks[20].x) < 0.05
+                abs(x[8] - x[12]) < 0.05 and
+                abs(x[12] - x[16]) < 0.05 and
+                abs(x[16] - x[20]) < 0.05
             )
             if fingers_together:
                 return 'B'
@@ -90,7 +83,7 @@ class SignLanguageRecognizer:
         
         # E - Todos los dedos doblados, pulgar sobre ellos
         if not thumb and not index and not middle and not ring and not pinky:
-            if landmarks[4].y < landmarks[8].y:
+            if y[4] < y[8]:
                 return 'E'
         
         # F - OK sign - índice y pulgar tocándose, resto arriba
@@ -100,14 +93,14 @@ class SignLanguageRecognizer:
         
         # G - Índice y pulgar horizontales apuntando
         if thumb and index and not middle and not ring and not pinky:
-            horizontal = abs(landmarks[4].y - landmarks[8].y) < 0.1
+            horizontal = abs(y[4] - y[8]) < 0.1
             if horizontal:
                 return 'G'
         
         # H - Índice y medio horizontales
         if not thumb and index and middle and not ring and not pinky:
-            horizontal = abs(landmarks[8].y - landmarks[12].y) < 0.08
-            fingers_together = abs(landmarks[8].x - landmarks[12].x) < 0.15
+            horizontal = abs(y[8] - y[12]) < 0.08
+            fingers_together = abs(x[8] - x[12]) < 0.15
             if horizontal and fingers_together:
                 return 'H'
         
@@ -117,24 +110,24 @@ class SignLanguageRecognizer:
         
         # K - Índice y medio en V, pulgar en medio
         if thumb and index and middle and not ring and not pinky:
-            v_shape = abs(landmarks[8].x - landmarks[12].x) > 0.1
-            if v_shape and landmarks[4].y < landmarks[6].y:
+            v_shape = abs(x[8] - x[12]) > 0.1
+            if v_shape and y[4] < y[6]:
                 return 'K'
         
         # L - L con índice y pulgar
         if thumb and index and not middle and not ring and not pinky:
-            perpendicular = abs(landmarks[4].x - landmarks[8].x) > 0.15
+            perpendicular = abs(x[4] - x[8]) > 0.15
             if perpendicular:
                 return 'L'
         
         # M - Tres dedos sobre pulgar
         if not thumb and not index and not middle and not ring and pinky:
-            if landmarks[4].x > landmarks[6].x and landmarks[4].x < landmarks[10].x:
+            if x[4] > x[6] and x[4] < x[10]:
                 return 'M'
         
         # N - Dos dedos sobre pulgar
         if not thumb and not index and not middle and ring and pinky:
-            if landmarks[4].x > landmarks[6].x and landmarks[4].x < landmarks[10].x:
+            if x[4] > x[6] and x[4] < x[10]:
                 return 'N'
         
         # O - Todos los dedos formando O
@@ -145,42 +138,42 @@ class SignLanguageRecognizer:
         
         # P - Como K pero apuntando hacia abajo
         if thumb and index and middle and not ring and not pinky:
-            pointing_down = landmarks[8].y > landmarks[6].y
+            pointing_down = y[8] > y[6]
             if pointing_down:
                 return 'P'
         
         # R - Índice y medio cruzados
         if not thumb and index and middle and not ring and not pinky:
-            crossed = landmarks[8].x > landmarks[12].x if landmarks[8].y < landmarks[12].y else landmarks[8].x < landmarks[12].x
+            crossed = x[8] > x[12] if y[8] < y[12] else x[8] < x[12]
             if crossed:
                 return 'R'
         
         # S - Puño con pulgar sobre dedos
         if thumb and not index and not middle and not ring and not pinky:
-            if landmarks[4].y < landmarks[6].y and landmarks[4].x > landmarks[5].x and landmarks[4].x < landmarks[17].x:
+            if y[4] < y[6] and x[4] > x[5] and x[4] < x[17]:
                 return 'S'
         
         # T - Pulgar entre índice y medio
         if thumb and not index and not middle and not ring and not pinky:
-            if landmarks[4].y > landmarks[5].y and landmarks[4].y < landmarks[9].y:
+            if y[4] > y[5] and y[4] < y[9]:
                 return 'T'
         
         # U - Índice y medio juntos arriba
         if not thumb and index and middle and not ring and not pinky:
-            together = abs(landmarks[8].x - landmarks[12].x) < 0.05
+            together = abs(x[8] - x[12]) < 0.05
             if together:
                 return 'U'
         
         # V - Índice y medio en V separados
         if not thumb and index and middle and not ring and not pinky:
-            v_shape = abs(landmarks[8].x - landmarks[12].x) > 0.08
+            v_shape = abs(x[8] - x[12]) > 0.08
             if v_shape:
                 return 'V'
         
         # W - Tres dedos arriba separados
         if not thumb and index and middle and ring and not pinky:
-            separated = (abs(landmarks[8].x - landmarks[12].x) > 0.05 and 
-                        abs(landmarks[12].x - landmarks[16].x) > 0.05)
+            separated = (abs(x[8] - x[12]) > 0.05 and 
+                        abs(x[12] - x[16]) > 0.05)
             if separated:
                 return 'W'
         
@@ -190,8 +183,8 @@ class SignLanguageRecognizer:
         
         # Mano abierta (todos extendidos)
         if thumb and index and middle and ring and pinky:
-            fingers_spread = (abs(landmarks[8].x - landmarks[12].x) > 0.08 and
-                            abs(landmarks[12].x - landmarks[16].x) > 0.08)
+            fingers_spread = (abs(x[8] - x[12]) > 0.08 and
+                            abs(x[12] - x[16]) > 0.08)
             if fingers_spread:
                 return '5'  # o podría ser otra letra dependiendo del contexto
         
@@ -199,47 +192,119 @@ class SignLanguageRecognizer:
 
 
 class HandDetectionApp:
-    def __init__(self):
+    def __init__(self, recognizer_mode="reglas"):
+        """recognizer_mode: 'reglas' (umbrales escritos a mano) o 'modelo' (clasificador entrenado)"""
         self.cap = None
         self.camera_active = False
         self.camera_thread = None
+        self.pipeline = None
+        self.video_stream = None
+        self.encoder = AdaptiveJPEGEncoder(quality=85)
+        self.ui = None
+        self.pacer = None
+        self.target_fps = 30
+        # Última detección para los frames que no pasan por la inferencia;
+        # la escribe el hilo de inferencia y la lee el de captura (mirror_frame)
+        self.last_hand_landmarks = []
+        self.last_overlay_text = None
+        self.overlay_lock = threading.Lock()
+        self.frame_preparer = FramePreparer()
         self.page = None
         
-        # Configurar MediaPipe
+        # MediaPipe, el reconocedor y el motor de voz se cargan en segundo plano
+        self.recognizer_mode = recognizer_mode
+        self.mp_hands = None
+        self.hands = None
+        self.hand_tracker = None
+        self.mp_draw = None
+        self.recognizer = None
+        self.loader = BackgroundLoader([
+            ("Cargando OpenCV", self.load_opencv),
+            ("Cargando MediaPipe", self.load_hands),
+            ("Calentando MediaPipe", self.warm_up),
+            ("Cargando reconocedor", self.load_recognizer),
+            ("Preparando voz", self.load_tts),
+        ], on_progress=self.on_load_progress, on_done=self.on_load_done)
+        # Inferencia cada N frames según la velocidad de la mano (enabled=False: todos)
+        self.skipper = InferenceSkipper(max_interval=4, enabled=True)
+        # Tiempo desde "Activar Cámara" hasta el primer frame anotado
+        self.camera_timer = OneShotTimer()
+        # Percentiles por etapa (captura, MediaPipe, dibujo, codificación, ...)
+        self.timing = StageTimer('main2.py')
+        
+        # Buffer para estabilizar detección
+        # Ventana en segundos: a 30 FPS equivale a la original (10 frames / umbral 5),
+        # pero la confirmación no depende de la frecuencia de cuadros
+        self.letter_voter = StabilityVoter.timed(window_s=0.33, threshold_s=0.17)
+        
+        # Texto acumulado
+        self.accumulated_text = ""
+        
+        # Motor de texto a voz: uno solo, en su hilo, se inicializa durante la carga
+        self.tts = TTSWorker(rate=150, volume=0.9, timer=self.timing)
+        self.tts_available = False
+    
+    def load_opencv(self):
+        preload('cv2')
+    
+    def load_hands(self):
+        """Configura MediaPipe (el paso más lento del arranque)"""
         self.mp_hands = mp.solutions.hands
+        self.mp_draw = mp.solutions.drawing_utils
         self.hands = self.mp_hands.Hands(
             static_image_mode=False,
             max_num_hands=2,
             min_detection_confidence=0.7,
             min_tracking_confidence=0.5
         )
-        self.mp_draw = mp.solutions.drawing_utils
-        
-        # Reconocedor de señas
-        self.recognizer = SignLanguageRecognizer()
-        
-        # Buffer para estabilizar detección
-        self.letter_buffer = deque(maxlen=10)
-        self.last_detected_letter = None
-        self.letter_stable_count = 0
-        self.stability_threshold = 5
-        
-        # Texto acumulado
-        self.accumulated_text = ""
-        
-        # Motor de texto a voz - se inicializará bajo demanda
-        self.tts_available = True
-        try:
-            # Probar si pyttsx3 está disponible
-            test_engine = pyttsx3.init()
-            test_engine.stop()
-            del test_engine
-        except Exception as e:
-            print(f"TTS no disponible: {e}")
-            self.tts_available = False
+        # Recorte a la región de la mano del frame anterior (enabled=False: frame completo)
+        self.hand_tracker = ROIHandTracker(self.hands, max_num_hands=2, enabled=True)
+    
+    def warm_up(self):
+        """Frames sintéticos por Hands: el primer frame real no paga la inicialización del grafo"""
+        report = warm_up_hands(self.hands)
+        print(f"MediaPipe calentado: {report['frames']} frames en {report['total_ms']:.0f} ms "
+              f"(primero {report['first_ms']:.0f} ms)")
+    
+    def load_recognizer(self):
+        self.recognizer = select_recognizer(SignLanguageRecognizer(), self.recognizer_mode)
+    
+    def load_tts(self):
+        """Inicializa el motor de voz en su hilo (sin voz la app sigue funcionando)"""
+        self.tts_available = self.tts.start().wait_ready()
+    
+    def on_load_progress(self, fraction, description):
+        """Muestra el avance de la carga en segundo plano"""
+        if not self.page:
+            return
+        self.load_progress.value = fraction
+        if description:
+            self.status_text.value = f"{description}..."
+        self.page.update(self.load_progress, self.status_text)
+    
+    def on_load_done(self, error):
+        """Habilita la cámara cuando MediaPipe y el reconocedor están listos"""
+        if error:
+            self.load_progress.visible = False
+            self.show_error(f"Error cargando modelos: {error}")
+            return
+        STARTUP.mark('modelos_listos')
+        self.load_progress.visible = False
+        self.toggle_button.disabled = False
+        self.status_text.value = "Cámara desactivada"
+        self.status_text.color = ft.Colors.GREY_600
+        if self.page:
+            self.page.update()
+        if autostart_requested():
+            self.toggle_camera(None)
         
     def main(self, page: ft.Page):
         self.page = page
+        self.ui = UIRefresher(page)
+        self.video_stream = start_stream_for_page(page)
+        if self.video_stream:
+            # Presupuesto de salida compartido por todos los navegadores (~24 Mbit/s)
+            self.encoder.bandwidth_budget = 3 * 1024 * 1024
         page.title = "Detector de Lenguaje de Señas"
         page.window_width = 1100
         page.window_height = 850
@@ -252,7 +317,8 @@ class HandDetectionApp:
             border_radius=10
         )
         
-        self.status_text = ft.Text("Cámara desactivada", size=16, weight=ft.FontWeight.BOLD)
+        self.status_text = ft.Text("Cargando...", size=16, weight=ft.FontWeight.BOLD)
+        self.load_progress = ft.ProgressBar(width=150, value=0, color=ft.Colors.PURPLE_400)
         
         self.detected_letter = ft.Text(
             "",
@@ -278,6 +344,7 @@ class HandDetectionApp:
             text="Activar Cámara",
             icon=ft.Icons.VIDEOCAM,
             on_click=self.toggle_camera,
+            disabled=not self.loader.loaded,
             style=ft.ButtonStyle(
                 color=ft.Colors.WHITE,
                 bgcolor=ft.Colors.GREEN,
@@ -352,6 +419,7 @@ class HandDetectionApp:
                             self.speak_button,
                             ft.Container(width=20),
                             self.status_text,
+                            self.load_progress,
                         ], alignment=ft.MainAxisAlignment.CENTER),
                         margin=ft.Margin(0, 0, 0, 20)
                     ),
@@ -437,6 +505,10 @@ class HandDetectionApp:
                 padding=30
             )
         )
+        STARTUP.mark('primer_pintado')
+        
+        # Con la ventana ya pintada, MediaPipe y el reconocedor cargan en segundo plano
+        self.loader.start()
     
     def speak_text(self, e):
         """Lee en voz alta el texto acumulado"""
@@ -453,44 +525,28 @@ class HandDetectionApp:
                 self.page.update()
             return
         
-        # Ejecutar en un hilo separado para no bloquear la UI
-        def speak_thread():
-            try:
-                self.status_text.value = "🔊 Leyendo texto..."
-                self.status_text.color = ft.Colors.TEAL
-                if self.page:
-                    self.page.update()
-                
-                # Crear una nueva instancia del motor para cada lectura
-                tts_engine = pyttsx3.init()
-                tts_engine.setProperty('rate', 150)
-                tts_engine.setProperty('volume', 0.9)
-                
-                tts_engine.say(text)
-                tts_engine.runAndWait()
-                
-                # Limpiar el motor después de usarlo
-                tts_engine.stop()
-                del tts_engine
-                
-                if self.camera_active:
-                    self.status_text.value = "Cámara activada - Forma las letras..."
-                    self.status_text.color = ft.Colors.GREEN
-                else:
-                    self.status_text.value = "Cámara desactivada"
-                    self.status_text.color = ft.Colors.GREY_600
-                
-                if self.page:
-                    self.page.update()
-                    
-            except Exception as ex:
-                print(f"Error al leer texto: {ex}")
+        # Lo lee el hilo de voz; los avisos llegan desde ese hilo
+        def on_start(spoken):
+            self.status_text.value = "🔊 Leyendo texto..."
+            self.status_text.color = ft.Colors.TEAL
+            if self.page:
+                self.page.update()
+        
+        def on_done(spoken, error):
+            if error is not None:
                 self.status_text.value = "Error al leer el texto"
                 self.status_text.color = ft.Colors.RED
-                if self.page:
-                    self.page.update()
+            elif self.camera_active:
+                self.status_text.value = "Cámara activada - Forma las letras..."
+                self.status_text.color = ft.Colors.GREEN
+            else:
+                self.status_text.value = "Cámara desactivada"
+                self.status_text.color = ft.Colors.GREY_600
+            if self.page:
+                self.page.update()
         
-        threading.Thread(target=speak_thread, daemon=True).start()
+        # Con varios clics seguidos solo queda pendiente la última lectura
+        self.tts.say(text, key='texto', on_start=on_start, on_done=on_done)
     
     def clear_text(self, e):
         """Limpia el texto acumulado"""
@@ -506,73 +562,84 @@ class HandDetectionApp:
         if self.page:
             self.page.update()
     
-    def frame_to_base64(self, frame):
-        """Convierte frame a base64 para Flet"""
+    def encode_frame(self, frame):
+        """Codifica el frame a JPEG (bytes crudos, sin base64)"""
         try:
-            _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-            jpg_base64 = base64.b64encode(buffer.tobytes()).decode('utf-8')
-            return jpg_base64
+            # Cada cliente del flujo suma al ancho de banda de salida
+            viewers = self.video_stream.clients if self.video_stream else 1
+            # Percentiles sobre el video (solo con SIGNS_STAGE_OVERLAY)
+            frame = self.timing.draw_overlay(frame)
+            with self.timing.stage('codificacion'):
+                return self.encoder.encode(frame, viewers=viewers)
         except Exception as e:
-            print(f"Error convirtiendo frame a base64: {e}")
-            return ""
+            print(f"Error codificando frame: {e}")
+            return None
     
     def process_frame(self, frame):
         """Procesa el frame para detectar manos y reconocer letras"""
         try:
-            # Convertir BGR a RGB para MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            rgb_frame = cv2.flip(rgb_frame, 1)  # Efecto espejo
-            frame = cv2.flip(frame, 1)
+            if self.skipper.should_infer():
+                # Espejo en el mismo buffer y RGB en un buffer reutilizado para MediaPipe
+                with self.timing.stage('preparacion'):
+                    frame, rgb_frame = self.frame_preparer.prepare(frame)
+                # Al pacer solo le cuentan las llamadas reales a MediaPipe
+                with self.timing.stage('mediapipe'), self.pacer.measure():
+                    results = self.hand_tracker.process(rgb_frame)
+                self.skipper.observe(results)
+            else:
+                # Frame intermedio: landmarks extrapolados sin pasar por MediaPipe,
+                # los buffers de estabilidad siguen avanzando un paso por frame
+                frame = mirror_in_place(frame)
+                results = self.skipper.predict()
             
-            results = self.hands.process(rgb_frame)
+            overlay_text = None
             
             detected_letter = None
             
             if results.multi_hand_landmarks:
                 for hand_landmarks in results.multi_hand_landmarks:
                     # Dibujar landmarks
-                    self.mp_draw.draw_landmarks(
-                        frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
-                        self.mp_draw.DrawingSpec(color=(0, 0, 255), thickness=2, circle_radius=3),
-                        self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2)
-                    )
-                    
-                    # Reconocer letra
-                    letter = self.recognizer.recognize_letter(hand_landmarks.landmark)
+                    with self.timing.stage('dibujo'):
+                        self.mp_draw.draw_landmarks(
+                            frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
+                            self.mp_draw.DrawingSpec(color=(0, 0, 255), thickness=2, circle_radius=3),
+                            self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2)
+                        )
+                
+                # Reconocer letra de todas las manos en una llamada
+                with self.timing.stage('reconocimiento'):
+                    hands = [extract_features(h) for h in results.multi_hand_landmarks]
+                    letters = recognize_hands(self.recognizer, 'recognize_letter', hands)
+                for letter in letters:
                     if letter:
                         detected_letter = letter
+                        STARTUP.mark('primer_reconocimiento')
                         
                         # Mostrar letra en el frame
-                        cv2.putText(frame, f"Letra: {letter}", (10, 50),
+                        overlay_text = f"Letra: {letter}"
+                        cv2.putText(frame, overlay_text, (10, 50),
                                   cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 255, 0), 3)
             
+            # Última detección, reutilizada en los frames que omiten la inferencia
+            with self.overlay_lock:
+                self.last_hand_landmarks = results.multi_hand_landmarks or []
+                self.last_overlay_text = overlay_text
+            
             # Sistema de estabilización
             if detected_letter:
-                self.letter_buffer.append(detected_letter)
-                
-                # Contar ocurrencias de la letra más común
-                if len(self.letter_buffer) >= self.stability_threshold:
-                    most_common = max(set(self.letter_buffer), key=self.letter_buffer.count)
-                    count = self.letter_buffer.count(most_common)
-                    
-                    if count >= self.stability_threshold:
-                        if most_common != self.last_detected_letter:
-                            # Nueva letra detectada de forma estable
-                            self.accumulated_text += most_common
-                            self.accumulated_display.value = self.accumulated_text
-                            self.last_detected_letter = most_common
-                            self.letter_stable_count = 0
+                stable = self.letter_voter.push(detected_letter)
+                if stable:
+                    # Nueva letra detectada de forma estable
+                    self.letter_voter.commit(stable)
+                    self.accumulated_text += stable
+                    self.ui.set(self.accumulated_display, value=self.accumulated_text)
                 
                 # Actualizar display de letra actual
-                self.detected_letter.value = detected_letter
+                self.ui.set(self.detected_letter, value=detected_letter)
             else:
-                # Solo limpiar la última letra detectada cuando no hay mano
-                if len(self.letter_buffer) > 0:
-                    self.letter_buffer.popleft()
-                
-                if len(self.letter_buffer) == 0:
-                    self.last_detected_letter = None
-                    self.detected_letter.value = ""
+                # Sin mano: la ventana se vacía y la misma seña puede repetirse
+                if self.letter_voter.miss():
+                    self.ui.set(self.detected_letter, value="")
             
             return frame
             
@@ -581,36 +648,74 @@ class HandDetectionApp:
             return frame
     
     def camera_loop(self):
-        """Bucle principal de la cámara"""
-        while self.camera_active and self.cap:
-            try:
-                ret, frame = self.cap.read()
-                if ret:
-                    # Procesar frame
-                    processed_frame = self.process_frame(frame)
-                    
-                    # Convertir a base64
-                    base64_image = self.frame_to_base64(processed_frame)
-                    if base64_image:
-                        self.image_display.src_base64 = base64_image
-                    
-                    # Actualizar interfaz
-                    if self.page:
-                        self.page.update()
-                        
-                else:
-                    print("No se pudo leer frame de la cámara")
-                    break
-                    
-            except Exception as e:
-                print(f"Error en camera_loop: {e}")
-                break
-                
-            time.sleep(0.033)  # ~30 FPS
+        """Bucle principal de la cámara: captura, inferencia, codificación y render en paralelo"""
+        self.pacer = FramePacer(target_fps=self.target_fps)
+        self.pipeline = FramePipeline(
+            source=self.read_frame,
+            pacer=self.pacer,
+            bypass=self.mirror_frame,
+            stages=[
+                ('inferencia', self.process_frame),
+                ('codificacion', self.encode_frame),
+                ('render', self.render_frame),
+            ],
+        )
+        self.pipeline.run()
+    
+    def read_frame(self):
+        """Etapa de captura: devuelve el siguiente frame o None para terminar"""
+        cap = self.cap
+        if not self.camera_active or cap is None:
+            return None
+        
+        with self.timing.stage('captura'):
+            ret, frame = cap.read()
+        if not ret:
+            if self.camera_active:
+                print("No se pudo leer frame de la cámara")
+            return None
+        return frame
+    
+    def mirror_frame(self, frame):
+        """Frame en espejo sin inferencia, con la última detección dibujada encima"""
+        frame = mirror_in_place(frame)
+        with self.overlay_lock:
+            hand_landmarks_list, overlay_text = self.last_hand_landmarks, self.last_overlay_text
+        for hand_landmarks in hand_landmarks_list:
+            with self.timing.stage('dibujo'):
+                self.mp_draw.draw_landmarks(
+                    frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
+                    self.mp_draw.DrawingSpec(color=(0, 0, 255), thickness=2, circle_radius=3),
+                    self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2)
+                )
+        if overlay_text:
+            cv2.putText(frame, overlay_text, (10, 50),
+                      cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 255, 0), 3)
+        return frame
+    
+    def render_frame(self, jpeg_bytes):
+        """Etapa de render: publica el frame codificado en la interfaz"""
+        if jpeg_bytes:
+            if self.video_stream:
+                # El control Image lee el flujo MJPEG: sin base64 por frame
+                self.video_stream.publish(jpeg_bytes)
+            else:
+                with self.timing.stage('base64'):
+                    self.image_display.src_base64 = base64.b64encode(jpeg_bytes).decode('utf-8')
+                self.ui.mark(self.image_display, immediate=True)
+        
+        # Solo se envían los controles que cambiaron, no todo el árbol
+        with self.timing.stage('render'):
+            self.ui.flush()
+        
+        elapsed = self.camera_timer.stop()
+        if elapsed is not None:
+            STARTUP.record('boton_a_primer_frame', elapsed)
     
     def toggle_camera(self, e):
         """Activa/desactiva la cámara"""
         if not self.camera_active:
+            self.camera_timer.start()
             try:
                 self.cap = cv2.VideoCapture(0)
                 
@@ -623,8 +728,14 @@ class HandDetectionApp:
                 self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
                 
                 self.camera_active = True
+                self.hand_tracker.reset()
+                self.skipper.reset()
+                if self.video_stream:
+                    self.image_display.src = self.video_stream.url(fresh=True)
+                    self.image_display.src_base64 = None
                 
                 # Iniciar hilo de cámara
+                self.timing.start()
                 self.camera_thread = threading.Thread(target=self.camera_loop, daemon=True)
                 self.camera_thread.start()
                 
@@ -641,12 +752,16 @@ class HandDetectionApp:
         else:
             # Desactivar cámara
             self.camera_active = False
+            if self.pipeline:
+                self.pipeline.stop()
             
             if self.cap:
                 self.cap.release()
                 self.cap = None
+            self.timing.stop()
             
             # Limpiar interfaz
+            self.image_display.src = None
             self.image_display.src_base64 = ""
             self.toggle_button.text = "Activar Cámara"
             self.toggle_button.icon = ft.Icons.VIDEOCAM
@@ -669,12 +784,18 @@ class HandDetectionApp:
         """Maneja eventos de ventana"""
         if e.data == "close":
             self.camera_active = False
+            if self.pipeline:
+                self.pipeline.stop()
             if self.cap:
                 self.cap.release()
+            if self.video_stream:
+                self.video_stream.stop()
+            self.timing.stop()
+            self.tts.close()
 
 
 def main(page: ft.Page):
-    app = HandDetectionApp()
+    app = HandDetectionApp(recognizer_mode=recognizer_mode_requested())
     app.main(page)
 
 if __name__ == "__main__":
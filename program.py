@@ -4,26 +4,49 @@ Versión mejorada con reconocimiento preciso, modo entrenamiento, historial y m
 """
 
 import flet as ft
-import cv2
 import base64
 import threading
 import time
-import mediapipe as mp
 import numpy as np
 from collections import deque
 from datetime import datetime
-import json
 import os
-import pyttsx3
+from utils.frame_skipping import InferenceSkipper
+from utils.frames import FramePreparer, mirror_in_place
+from utils.hand_features import FINGER_TIPS, FINGER_PIPS, FINGER_MCPS, as_features, extract_features
+from utils.history_export import EXTENSIONS, HistoryExporter
+from utils.history_maintenance import HistoryMaintenance
+from utils.jpeg_encoder import AdaptiveJPEGEncoder
+from utils.landmark_classifier import recognize_hands, select_recognizer
+from utils.landmark_recording import LandmarkRecorder, recording_requested
+from utils.pacing import FramePacer
+from utils.pipeline import FramePipeline
+from utils.roi_tracker import ROIHandTracker
+from utils.session_journal import SessionJournal, replay_journal
+from utils.session_store import SessionStore
+from utils.stability import StabilityVoter
+from utils.stage_timing import StageTimer
+from utils.startup import (BackgroundLoader, OneShotTimer, StartupTimer, autostart_requested, lazy_import, preload,
+                           recognizer_mode_requested)
+from utils.tts_worker import TTSWorker
+from utils.ui_updates import UIRefresher
+from utils.video_stream import start_stream_for_page
+from utils.warmup import warm_up_hands
+
+# Módulos pesados: se cargan en segundo plano después de pintar la interfaz
+cv2 = lazy_import('cv2')
+mp = lazy_import('mediapipe')
+
+STARTUP = StartupTimer('program.py')
 
 
 class SignLanguageRecognizer:
     """Reconocedor mejorado de lenguaje de señas con calibración y confianza"""
     
     def __init__(self):
-        self.finger_tips = [4, 8, 12, 16, 20]
-        self.finger_pips = [3, 6, 10, 14, 18]
-        self.finger_mcps = [2, 5, 9, 13, 17]
+        self.finger_tips = FINGER_TIPS
+        self.finger_pips = FINGER_PIPS
+        self.finger_mcps = FINGER_MCPS
         
         # Umbrales calibrables
         self.thresholds = {
@@ -36,34 +59,22 @@ class SignLanguageRecognizer:
         
     def get_finger_states(self, landmarks):
         """Determina qué dedos están extendidos"""
-        states = []
-        
-        # Pulgar (lógica horizontal)
-        thumb_extended = landmarks[4].x < landmarks[3].x if landmarks[9].x < landmarks[0].x else landmarks[4].x > landmarks[3].x
-        states.append(thumb_extended)
-        
-        # Resto de dedos (lógica vertical)
-        for tip, pip in zip(self.finger_tips[1:], self.finger_pips[1:]):
-            extended = landmarks[tip].y < landmarks[pip].y
-            states.append(extended)
-        
-        return states
+        # Pulgar (lógica horizontal) y resto de dedos (lógica vertical)
+        return as_features(landmarks).finger_states()
     
     def calculate_confidence(self, landmarks, detected_letter, finger_states):
         """Calcula la confianza de la detección (0-100%)"""
+        f = as_features(landmarks)
         confidence = 100.0
         
         # Factores que reducen confianza:
         # 1. Mano muy cerca o muy lejos
-        hand_size = np.sqrt(
-            (landmarks[0].x - landmarks[9].x)**2 + 
-            (landmarks[0].y - landmarks[9].y)**2
-        )
+        hand_size = f.dist[0, 9]
         if hand_size < 0.15 or hand_size > 0.35:
             confidence -= 20
         
         # 2. Mano muy inclinada
-        wrist_middle = abs(landmarks[0].y - landmarks[9].y)
+        wrist_middle = abs(f.y[0] - f.y[9])
         if wrist_middle > 0.3:
             confidence -= 15
         
@@ -73,199 +84,183 @@ class SignLanguageRecognizer:
     
     def recognize_letter(self, landmarks):
         """Reconoce la letra basándose en los landmarks - VERSIÓN CORREGIDA"""
-        states = self.get_finger_states(landmarks)
+        f = as_features(landmarks)
+        states = f.finger_states()
+        x, y, d = f.x, f.y, f.dist
         
         # [Pulgar, Índice, Medio, Anular, Meñique]
         thumb, index, middle, ring, pinky = states
         
         # Calcular distancias para gestos específicos
-        thumb_index_dist = np.sqrt(
-            (landmarks[4].x - landmarks[8].x)**2 + 
-            (landmarks[4].y - landmarks[8].y)**2
-        )
-        
-        thumb_middle_dist = np.sqrt(
-            (landmarks[4].x - landmarks[12].x)**2 + 
-            (landmarks[4].y - landmarks[12].y)**2
-        )
-        
-        thumb_ring_dist = np.sqrt(
-            (landmarks[4].x - landmarks[16].x)**2 + 
-            (landmarks[4].y - landmarks[16].y)**2
-        )
-        
-        index_middle_dist = np.sqrt(
-            (landmarks[8].x - landmarks[12].x)**2 + 
-            (landmarks[8].y - landmarks[12].y)**2
-        )
+        thumb_index_dist = d[4, 8]
+        thumb_middle_dist = d[4, 12]
+        thumb_ring_dist = d[4, 16]
+        index_middle_dist = d[8, 12]
         
         # ORDEN IMPORTANTE: Evaluar casos más específicos primero
         
         # B - Mano abierta, dedos juntos, pulgar cruzado
         if not thumb and index and middle and ring and pinky:
             fingers_together = (
-                abs(landmarks[8].x - landmarks[12].x) < self.thresholds['finger_together'] and
-                abs(landmarks[12].x - landmarks[16].x) < self.thresholds['finger_together'] and
-                abs(landmarks[16].x - landmarks[20].x) < self.thresholds['finger_together']
+                abs(x[8] - x[12]) < self.thresholds['finger_together'] and
+                abs(x[12] - x[16]) < self.thresholds['finger_together'] and
+                abs(x[16] - x[20]) < self.thresholds['finger_together']
             )
             if fingers_together:
-                return 'B', self.calculate_confidence(landmarks, 'B', states)
+                return 'B', self.calculate_confidence(f, 'B', states)
         
         # F - OK sign - índice y pulgar tocándose, resto arriba
         if thumb and not index and middle and ring and pinky:
             if thumb_index_dist < self.thresholds['thumb_touch']:
-                return 'F', self.calculate_confidence(landmarks, 'F', states)
+                return 'F', self.calculate_confidence(f, 'F', states)
         
         # W - Tres dedos arriba separados
         if not thumb and index and middle and ring and not pinky:
-            separated = (abs(landmarks[8].x - landmarks[12].x) > self.thresholds['finger_together'] and 
-                        abs(landmarks[12].x - landmarks[16].x) > self.thresholds['finger_together'])
-            similar_height = (abs(landmarks[8].y - landmarks[12].y) < 0.08 and
-                            abs(landmarks[12].y - landmarks[16].y) < 0.08)
+            separated = (abs(x[8] - x[12]) > self.thresholds['finger_together'] and 
+                        abs(x[12] - x[16]) > self.thresholds['finger_together'])
+            similar_height = (abs(y[8] - y[12]) < 0.08 and
+                            abs(y[12] - y[16]) < 0.08)
             if separated and similar_height:
-                return 'W', self.calculate_confidence(landmarks, 'W', states)
+                return 'W', self.calculate_confidence(f, 'W', states)
         
         # K - Índice y medio en V, pulgar entre ellos
         if thumb and index and middle and not ring and not pinky:
-            v_shape = abs(landmarks[8].x - landmarks[12].x) > 0.12
-            thumb_between = landmarks[4].y < landmarks[6].y and landmarks[4].y < landmarks[10].y
-            not_pointing_down = not (landmarks[8].y > landmarks[6].y)
+            v_shape = abs(x[8] - x[12]) > 0.12
+            thumb_between = y[4] < y[6] and y[4] < y[10]
+            not_pointing_down = not (y[8] > y[6])
             if v_shape and thumb_between and not_pointing_down:
-                return 'K', self.calculate_confidence(landmarks, 'K', states)
+                return 'K', self.calculate_confidence(f, 'K', states)
         
         # P - Como K pero apuntando hacia abajo
         if thumb and index and middle and not ring and not pinky:
-            pointing_down = landmarks[8].y > landmarks[6].y and landmarks[12].y > landmarks[10].y
-            v_shape = abs(landmarks[8].x - landmarks[12].x) > 0.08
+            pointing_down = y[8] > y[6] and y[12] > y[10]
+            v_shape = abs(x[8] - x[12]) > 0.08
             if pointing_down and v_shape:
-                return 'P', self.calculate_confidence(landmarks, 'P', states)
+                return 'P', self.calculate_confidence(f, 'P', states)
         
         # R - Índice y medio cruzados
         if not thumb and index and middle and not ring and not pinky:
-            crossed = (landmarks[8].x > landmarks[12].x if landmarks[8].y < landmarks[12].y 
-                      else landmarks[8].x < landmarks[12].x)
+            crossed = (x[8] > x[12] if y[8] < y[12] 
+                      else x[8] < x[12])
             close = index_middle_dist < 0.08
             if crossed and close:
-                return 'R', self.calculate_confidence(landmarks, 'R', states)
+                return 'R', self.calculate_confidence(f, 'R', states)
         
         # U - Índice y medio juntos arriba (verticales)
         if not thumb and index and middle and not ring and not pinky:
-            together = abs(landmarks[8].x - landmarks[12].x) < self.thresholds['finger_together']
-            vertical = abs(landmarks[8].y - landmarks[12].y) < self.thresholds['vertical']
+            together = abs(x[8] - x[12]) < self.thresholds['finger_together']
+            vertical = abs(y[8] - y[12]) < self.thresholds['vertical']
             if together and vertical:
-                return 'U', self.calculate_confidence(landmarks, 'U', states)
+                return 'U', self.calculate_confidence(f, 'U', states)
         
         # V - Índice y medio en V separados
         if not thumb and index and middle and not ring and not pinky:
-            v_shape = abs(landmarks[8].x - landmarks[12].x) > self.thresholds['finger_separated']
-            similar_height = abs(landmarks[8].y - landmarks[12].y) < 0.08
+            v_shape = abs(x[8] - x[12]) > self.thresholds['finger_separated']
+            similar_height = abs(y[8] - y[12]) < 0.08
             if v_shape and similar_height:
-                return 'V', self.calculate_confidence(landmarks, 'V', states)
+                return 'V', self.calculate_confidence(f, 'V', states)
         
         # H - Índice y medio horizontales juntos
         if not thumb and index and middle and not ring and not pinky:
-            horizontal = abs(landmarks[8].y - landmarks[12].y) < self.thresholds['horizontal']
-            fingers_together = abs(landmarks[8].x - landmarks[12].x) < 0.18
+            horizontal = abs(y[8] - y[12]) < self.thresholds['horizontal']
+            fingers_together = abs(x[8] - x[12]) < 0.18
             if horizontal and fingers_together:
-                return 'H', self.calculate_confidence(landmarks, 'H', states)
+                return 'H', self.calculate_confidence(f, 'H', states)
         
         # G - Índice y pulgar horizontales apuntando
         if thumb and index and not middle and not ring and not pinky:
-            horizontal = abs(landmarks[4].y - landmarks[8].y) < self.thresholds['horizontal']
-            pointing = landmarks[8].x > landmarks[5].x or landmarks[8].x < landmarks[5].x
+            horizontal = abs(y[4] - y[8]) < self.thresholds['horizontal']
+            pointing = x[8] > x[5] or x[8] < x[5]
             if horizontal and pointing:
-                return 'G', self.calculate_confidence(landmarks, 'G', states)
+                return 'G', self.calculate_confidence(f, 'G', states)
         
         # L - L con índice y pulgar perpendiculares
         if thumb and index and not middle and not ring and not pinky:
-            perpendicular = abs(landmarks[4].x - landmarks[8].x) > 0.18
-            index_up = landmarks[8].y < landmarks[4].y
+            perpendicular = abs(x[4] - x[8]) > 0.18
+            index_up = y[8] < y[4]
             if perpendicular and index_up:
-                return 'L', self.calculate_confidence(landmarks, 'L', states)
+                return 'L', self.calculate_confidence(f, 'L', states)
         
         # D - Índice arriba, resto forma O con pulgar
         if not thumb and index and not middle and not ring and not pinky:
             if thumb_middle_dist < 0.12 and thumb_ring_dist < 0.12:
-                return 'D', self.calculate_confidence(landmarks, 'D', states)
+                return 'D', self.calculate_confidence(f, 'D', states)
         
         # Y - Pulgar y meñique extendidos (shaka)
         if thumb and not index and not middle and not ring and pinky:
-            thumb_pinky_dist = np.sqrt(
-                (landmarks[4].x - landmarks[20].x)**2 + 
-                (landmarks[4].y - landmarks[20].y)**2
-            )
+            thumb_pinky_dist = d[4, 20]
             if thumb_pinky_dist > 0.20:
-                return 'Y', self.calculate_confidence(landmarks, 'Y', states)
+                return 'Y', self.calculate_confidence(f, 'Y', states)
         
         # I - Meñique arriba, resto cerrado
         if not thumb and not index and not middle and not ring and pinky:
-            if landmarks[20].y < landmarks[18].y - 0.05:
-                return 'I', self.calculate_confidence(landmarks, 'I', states)
+            if y[20] < y[18] - 0.05:
+                return 'I', self.calculate_confidence(f, 'I', states)
         
         # A - Puño cerrado con pulgar al lado
         if not index and not middle and not ring and not pinky and thumb:
-            if landmarks[4].y > landmarks[2].y:
-                return 'A', self.calculate_confidence(landmarks, 'A', states)
+            if y[4] > y[2]:
+                return 'A', self.calculate_confidence(f, 'A', states)
         
         # Casos con todos los dedos cerrados: C, E
         if not index and not middle and not ring and not pinky:
             # E - Pulgar sobre dedos cerrados (puño completo)
-            if not thumb and landmarks[4].y < landmarks[8].y and thumb_index_dist < 0.15:
-                return 'E', self.calculate_confidence(landmarks, 'E', states)
+            if not thumb and y[4] < y[8] and thumb_index_dist < 0.15:
+                return 'E', self.calculate_confidence(f, 'E', states)
             
             # C - Mano en forma de C (dedos curvados, pulgar separado)
             if not thumb and 0.15 < thumb_index_dist < 0.35:
-                if landmarks[4].y > landmarks[8].y:
-                    return 'C', self.calculate_confidence(landmarks, 'C', states)
+                if y[4] > y[8]:
+                    return 'C', self.calculate_confidence(f, 'C', states)
         
         # Casos con pulgar extendido y resto cerrado: O, S, T
         if thumb and not index and not middle and not ring and not pinky:
             # S - Puño con pulgar sobre dedos
-            thumb_on_top = (landmarks[4].y < landmarks[6].y and 
-                          landmarks[4].x > landmarks[5].x and 
-                          landmarks[4].x < landmarks[17].x)
-            if thumb_on_top and landmarks[4].y < landmarks[2].y:
-                return 'S', self.calculate_confidence(landmarks, 'S', states)
+            thumb_on_top = (y[4] < y[6] and 
+                          x[4] > x[5] and 
+                          x[4] < x[17])
+            if thumb_on_top and y[4] < y[2]:
+                return 'S', self.calculate_confidence(f, 'S', states)
             
             # T - Pulgar sobresaliendo entre índice y medio
-            thumb_between = (landmarks[4].y > landmarks[5].y and 
-                           landmarks[4].y < landmarks[9].y and
-                           landmarks[4].x > landmarks[6].x - 0.05 and
-                           landmarks[4].x < landmarks[10].x + 0.05)
+            thumb_between = (y[4] > y[5] and 
+                           y[4] < y[9] and
+                           x[4] > x[6] - 0.05 and
+                           x[4] < x[10] + 0.05)
             if thumb_between:
-                return 'T', self.calculate_confidence(landmarks, 'T', states)
+                return 'T', self.calculate_confidence(f, 'T', states)
             
             # O - Todos los dedos formando círculo
             circle = (thumb_index_dist < 0.12 and 
                      thumb_middle_dist < 0.15 and
                      thumb_ring_dist < 0.18)
-            not_s = landmarks[4].y > landmarks[6].y - 0.05
+            not_s = y[4] > y[6] - 0.05
             if circle and not_s:
-                return 'O', self.calculate_confidence(landmarks, 'O', states)
+                return 'O', self.calculate_confidence(f, 'O', states)
         
         # M - Tres dedos doblados sobre pulgar
         if not thumb and not index and not middle and not ring and pinky:
-            thumb_covered = (landmarks[4].x > landmarks[6].x - 0.05 and 
-                           landmarks[4].x < landmarks[14].x + 0.05 and
-                           landmarks[4].y > landmarks[5].y)
+            thumb_covered = (x[4] > x[6] - 0.05 and 
+                           x[4] < x[14] + 0.05 and
+                           y[4] > y[5])
             if thumb_covered:
-                return 'M', self.calculate_confidence(landmarks, 'M', states)
+                return 'M', self.calculate_confidence(f, 'M', states)
         
         # N - Dos dedos doblados sobre pulgar
         if not thumb and not index and not middle and ring and pinky:
-            thumb_covered = (landmarks[4].x > landmarks[6].x - 0.05 and 
-                           landmarks[4].x < landmarks[10].x + 0.05 and
-                           landmarks[4].y > landmarks[5].y)
-            if thumb_covered and landmarks[16].y < landmarks[14].y:
-                return 'N', self.calculate_confidence(landmarks, 'N', states)
+            thumb_covered = (x[4] > x[6] - 0.05 and 
+                           x[4] < x[10] + 0.05 and
+                           y[4] > y[5])
+            if thumb_covered and y[16] < y[14]:
+                return 'N', self.calculate_confidence(f, 'N', states)
         
         # Mano abierta (todos extendidos)
         if thumb and index and middle and ring and pinky:
-            fingers_spread = (abs(landmarks[8].x - landmarks[12].x) > 0.08 and
-                            abs(landmarks[12].x - landmarks[16].x) > 0.08 and
-                            abs(landmarks[16].x - landmarks[20].x) > 0.08)
+            fingers_spread = (abs(x[8] - x[12]) > 0.08 and
+                            abs(x[12] - x[16]) > 0.08 and
+                            abs(x[16] - x[20]) > 0.08)
             if fingers_spread:
-                return '5', self.calculate_confidence(landmarks, '5', states)
+                return '5', self.calculate_confidence(f, '5', states)
         
         return None, 0
 
@@ -312,14 +307,62 @@ class HistoryManager:
     
     def __init__(self):
         self.history_dir = "sign_language_history"
+        # Landmarks por frame de cada sesión (ver utils/landmark_recording.py)
+        self.recordings_dir = os.path.join(self.history_dir, "recordings")
         if not os.path.exists(self.history_dir):
             os.makedirs(self.history_dir)
+        # Sesiones en una base indexada; los session_*.json anteriores se importan una vez
+        self.store = SessionStore(os.path.join(self.history_dir, "sessions.db"))
+        self.store.import_json_dir(self.history_dir)
         self.current_session = {
             'start_time': datetime.now().isoformat(),
             'letters_detected': 0,
             'text': '',
             'accuracy': 0.0
         }
+        # Diario de la sesión en curso: se recupera si la app no llegó a guardarla
+        self.journal_dir = os.path.join(self.history_dir, "journal")
+        self.recover_sessions()
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.journal = SessionJournal(os.path.join(self.journal_dir, f"session_{timestamp}.jsonl"))
+        self.journal.record('inicio', start_time=self.current_session['start_time'])
+        # Archivado y retención en segundo plano: las sesiones viejas pasan a
+        # segmentos comprimidos que load_history sigue mostrando
+        self.maintenance = HistoryMaintenance(self.store, self.history_dir).start()
+    
+    def recover_sessions(self):
+        """Guarda en el historial las sesiones de diarios que quedaron sin cerrar"""
+        if not os.path.isdir(self.journal_dir):
+            return 0
+        recovered = 0
+        for filename in sorted(os.listdir(self.journal_dir)):
+            path = os.path.join(self.journal_dir, filename)
+            session = replay_journal(path)
+            if session is None:
+                continue
+            if session['text']:
+                # source evita duplicarla si se corta otra vez antes de borrar el diario
+                self.store.add(session, source=f"journal/{filename}")
+                recovered += 1
+            os.remove(path)
+        if recovered:
+            print(f"Sesiones recuperadas del diario: {recovered}")
+        return recovered
+    
+    def log(self, event, **data):
+        """Agrega un evento al diario sin bloquear (lo escribe un hilo aparte)"""
+        self.journal.record(event, **data)
+    
+    def add_letter(self, letter, confidence):
+        """Letra confirmada: tiempo desde el inicio y confianza para exportar después"""
+        elapsed = (datetime.now() - datetime.fromisoformat(self.current_session['start_time'])).total_seconds()
+        self.current_session.setdefault('letters', []).append([round(elapsed, 3), letter, round(confidence, 1)])
+        self.log('letra', letra=letter, confianza=round(confidence, 1))
+    
+    def clear_letters(self):
+        """El texto se borró: las letras anteriores ya no forman parte de la sesión"""
+        self.current_session['letters'] = []
+        self.log('borrar')
     
     def save_session(self, text, letters_count, avg_confidence):
         """Guarda la sesión actual"""
@@ -328,11 +371,25 @@ class HistoryManager:
         self.current_session['letters_detected'] = letters_count
         self.current_session['accuracy'] = avg_confidence
         
-        filename = f"{self.history_dir}/session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.current_session, f, indent=2, ensure_ascii=False)
-        
-        return filename
+        session_id = self.store.add(self.current_session)
+        # Ya está en el historial: el diario no hace falta
+        self.journal.close(remove=True)
+        return session_id
+    
+    def close(self):
+        """Cierra el diario; si la sesión no se guardó queda para recuperarla"""
+        self.maintenance.stop()
+        self.journal.close()
+    
+    def start_recording(self, max_hands=1):
+        """Abre la grabación de landmarks de la sesión y la referencia en su historial"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = os.path.join(self.recordings_dir, f"session_{timestamp}.slmk")
+        recorder = LandmarkRecorder(filename, max_hands=max_hands,
+                                    meta={'app': 'program.py', 'start_time': self.current_session['start_time']})
+        self.current_session['recording'] = filename
+        self.log('grabacion', ruta=filename)
+        return recorder
     
     def export_text(self, text, format='txt'):
         """Exporta el texto traducido"""
@@ -347,63 +404,164 @@ class HistoryManager:
         
         return filename
     
-    def load_history(self):
-        """Carga el historial de sesiones"""
-        sessions = []
-        if os.path.exists(self.history_dir):
-            for filename in os.listdir(self.history_dir):
-                if filename.endswith('.json'):
-                    with open(os.path.join(self.history_dir, filename), 'r', encoding='utf-8') as f:
-                        sessions.append(json.load(f))
-        return sorted(sessions, key=lambda x: x.get('start_time', ''), reverse=True)
+    def export_history(self, format='jsonl', start=None, end=None, include_letters=True,
+                       on_progress=None, on_done=None):
+        """Exporta un rango de fechas del historial en segundo plano; devuelve el HistoryExporter"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = os.path.join(self.history_dir, "exports", f"historial_{timestamp}{EXTENSIONS[format]}")
+        return HistoryExporter(self.store, filename, format, start, end, include_letters,
+                               on_progress=on_progress, on_done=on_done).start()
+    
+    def load_history(self, limit=20, before=None):
+        """
+        Una página del historial, la sesión más reciente primero
+        
+        Devuelve (sesiones, cursor); el cursor se pasa como before para la
+        página siguiente y es None cuando no hay más.
+        """
+        return self.store.page(limit, before)
 
 
 class SignLanguageApp:
     """Aplicación principal con interfaz Flet"""
     
-    def __init__(self):
+    def __init__(self, recognizer_mode="reglas", record_landmarks=False):
+        """
+        recognizer_mode: 'reglas' (umbrales escritos a mano) o 'modelo' (clasificador entrenado)
+        record_landmarks: guardar los landmarks de cada frame inferido junto al historial
+        """
         self.cap = None
         self.camera_active = False
         self.camera_thread = None
+        self.pipeline = None
+        self.video_stream = None
+        self.encoder = AdaptiveJPEGEncoder(quality=85)
+        self.ui = None
+        self.pacer = None
+        self.target_fps = 30
+        # Última detección para los frames que no pasan por la inferencia;
+        # la escribe el hilo de inferencia y la lee el de captura (mirror_frame)
+        self.last_hand_landmarks = []
+        self.last_overlay_text = None
+        self.overlay_lock = threading.Lock()
+        self.frame_preparer = FramePreparer()
         self.page = None
         
-        # Configurar MediaPipe
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
-        self.mp_draw = mp.solutions.drawing_utils
+        # Historial, MediaPipe, el reconocedor y el motor de voz se cargan en segundo plano
+        self.recognizer_mode = recognizer_mode
+        self.mp_hands = None
+        self.hands = None
+        self.hand_tracker = None
+        self.mp_draw = None
+        self.recognizer = None
+        self.loader = BackgroundLoader([
+            ("Abriendo historial", self.load_history_manager),
+            ("Cargando OpenCV", self.load_opencv),
+            ("Cargando MediaPipe", self.load_hands),
+            ("Calentando MediaPipe", self.warm_up),
+            ("Cargando reconocedor", self.load_recognizer),
+            ("Preparando voz", self.load_tts),
+        ], on_progress=self.on_load_progress, on_done=self.on_load_done)
+        # Inferencia cada N frames según la velocidad de la mano (enabled=False: todos)
+        self.skipper = InferenceSkipper(max_interval=4, enabled=True)
+        # Tiempo desde "Activar Cámara" hasta el primer frame anotado
+        self.camera_timer = OneShotTimer()
+        # Percentiles por etapa (captura, MediaPipe, dibujo, codificación, ...)
+        self.timing = StageTimer('program.py')
+        # Grabación de landmarks de la sesión (se abre con la primera activación de la cámara)
+        self.record_landmarks = record_landmarks
+        self.recorder = None
         
         # Componentes
-        self.recognizer = SignLanguageRecognizer()
         self.translator = TranslationEngine()
-        self.history_manager = HistoryManager()
+        # SQLite, importación de JSON viejos, recuperación del diario y
+        # mantenimiento: se abre en la carga, no antes del primer pintado
+        self.history_manager = None
         
         # Buffer para estabilizar detección
-        self.letter_buffer = deque(maxlen=10)
+        # Ventana en segundos: a 30 FPS equivale a la original (10 frames / umbral 5),
+        # pero la confirmación no depende de la frecuencia de cuadros
+        self.letter_voter = StabilityVoter.timed(window_s=0.33, threshold_s=0.17)
         self.confidence_buffer = deque(maxlen=10)
-        self.last_detected_letter = None
-        self.stability_threshold = 5
         
         # Estadísticas
         self.accumulated_text = ""
         self.letters_count = 0
         self.total_confidence = 0.0
         
-        # TTS
-        self.tts_available = True
-        try:
-            test_engine = pyttsx3.init()
-            test_engine.stop()
-            del test_engine
-        except:
-            self.tts_available = False
+        # TTS: un solo motor en su hilo, se inicializa durante la carga
+        self.tts = TTSWorker(rate=150, volume=0.9, timer=self.timing)
+        self.tts_available = False
+    
+    def load_history_manager(self):
+        self.history_manager = HistoryManager()
+    
+    def load_opencv(self):
+        preload('cv2')
+    
+    def load_hands(self):
+        """Configura MediaPipe (el paso más lento del arranque)"""
+        self.mp_hands = mp.solutions.hands
+        self.mp_draw = mp.solutions.drawing_utils
+        self.hands = self.mp_hands.Hands(
+            static_image_mode=False,
+            max_num_hands=1,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.5
+        )
+        # Recorte a la región de la mano del frame anterior (enabled=False: frame completo)
+        self.hand_tracker = ROIHandTracker(self.hands, max_num_hands=1, enabled=True)
+    
+    def warm_up(self):
+        """Frames sintéticos por Hands: el primer frame real no paga la inicialización del grafo"""
+        report = warm_up_hands(self.hands)
+        print(f"MediaPipe calentado: {report['frames']} frames en {report['total_ms']:.0f} ms "
+              f"(primero {report['first_ms']:.0f} ms)")
+    
+    def load_recognizer(self):
+        self.recognizer = select_recognizer(SignLanguageRecognizer(), self.recognizer_mode,
+                                            return_confidence=True)
+    
+    def load_tts(self):
+        """Inicializa el motor de voz en su hilo (sin voz la app sigue funcionando)"""
+        self.tts_available = self.tts.start().wait_ready()
+    
+    def on_load_progress(self, fraction, description):
+        """Muestra el avance de la carga en segundo plano"""
+        if not self.page:
+            return
+        self.load_progress.value = fraction
+        if description:
+            self.status_text.value = f"{description}..."
+        self.page.update(self.load_progress, self.status_text)
+    
+    def on_load_done(self, error):
+        """Habilita la cámara cuando MediaPipe y el reconocedor están listos"""
+        # El historial se abre primero: queda usable aunque falle un paso posterior
+        if self.history_manager is not None:
+            self.export_button.disabled = False
+            self.history_button.disabled = False
+        if error:
+            self.load_progress.visible = False
+            self.show_error(f"Error cargando modelos: {error}")
+            return
+        STARTUP.mark('modelos_listos')
+        self.load_progress.visible = False
+        self.toggle_button.disabled = False
+        self.status_text.value = "Cámara desactivada"
+        self.status_text.color = ft.Colors.GREY_700
+        if self.page:
+            self.page.update()
+        if autostart_requested():
+            self.toggle_camera(None)
     
     def main(self, page: ft.Page):
         self.page = page
+        self.ui = UIRefresher(page)
+        self.video_stream = start_stream_for_page(page)
+        if self.video_stream:
+            # Presupuesto de salida compartido por todos los navegadores (~24 Mbit/s)
+            self.encoder.bandwidth_budget = 3 * 1024 * 1024
         page.title = "🤟 Traductor Profesional de Lenguaje de Señas"
         page.window_width = 1200
         page.window_height = 900
@@ -419,11 +577,12 @@ class SignLanguageApp:
         )
         
         self.status_text = ft.Text(
-            "Cámara desactivada", 
+            "Cargando...", 
             size=14, 
             weight=ft.FontWeight.BOLD,
             color=ft.Colors.GREY_700
         )
+        self.load_progress = ft.ProgressBar(width=120, value=0, color=ft.Colors.PURPLE_400)
         
         self.detected_letter = ft.Text(
             "",
@@ -474,6 +633,7 @@ class SignLanguageApp:
             text="Iniciar Cámara",
             icon=ft.Icons.VIDEOCAM,
             on_click=self.toggle_camera,
+            disabled=not self.loader.loaded,
             style=ft.ButtonStyle(
                 color=ft.Colors.WHITE,
                 bgcolor=ft.Colors.GREEN,
@@ -514,6 +674,7 @@ class SignLanguageApp:
             text="Exportar",
             icon=ft.Icons.SAVE,
             on_click=self.export_text,
+            disabled=self.history_manager is None,
             style=ft.ButtonStyle(
                 color=ft.Colors.WHITE,
                 bgcolor=ft.Colors.INDIGO,
@@ -524,6 +685,7 @@ class SignLanguageApp:
             text="Historial",
             icon=ft.Icons.HISTORY,
             on_click=self.show_history,
+            disabled=self.history_manager is None,
             style=ft.ButtonStyle(
                 color=ft.Colors.WHITE,
                 bgcolor=ft.Colors.PURPLE,
@@ -557,6 +719,7 @@ class SignLanguageApp:
                             self.history_button,
                             ft.Container(width=10),
                             self.status_text,
+                            self.load_progress,
                         ], alignment=ft.MainAxisAlignment.CENTER),
                         margin=ft.Margin(0, 0, 0, 15)
                     ),
@@ -643,90 +806,115 @@ class SignLanguageApp:
         
         page.window_prevent_close = True
         page.on_window_event = self.on_window_event
+        STARTUP.mark('primer_pintado')
+        
+        # Con la ventana ya pintada, MediaPipe y el reconocedor cargan en segundo plano
+        self.loader.start()
     
     def process_frame(self, frame):
         """Procesa el frame para detectar manos y reconocer letras"""
         try:
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            rgb_frame = cv2.flip(rgb_frame, 1)
-            frame = cv2.flip(frame, 1)
+            timestamp = time.time()
+            inferred = self.skipper.should_infer()
+            if inferred:
+                # Espejo en el mismo buffer y RGB en un buffer reutilizado para MediaPipe
+                with self.timing.stage('preparacion'):
+                    frame, rgb_frame = self.frame_preparer.prepare(frame)
+                # Al pacer solo le cuentan las llamadas reales a MediaPipe
+                with self.timing.stage('mediapipe'), self.pacer.measure():
+                    results = self.hand_tracker.process(rgb_frame)
+                self.skipper.observe(results)
+            else:
+                # Frame intermedio: landmarks extrapolados sin pasar por MediaPipe,
+                # los buffers de estabilidad siguen avanzando un paso por frame
+                frame = mirror_in_place(frame)
+                results = self.skipper.predict()
             
-            results = self.hands.process(rgb_frame)
+            overlay_text = None
             
             detected_letter = None
             confidence = 0
             
             if results.multi_hand_landmarks:
-                for idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
+                for hand_landmarks in results.multi_hand_landmarks:
                     # Dibujar landmarks
-                    self.mp_draw.draw_landmarks(
-                        frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
-                        self.mp_draw.DrawingSpec(color=(0, 0, 255), thickness=2, circle_radius=3),
-                        self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2)
-                    )
-                    
-                    # Reconocer letra
-                    result = self.recognizer.recognize_letter(hand_landmarks.landmark)
+                    with self.timing.stage('dibujo'):
+                        self.mp_draw.draw_landmarks(
+                            frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
+                            self.mp_draw.DrawingSpec(color=(0, 0, 255), thickness=2, circle_radius=3),
+                            self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2)
+                        )
+                
+                # Reconocer letra de todas las manos en una llamada
+                with self.timing.stage('reconocimiento'):
+                    hands = [extract_features(h) for h in results.multi_hand_landmarks]
+                    letters = recognize_hands(self.recognizer, 'recognize_letter', hands)
+                for idx, result in enumerate(letters):
                     if result and result[0]:
                         detected_letter, confidence = result
+                        STARTUP.mark('primer_reconocimiento')
                         
                         # Determinar tipo de mano
                         hand_type = "Derecha" if results.multi_handedness[idx].classification[0].label == "Right" else "Izquierda"
-                        self.hand_type_text.value = f"Mano: {hand_type}"
+                        self.ui.set(self.hand_type_text, value=f"Mano: {hand_type}")
                         
                         # Mostrar en frame
-                        cv2.putText(frame, f"{detected_letter} ({confidence:.0f}%)", (10, 50),
+                        overlay_text = f"{detected_letter} ({confidence:.0f}%)"
+                        cv2.putText(frame, overlay_text, (10, 50),
                                   cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 255, 0), 3)
             
+            # Última detección, reutilizada en los frames que omiten la inferencia
+            with self.overlay_lock:
+                self.last_hand_landmarks = results.multi_hand_landmarks or []
+                self.last_overlay_text = overlay_text
+            
             # Sistema de estabilización
             if detected_letter:
-                self.letter_buffer.append(detected_letter)
+                stable = self.letter_voter.push(detected_letter)
                 self.confidence_buffer.append(confidence)
-                
-                if len(self.letter_buffer) >= self.stability_threshold:
-                    most_common = max(set(self.letter_buffer), key=self.letter_buffer.count)
-                    count = self.letter_buffer.count(most_common)
+                if stable:
+                    # Nueva letra detectada
+                    self.letter_voter.commit(stable)
+                    self.accumulated_text += stable
+                    self.ui.set(self.accumulated_display, value=self.accumulated_text)
+                    self.letters_count += 1
+                    
+                    # Actualizar estadísticas
+                    avg_conf = sum(self.confidence_buffer) / len(self.confidence_buffer)
+                    self.total_confidence = (self.total_confidence * (self.letters_count - 1) + avg_conf) / self.letters_count
+                    self.update_stats()
+                    self.history_manager.add_letter(stable, avg_conf)
+                    self.history_manager.log('estadisticas', letras=self.letters_count,
+                                             precision=round(self.total_confidence, 1))
                     
-                    if count >= self.stability_threshold:
-                        if most_common != self.last_detected_letter:
-                            # Nueva letra detectada
-                            self.accumulated_text += most_common
-                            self.accumulated_display.value = self.accumulated_text
-                            self.last_detected_letter = most_common
-                            self.letters_count += 1
-                            
-                            # Actualizar estadísticas
-                            avg_conf = sum(self.confidence_buffer) / len(self.confidence_buffer)
-                            self.total_confidence = (self.total_confidence * (self.letters_count - 1) + avg_conf) / self.letters_count
-                            self.update_stats()
-                            
-                            # Sugerencias
-                            suggestions = self.translator.suggest_words(self.accumulated_text)
-                            if suggestions:
-                                self.suggestions_text.value = "\n".join([f"• {s}" for s in suggestions])
-                            else:
-                                self.suggestions_text.value = "Sin sugerencias"
+                    # Sugerencias
+                    suggestions = self.translator.suggest_words(self.accumulated_text)
+                    if suggestions:
+                        self.ui.set(self.suggestions_text, value="\n".join([f"• {s}" for s in suggestions]))
+                    else:
+                        self.ui.set(self.suggestions_text, value="Sin sugerencias")
                 
                 # Actualizar display
-                self.detected_letter.value = detected_letter
-                self.confidence_text.value = f"Confianza: {confidence:.0f}%"
+                self.ui.set(self.detected_letter, value=detected_letter)
+                self.ui.set(self.confidence_text, value=f"Confianza: {confidence:.0f}%")
                 
                 # Color según confianza
                 if confidence >= 80:
-                    self.confidence_text.color = ft.Colors.GREEN_700
+                    self.ui.set(self.confidence_text, color=ft.Colors.GREEN_700)
                 elif confidence >= 60:
-                    self.confidence_text.color = ft.Colors.ORANGE_700
+                    self.ui.set(self.confidence_text, color=ft.Colors.ORANGE_700)
                 else:
-                    self.confidence_text.color = ft.Colors.RED_700
+                    self.ui.set(self.confidence_text, color=ft.Colors.RED_700)
             else:
-                if len(self.letter_buffer) > 0:
-                    self.letter_buffer.popleft()
-                
-                if len(self.letter_buffer) == 0:
-                    self.last_detected_letter = None
-                    self.detected_letter.value = ""
-                    self.confidence_text.value = "Confianza: --"
-                    self.hand_type_text.value = "Mano: --"
+                # Sin mano: la ventana se vacía y la misma seña puede repetirse
+                if self.letter_voter.miss():
+                    self.ui.set(self.detected_letter, value="")
+                    self.ui.set(self.confidence_text, value="Confianza: --")
+                    self.ui.set(self.hand_type_text, value="Mano: --")
+            
+            # Solo lo que vio MediaPipe: los frames extrapolados no se graban
+            if inferred and self.recorder:
+                self.recorder.append_results(timestamp, results, detected_letter)
             
             return frame
             
@@ -737,41 +925,90 @@ class SignLanguageApp:
     def update_stats(self):
         """Actualiza las estadísticas"""
         avg_accuracy = self.total_confidence if self.letters_count > 0 else 0
-        self.stats_text.value = f"📊 Letras: {self.letters_count} | Precisión: {avg_accuracy:.1f}%"
+        self.ui.set(self.stats_text, value=f"📊 Letras: {self.letters_count} | Precisión: {avg_accuracy:.1f}%")
     
-    def frame_to_base64(self, frame):
-        """Convierte frame a base64"""
+    def encode_frame(self, frame):
+        """Codifica el frame a JPEG (bytes crudos, sin base64)"""
         try:
-            _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-            return base64.b64encode(buffer.tobytes()).decode('utf-8')
+            # Cada cliente del flujo suma al ancho de banda de salida
+            viewers = self.video_stream.clients if self.video_stream else 1
+            # Percentiles sobre el video (solo con SIGNS_STAGE_OVERLAY)
+            frame = self.timing.draw_overlay(frame)
+            with self.timing.stage('codificacion'):
+                return self.encoder.encode(frame, viewers=viewers)
         except Exception as e:
-            print(f"Error convirtiendo frame: {e}")
-            return ""
+            print(f"Error codificando frame: {e}")
+            return None
     
     def camera_loop(self):
-        """Bucle principal de la cámara"""
-        while self.camera_active and self.cap:
-            try:
-                ret, frame = self.cap.read()
-                if ret:
-                    processed_frame = self.process_frame(frame)
-                    base64_image = self.frame_to_base64(processed_frame)
-                    if base64_image:
-                        self.image_display.src_base64 = base64_image
-                    
-                    if self.page:
-                        self.page.update()
-                else:
-                    break
-            except Exception as e:
-                print(f"Error en camera_loop: {e}")
-                break
-            
-            time.sleep(0.033)  # ~30 FPS
+        """Bucle principal de la cámara: captura, inferencia, codificación y render en paralelo"""
+        self.pacer = FramePacer(target_fps=self.target_fps)
+        self.pipeline = FramePipeline(
+            source=self.read_frame,
+            pacer=self.pacer,
+            bypass=self.mirror_frame,
+            stages=[
+                ('inferencia', self.process_frame),
+                ('codificacion', self.encode_frame),
+                ('render', self.render_frame),
+            ],
+        )
+        self.pipeline.run()
+    
+    def read_frame(self):
+        """Etapa de captura: devuelve el siguiente frame o None para terminar"""
+        cap = self.cap
+        if not self.camera_active or cap is None:
+            return None
+        
+        with self.timing.stage('captura'):
+            ret, frame = cap.read()
+        if not ret:
+            if self.camera_active:
+                print("No se pudo leer frame de la cámara")
+            return None
+        return frame
+    
+    def mirror_frame(self, frame):
+        """Frame en espejo sin inferencia, con la última detección dibujada encima"""
+        frame = mirror_in_place(frame)
+        with self.overlay_lock:
+            hand_landmarks_list, overlay_text = self.last_hand_landmarks, self.last_overlay_text
+        for hand_landmarks in hand_landmarks_list:
+            with self.timing.stage('dibujo'):
+                self.mp_draw.draw_landmarks(
+                    frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
+                    self.mp_draw.DrawingSpec(color=(0, 0, 255), thickness=2, circle_radius=3),
+                    self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2)
+                )
+        if overlay_text:
+            cv2.putText(frame, overlay_text, (10, 50),
+                      cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 255, 0), 3)
+        return frame
+    
+    def render_frame(self, jpeg_bytes):
+        """Etapa de render: publica el frame codificado en la interfaz"""
+        if jpeg_bytes:
+            if self.video_stream:
+                # El control Image lee el flujo MJPEG: sin base64 por frame
+                self.video_stream.publish(jpeg_bytes)
+            else:
+                with self.timing.stage('base64'):
+                    self.image_display.src_base64 = base64.b64encode(jpeg_bytes).decode('utf-8')
+                self.ui.mark(self.image_display, immediate=True)
+        
+        # Solo se envían los controles que cambiaron, no todo el árbol
+        with self.timing.stage('render'):
+            self.ui.flush()
+        
+        elapsed = self.camera_timer.stop()
+        if elapsed is not None:
+            STARTUP.record('boton_a_primer_frame', elapsed)
     
     def toggle_camera(self, e):
         """Activa/desactiva la cámara"""
         if not self.camera_active:
+            self.camera_timer.start()
             try:
                 self.cap = cv2.VideoCapture(0)
                 
@@ -782,7 +1019,19 @@ class SignLanguageApp:
                 self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
                 self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
                 
+                if self.record_landmarks and self.recorder is None:
+                    try:
+                        self.recorder = self.history_manager.start_recording(max_hands=1)
+                    except OSError as ex:
+                        print(f"No se pudo iniciar la grabación de landmarks: {ex}")
+                
                 self.camera_active = True
+                self.hand_tracker.reset()
+                self.skipper.reset()
+                if self.video_stream:
+                    self.image_display.src = self.video_stream.url(fresh=True)
+                    self.image_display.src_base64 = None
+                self.timing.start()
                 self.camera_thread = threading.Thread(target=self.camera_loop, daemon=True)
                 self.camera_thread.start()
                 
@@ -796,11 +1045,17 @@ class SignLanguageApp:
                 self.show_error(f"Error: {str(ex)}")
         else:
             self.camera_active = False
+            if self.pipeline:
+                self.pipeline.stop()
             
             if self.cap:
                 self.cap.release()
                 self.cap = None
+            self.timing.stop()
+            if self.recorder:
+                self.recorder.flush()
             
+            self.image_display.src = None
             self.image_display.src_base64 = ""
             self.toggle_button.text = "Iniciar Cámara"
             self.toggle_button.icon = ft.Icons.VIDEOCAM
@@ -819,13 +1074,18 @@ class SignLanguageApp:
         self.letters_count = 0
         self.total_confidence = 0.0
         self.update_stats()
+        if self.history_manager:
+            self.history_manager.clear_letters()
         if self.page:
             self.page.update()
     
     def add_space(self, e):
         """Agrega un espacio"""
+        words = self.accumulated_text.split()
         self.accumulated_text += " "
         self.accumulated_display.value = self.accumulated_text
+        if self.history_manager:
+            self.history_manager.log('espacio', palabra=words[-1] if words else "")
         if self.page:
             self.page.update()
     
@@ -839,19 +1099,8 @@ class SignLanguageApp:
         if not text:
             return
         
-        def speak_thread():
-            try:
-                tts_engine = pyttsx3.init()
-                tts_engine.setProperty('rate', 150)
-                tts_engine.setProperty('volume', 0.9)
-                tts_engine.say(text)
-                tts_engine.runAndWait()
-                tts_engine.stop()
-                del tts_engine
-            except Exception as ex:
-                print(f"Error TTS: {ex}")
-        
-        threading.Thread(target=speak_thread, daemon=True).start()
+        # Con varios clics seguidos solo queda pendiente la última lectura
+        self.tts.say(text, key='texto')
     
     def export_text(self, e):
         """Exporta el texto"""
@@ -864,10 +1113,67 @@ class SignLanguageApp:
         except Exception as ex:
             self.show_error(f"Error al exportar: {ex}")
     
+    def export_history(self, format='csv'):
+        """Exporta todo el historial en segundo plano, con el avance en la barra de estado"""
+        def on_progress(exported, total):
+            self.ui.set(self.status_text, value=f"⏳ Exportando historial: {exported}/{total} sesiones",
+                        color=ft.Colors.BLUE)
+            self.ui.flush()
+        
+        def on_done(path, exported, error):
+            if error:
+                self.ui.set(self.status_text, value=f"❌ Error al exportar el historial: {error}",
+                            color=ft.Colors.RED)
+            else:
+                self.ui.set(self.status_text, value=f"✅ {exported} sesiones exportadas a {path}",
+                            color=ft.Colors.GREEN)
+            # Con la cámara apagada nadie más vacía los cambios pendientes
+            self.ui.flush(force=True)
+        
+        self.history_manager.export_history(format, on_progress=on_progress, on_done=on_done)
+    
     def show_history(self, e):
-        """Muestra el historial"""
-        # TODO: Implementar vista de historial
-        self.show_success("Historial - Función en desarrollo")
+        """Muestra el historial por páginas (solo se lee la página visible)"""
+        sessions_list = ft.ListView(spacing=8, height=400, width=500)
+        more_button = ft.TextButton("Ver más")
+        cursor = None
+        
+        def load_page(e=None):
+            nonlocal cursor
+            try:
+                sessions, cursor = self.history_manager.load_history(before=cursor)
+            except Exception as ex:
+                self.show_error(f"Error al leer el historial: {ex}")
+                return
+            for session in sessions:
+                start = session.get('start_time', '')[:16].replace('T', ' ')
+                sessions_list.controls.append(ft.Column([
+                    ft.Text(f"{start} · {session.get('letters_detected', 0)} letras · "
+                            f"{session.get('accuracy', 0):.0f}%", size=12, color=ft.Colors.GREY_700),
+                    ft.Text(session.get('text') or "(sin texto)", size=16),
+                ], spacing=2))
+            if not sessions_list.controls:
+                sessions_list.controls.append(ft.Text("Todavía no hay sesiones guardadas"))
+            more_button.visible = cursor is not None
+            if e is not None:
+                dialog.update()
+        
+        def close(e):
+            self.page.close(dialog)
+        
+        def export_all(e):
+            self.page.close(dialog)
+            self.export_history()
+        
+        more_button.on_click = load_page
+        load_page()
+        dialog = ft.AlertDialog(
+            title=ft.Text("📜 Historial"),
+            content=sessions_list,
+            actions=[more_button, ft.TextButton("Exportar todo (CSV)", on_click=export_all),
+                     ft.TextButton("Cerrar", on_click=close)],
+        )
+        self.page.open(dialog)
     
     def show_error(self, message):
         """Muestra mensaje de error"""
@@ -887,9 +1193,20 @@ class SignLanguageApp:
         """Maneja eventos de ventana"""
         if e.data == "close":
             self.camera_active = False
+            if self.pipeline:
+                self.pipeline.stop()
             if self.cap:
                 self.cap.release()
+            if self.video_stream:
+                self.video_stream.stop()
+            self.timing.stop()
+            self.tts.close()
+            if self.recorder:
+                self.recorder.close()
             
+            if self.history_manager is None:
+                # Se cerró antes de terminar de abrir el historial
+                return
             # Guardar sesión
             if self.accumulated_text:
                 try:
@@ -901,10 +1218,12 @@ class SignLanguageApp:
                     )
                 except:
                     pass
+            # Sin guardar (error o sin texto), el diario queda para el próximo arranque
+            self.history_manager.close()
 
 
 def main(page: ft.Page):
-    app = SignLanguageApp()
+    app = SignLanguageApp(recognizer_mode=recognizer_mode_requested(), record_landmarks=recording_requested())
     app.main(page)
 
 
@@ -1,8 +1,6 @@
 import tkinter as tk
 from tkinter import ttk
 import numpy as np
-import tensorflow as tf
-from tensorflow import keras
 import threading
 import time
 
@@ -29,6 +27,9 @@ class NeuralNetworkVisualizer:
         
     def create_model(self):
         """Crea un modelo simple de red neuronal para clasificación de letras"""
+        # TensorFlow se importa solo aquí; las apps usan el runtime NumPy (utils/landmark_classifier.py)
+        from tensorflow import keras
+
         self.model = keras.Sequential([
             keras.layers.Dense(128, activation='relu', input_shape=(26,)),
             keras.layers.Dropout(0.2),
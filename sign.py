@@ -1,28 +1,38 @@
-import cv2
-import mediapipe as mp
 import numpy as np
-import pyttsx3
-import threading
 import time
 import flet as ft
 from difflib import get_close_matches
+from utils.frame_skipping import InferenceSkipper
+from utils.frames import FramePreparer, mirror_in_place
+from utils.hand_features import as_features, extract_features
+from utils.landmark_classifier import recognize_hands, select_recognizer
+from utils.roi_tracker import ROIHandTracker
+from utils.stability import StabilityVoter
+from utils.stage_timing import StageTimer
+from utils.startup import (BackgroundLoader, OneShotTimer, StartupTimer, autostart_requested, lazy_import, preload,
+                           recognizer_mode_requested)
+from utils.tts_worker import TTSWorker
+from utils.warmup import warm_up_hands
+
+# Módulos pesados: se cargan en segundo plano después de pintar la interfaz
+cv2 = lazy_import('cv2')
+mp = lazy_import('mediapipe')
+
+STARTUP = StartupTimer('sign.py')
 
 class SignLanguageTranslator:
-    def __init__(self):
-        # Inicializar MediaPipe para detección de manos
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
-        self.mp_draw = mp.solutions.drawing_utils
-        
-        # Inicializar motor de voz
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', 150)
-        self.engine.setProperty('volume', 1.0)
+    def __init__(self, recognizer_mode="reglas"):
+        """recognizer_mode: 'reglas' (umbrales escritos a mano) o 'modelo' (clasificador entrenado)"""
+        # MediaPipe, el reconocedor y el motor de voz se cargan en segundo plano
+        # (ver load_steps); la ventana se pinta antes
+        self.recognizer_mode = recognizer_mode
+        self.mp_hands = None
+        self.hands = None
+        self.hand_tracker = None
+        self.mp_draw = None
+        # Inferencia cada N frames según la velocidad de la mano (enabled=False: todos)
+        self.skipper = InferenceSkipper(max_interval=4, enabled=True)
+        self.frame_preparer = FramePreparer()
         
         # Diccionario de palabras válidas en español
         self.valid_words = {
@@ -58,9 +68,17 @@ class SignLanguageTranslator:
         self.word = ""
         self.words_history = []
         
-        # Contador de frames para estabilidad
-        self.letter_counter = {}
-        self.frame_threshold = 10
+        # Votación de estabilidad en una ventana de tiempo; a 30 FPS el umbral
+        # equivale a los 10 frames del contador original
+        self.letter_voter = StabilityVoter.timed(window_s=0.5, threshold_s=0.33)
+        
+        # Reconocedor de letras: este mismo objeto (reglas) o el modelo entrenado
+        self.letter_recognizer = None
+        
+        # Percentiles por etapa (captura, MediaPipe, dibujo, ventana de OpenCV, ...)
+        self.timing = StageTimer('sign.py')
+        # Voz: un solo motor en su hilo; las palabras seguidas se dicen juntas
+        self.tts = TTSWorker(rate=150, volume=1.0, timer=self.timing)
         
         # UI
         self.ui_letter = None
@@ -68,43 +86,61 @@ class SignLanguageTranslator:
         self.ui_valid_word = None
         self.ui_history = None
         
-    def calculate_distance(self, point1, point2):
-        """Calcula la distancia euclidiana entre dos puntos"""
-        return np.sqrt((point1.x - point2.x)**2 + (point1.y - point2.y)**2)
+    def load_steps(self):
+        """Pasos de la carga en segundo plano, para BackgroundLoader"""
+        return [
+            ("Cargando OpenCV", lambda: preload('cv2')),
+            ("Cargando MediaPipe", self.load_hands),
+            ("Calentando MediaPipe", self.warm_up),
+            ("Cargando reconocedor", self.load_recognizer),
+            ("Preparando voz", self.load_tts),
+        ]
     
-    def is_finger_extended(self, landmarks, finger_tips, finger_base):
-        """Determina si un dedo está extendido"""
-        tip = landmarks[finger_tips]
-        base = landmarks[finger_base]
-        return tip.y < base.y
+    def load_hands(self):
+        """Inicializa MediaPipe para detección de manos"""
+        self.mp_hands = mp.solutions.hands
+        self.mp_draw = mp.solutions.drawing_utils
+        self.hands = self.mp_hands.Hands(
+            static_image_mode=False,
+            max_num_hands=2,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.5
+        )
+        # Recorte a la región de la mano del frame anterior (enabled=False: frame completo)
+        self.hand_tracker = ROIHandTracker(self.hands, max_num_hands=2, enabled=True)
+    
+    def warm_up(self):
+        """Frames sintéticos por Hands: el primer frame real no paga la inicialización del grafo"""
+        report = warm_up_hands(self.hands)
+        print(f"MediaPipe calentado: {report['frames']} frames en {report['total_ms']:.0f} ms "
+              f"(primero {report['first_ms']:.0f} ms)")
+    
+    def load_recognizer(self):
+        self.letter_recognizer = select_recognizer(self, self.recognizer_mode)
+    
+    def load_tts(self):
+        """Inicializa el motor de voz; sin él las palabras solo se muestran"""
+        self.tts.start().wait_ready()
     
     def recognize_letter(self, hand_landmarks):
         """Reconoce letras del lenguaje de señas basándose en la posición de los dedos"""
-        landmarks = hand_landmarks.landmark
+        f = as_features(hand_landmarks)
+        y, d = f.y, f.dist
         
         # Puntos clave de los dedos
         thumb_tip = 4
         index_tip = 8
         middle_tip = 12
-        ring_tip = 16
-        pinky_tip = 20
         
         # Bases de los dedos
         thumb_base = 2
-        index_base = 6
-        middle_base = 10
-        ring_base = 14
-        pinky_base = 18
         
-        # Verificar qué dedos están extendidos
-        index_extended = self.is_finger_extended(landmarks, index_tip, index_base)
-        middle_extended = self.is_finger_extended(landmarks, middle_tip, middle_base)
-        ring_extended = self.is_finger_extended(landmarks, ring_tip, ring_base)
-        pinky_extended = self.is_finger_extended(landmarks, pinky_tip, pinky_base)
+        # Verificar qué dedos están extendidos (el pulgar no se usa aquí)
+        _, index_extended, middle_extended, ring_extended, pinky_extended = f.finger_states()
         
         # Distancias para determinar configuraciones específicas
-        thumb_index_dist = self.calculate_distance(landmarks[thumb_tip], landmarks[index_tip])
-        thumb_middle_dist = self.calculate_distance(landmarks[thumb_tip], landmarks[middle_tip])
+        thumb_index_dist = d[thumb_tip, index_tip]
+        thumb_middle_dist = d[thumb_tip, middle_tip]
         
         # Reconocimiento de letras básicas
         if not index_extended and not middle_extended and not ring_extended and not pinky_extended:
@@ -141,12 +177,12 @@ class SignLanguageTranslator:
             return "o"
         
         if index_extended and middle_extended and not ring_extended and not pinky_extended:
-            index_middle_dist = self.calculate_distance(landmarks[index_tip], landmarks[middle_tip])
+            index_middle_dist = d[index_tip, middle_tip]
             if index_middle_dist < 0.1:
                 return "u"
         
         if index_extended and middle_extended and not ring_extended and not pinky_extended:
-            index_middle_dist = self.calculate_distance(landmarks[index_tip], landmarks[middle_tip])
+            index_middle_dist = d[index_tip, middle_tip]
             if index_middle_dist > 0.1:
                 return "v"
         
@@ -154,7 +190,7 @@ class SignLanguageTranslator:
             return "w"
         
         if not index_extended and not middle_extended and not ring_extended and pinky_extended:
-            if landmarks[thumb_tip].y < landmarks[thumb_base].y:
+            if y[thumb_tip] < y[thumb_base]:
                 return "y"
         
         return None
@@ -175,14 +211,8 @@ class SignLanguageTranslator:
         return False, None
     
     def speak(self, text):
-        """Pronuncia el texto en un thread separado"""
-        def speak_thread():
-            self.engine.say(text)
-            self.engine.runAndWait()
-        
-        thread = threading.Thread(target=speak_thread)
-        thread.daemon = True
-        thread.start()
+        """Encola el texto en el hilo de voz; si tardó más de 3 s en llegar su turno, se descarta"""
+        self.tts.say(text, coalesce=True, max_age=3.0)
     
     def update_ui(self):
         """Actualiza la interfaz de usuario"""
@@ -211,24 +241,38 @@ class SignLanguageTranslator:
     
     def process_frame(self, frame):
         """Procesa un frame de video y detecta señas"""
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb_frame)
+        if self.skipper.should_infer():
+            # El frame ya llega en espejo; RGB en un buffer reutilizado
+            with self.timing.stage('preparacion'):
+                frame, rgb_frame = self.frame_preparer.prepare(frame, mirror=False)
+            with self.timing.stage('mediapipe'):
+                results = self.hand_tracker.process(rgb_frame)
+            self.skipper.observe(results)
+        else:
+            # Frame intermedio: landmarks extrapolados sin pasar por MediaPipe
+            results = self.skipper.predict()
         
         detected_letter = None
         
         if results.multi_hand_landmarks:
             for hand_landmarks in results.multi_hand_landmarks:
-                self.mp_draw.draw_landmarks(
-                    frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS
-                )
-                
-                letter = self.recognize_letter(hand_landmarks)
+                with self.timing.stage('dibujo'):
+                    self.mp_draw.draw_landmarks(
+                        frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS
+                    )
+            
+            # Todas las manos en una llamada al reconocedor
+            with self.timing.stage('reconocimiento'):
+                hands = [extract_features(h) for h in results.multi_hand_landmarks]
+                letters = recognize_hands(self.letter_recognizer, 'recognize_letter', hands)
+            for letter in letters:
                 if letter:
                     detected_letter = letter
-                    self.letter_counter[letter] = self.letter_counter.get(letter, 0) + 1
+                    STARTUP.mark('primer_reconocimiento')
         
         if detected_letter:
-            if self.letter_counter.get(detected_letter, 0) >= self.frame_threshold:
+            self.letter_voter.push(detected_letter)
+            if self.letter_voter.is_stable(detected_letter):
                 self.current_letter = detected_letter
                 
                 current_time = time.time()
@@ -238,7 +282,7 @@ class SignLanguageTranslator:
                     self.word += self.current_letter
                     self.last_letter = self.current_letter
                     self.last_spoken_time = current_time
-                    self.letter_counter = {}
+                    self.letter_voter.reset()
                     
                     # Verificar si la palabra es válida
                     if len(self.word) >= 2:
@@ -255,6 +299,9 @@ class SignLanguageTranslator:
                                 self.ui_history.update()
                     
                     self.update_ui()
+        else:
+            # Sin seña: la ventana se vacía en lugar de acumular para siempre
+            self.letter_voter.miss()
         
         return frame
     
@@ -272,9 +319,11 @@ def main(page: ft.Page):
     page.window_width = 800
     page.window_height = 600
     
-    translator = SignLanguageTranslator()
+    translator = SignLanguageTranslator(recognizer_mode=recognizer_mode_requested())
     cap = None
     running = False
+    # Tiempo desde "INICIAR CÁMARA" hasta el primer frame anotado
+    camera_timer = OneShotTimer()
     
     # Elementos de UI
     translator.ui_letter = ft.Text(
@@ -302,19 +351,46 @@ def main(page: ft.Page):
         spacing=5
     )
     
-    status_text = ft.Text("Presiona INICIAR para comenzar", size=14, color=ft.Colors.GREY)
+    status_text = ft.Text("Cargando...", size=14, color=ft.Colors.GREY)
+    load_progress = ft.ProgressBar(width=200, value=0, color=ft.Colors.BLUE)
+    
+    def on_load_progress(fraction, description):
+        load_progress.value = fraction
+        if description:
+            status_text.value = f"{description}..."
+        page.update(load_progress, status_text)
+    
+    def on_load_done(error):
+        load_progress.visible = False
+        if error:
+            status_text.value = f"✗ Error cargando modelos: {error}"
+            status_text.color = ft.Colors.RED
+            page.update()
+            return
+        STARTUP.mark('modelos_listos')
+        status_text.value = "Presiona INICIAR para comenzar"
+        start_btn.disabled = False
+        page.update()
+        if autostart_requested():
+            start_camera(None)
+    
+    loader = BackgroundLoader(translator.load_steps(), on_progress=on_load_progress, on_done=on_load_done)
     
     def start_camera(e):
         nonlocal cap, running
         if not running:
+            camera_timer.start()
             cap = cv2.VideoCapture(0)
             if cap.isOpened():
                 running = True
+                translator.hand_tracker.reset()
+                translator.skipper.reset()
                 status_text.value = "✓ Cámara activa - Formando señas..."
                 status_text.color = ft.Colors.GREEN
                 start_btn.disabled = True
                 stop_btn.disabled = False
                 page.update()
+                translator.timing.start()
                 process_video()
             else:
                 status_text.value = "✗ Error al acceder a la cámara"
@@ -327,6 +403,7 @@ def main(page: ft.Page):
         if cap:
             cap.release()
         cv2.destroyAllWindows()
+        translator.timing.stop()
         status_text.value = "Cámara detenida"
         status_text.color = ft.Colors.ORANGE
         start_btn.disabled = False
@@ -338,17 +415,27 @@ def main(page: ft.Page):
     
     def process_video():
         nonlocal cap, running
+        timing = translator.timing
         while running:
-            ret, frame = cap.read()
+            with timing.stage('captura'):
+                ret, frame = cap.read()
             if not ret:
                 break
             
-            frame = cv2.flip(frame, 1)
+            frame = mirror_in_place(frame)
             frame = translator.process_frame(frame)
             
-            cv2.imshow('Cámara - Lenguaje de Señas', frame)
+            # Percentiles sobre el video (solo con SIGNS_STAGE_OVERLAY)
+            frame = timing.draw_overlay(frame)
+            with timing.stage('ventana'):
+                cv2.imshow('Cámara - Lenguaje de Señas', frame)
+                key = cv2.waitKey(1) & 0xFF
+            
+            elapsed = camera_timer.stop()
+            if elapsed is not None:
+                STARTUP.record('boton_a_primer_frame', elapsed)
             
-            if cv2.waitKey(1) & 0xFF == 27:  # ESC
+            if key == 27:  # ESC
                 stop_camera(None)
                 break
     
@@ -358,7 +445,8 @@ def main(page: ft.Page):
         on_click=start_camera,
         icon=ft.Icons.VIDEOCAM,
         bgcolor=ft.Colors.GREEN,
-        color=ft.Colors.WHITE
+        color=ft.Colors.WHITE,
+        disabled=True
     )
     
     stop_btn = ft.ElevatedButton(
@@ -422,6 +510,7 @@ def main(page: ft.Page):
                 ft.Row([start_btn, stop_btn, reset_btn], alignment=ft.MainAxisAlignment.CENTER, spacing=10),
                 
                 status_text,
+                load_progress,
                 
                 ft.Divider(),
                 
@@ -444,6 +533,10 @@ def main(page: ft.Page):
             padding=20
         )
     )
+    STARTUP.mark('primer_pintado')
+    
+    # Con la ventana ya pintada, MediaPipe y el motor de voz cargan en segundo plano
+    loader.start()
 
 if __name__ == "__main__":
     ft.app(target=main)
\ No newline at end of file
@@ -0,0 +1,403 @@
+"""
+Reconocedor de main.py tal como estaba en la versión base (8c959e5), antes
+de las características compartidas (utils/hand_features.py) y de la tabla
+de decisión (utils/rule_table.py). Se copia sin cambios: trabaja sobre
+objetos landmark con .x/.y y sirve de referencia para los tests.
+"""
+
+import numpy as np
+
+
+class SignLanguageRecognizer:
+    """Clase para reconocer letras y números del lenguaje de señas"""
+    
+    def __init__(self):
+        self.finger_tips = [4, 8, 12, 16, 20]
+        self.finger_pips = [3, 6, 10, 14, 18]
+        self.finger_mcps = [2, 5, 9, 13, 17]
+        
+    def get_finger_states(self, landmarks):
+        """Determina qué dedos están extendidos"""
+        states = []
+        
+        # Pulgar (lógica horizontal mejorada)
+        thumb_tip = landmarks[4]
+        thumb_ip = landmarks[3]
+        thumb_mcp = landmarks[2]
+        wrist = landmarks[0]
+        
+        # Determinar orientación de la mano
+        hand_is_right = landmarks[17].x < landmarks[5].x
+        
+        if hand_is_right:
+            thumb_extended = thumb_tip.x < thumb_ip.x
+        else:
+            thumb_extended = thumb_tip.x > thumb_ip.x
+            
+        states.append(thumb_extended)
+        
+        # Resto de dedos (lógica vertical mejorada)
+        for i, (tip, pip) in enumerate(zip(self.finger_tips[1:], self.finger_pips[1:])):
+            extended = landmarks[tip].y < landmarks[pip].y - 0.02
+            states.append(extended)
+        
+        return states
+    
+    def get_distance(self, p1, p2):
+        """Calcula distancia euclidiana entre dos puntos"""
+        return np.sqrt((p1.x - p2.x)**2 + (p1.y - p2.y)**2)
+    
+    def get_angle(self, p1, p2, p3):
+        """Calcula el ángulo formado por tres puntos"""
+        v1 = np.array([p1.x - p2.x, p1.y - p2.y])
+        v2 = np.array([p3.x - p2.x, p3.y - p2.y])
+        
+        cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-6)
+        angle = np.arccos(np.clip(cos_angle, -1.0, 1.0))
+        return np.degrees(angle)
+    
+    def recognize_number(self, landmarks):
+        """Reconoce números del 0-17"""
+        states = self.get_finger_states(landmarks)
+        thumb, index, middle, ring, pinky = states
+        
+        # Calcular distancias importantes
+        thumb_index_dist = self.get_distance(landmarks[4], landmarks[8])
+        thumb_middle_dist = self.get_distance(landmarks[4], landmarks[12])
+        index_middle_dist = self.get_distance(landmarks[8], landmarks[12])
+        
+        # 0 - Círculo con pulgar e índice (OK sign)
+        if not thumb and not index and middle and ring and pinky:
+            if thumb_index_dist < 0.06:
+                return '0'
+        
+        # 1 - Solo índice extendido
+        if not thumb and index and not middle and not ring and not pinky:
+            return '1'
+        
+        # 2 - Índice y medio extendidos (forma de V)
+        if not thumb and index and middle and not ring and not pinky:
+            if index_middle_dist > 0.08:  # Dedos separados
+                return '2'
+        
+        # 3 - Pulgar, índice y medio extendidos
+        if thumb and index and middle and not ring and not pinky:
+            if index_middle_dist > 0.08:
+                return '3'
+        
+        # 4 - Cuatro dedos extendidos (sin pulgar)
+        if not thumb and index and middle and ring and pinky:
+            return '4'
+        
+        # 5 - Todos los dedos extendidos
+        if thumb and index and middle and ring and pinky:
+            return '5'
+        
+        # 6 - Pulgar y meñique extendidos, resto doblados
+        if thumb and not index and not middle and not ring and pinky:
+            return '6'
+        
+        # 7 - Pulgar, índice y medio extendidos, meñique doblado
+        if thumb and index and middle and not ring and not pinky:
+            return '7'
+        
+        # 8 - Pulgar, índice, medio y anular extendidos
+        if thumb and index and middle and ring and not pinky:
+            return '8'
+        
+        # 9 - Todos extendidos menos el pulgar
+        if not thumb and index and middle and ring and pinky:
+            fingers_together = (
+                self.get_distance(landmarks[8], landmarks[12]) < 0.06 and
+                self.get_distance(landmarks[12], landmarks[16]) < 0.06
+            )
+            if fingers_together:
+                return '9'
+        
+        # 10 - Puño cerrado con pulgar extendido hacia arriba
+        if thumb and not index and not middle and not ring and not pinky:
+            if landmarks[4].y < landmarks[2].y - 0.05:
+                return '10'
+        
+        # 11 - Índice y pulgar extendidos (forma de pistola)
+        if thumb and index and not middle and not ring and not pinky:
+            if thumb_index_dist > 0.15:
+                return '11'
+        
+        # 12 - Índice, medio y pulgar formando un 3
+        if thumb and index and middle and not ring and not pinky:
+            if self.get_distance(landmarks[8], landmarks[12]) < 0.06:
+                return '12'
+        
+        # 13 - Similar a 12 pero dedos más juntos
+        if thumb and index and middle and ring and not pinky:
+            fingers_together = (
+                self.get_distance(landmarks[8], landmarks[12]) < 0.06 and
+                self.get_distance(landmarks[12], landmarks[16]) < 0.06
+            )
+            if fingers_together:
+                return '13'
+        
+        # 14 - Cuatro dedos juntos sin pulgar
+        if not thumb and index and middle and ring and pinky:
+            fingers_together = (
+                self.get_distance(landmarks[8], landmarks[12]) < 0.06 and
+                self.get_distance(landmarks[12], landmarks[16]) < 0.06 and
+                self.get_distance(landmarks[16], landmarks[20]) < 0.06
+            )
+            if fingers_together:
+                return '14'
+        
+        # 15 - Todos los dedos extendidos y juntos
+        if thumb and index and middle and ring and pinky:
+            fingers_together = (
+                self.get_distance(landmarks[8], landmarks[12]) < 0.06 and
+                self.get_distance(landmarks[12], landmarks[16]) < 0.06 and
+                self.get_distance(landmarks[16], landmarks[20]) < 0.06
+            )
+            if fingers_together:
+                return '15'
+        
+        return None
+    
+    def recognize_letter(self, landmarks):
+        """Reconoce la letra basándose en los landmarks (MEJORADO)"""
+        states = self.get_finger_states(landmarks)
+        thumb, index, middle, ring, pinky = states
+        
+        # Calcular distancias importantes
+        thumb_index_dist = self.get_distance(landmarks[4], landmarks[8])
+        thumb_middle_dist = self.get_distance(landmarks[4], landmarks[12])
+        index_middle_dist = self.get_distance(landmarks[8], landmarks[12])
+        middle_ring_dist = self.get_distance(landmarks[12], landmarks[16])
+        ring_pinky_dist = self.get_distance(landmarks[16], landmarks[20])
+        
+        # A - Puño cerrado con pulgar al lado
+        if not index and not middle and not ring and not pinky and thumb:
+            if landmarks[4].y > landmarks[6].y:  # Pulgar al costado
+                return 'A'
+        
+        # B - Mano abierta, dedos juntos, pulgar cruzado (CORREGIDO)
+        if not thumb and index and middle and ring and pinky:
+            fingers_together = (
+                index_middle_dist < 0.05 and
+                middle_ring_dist < 0.05 and
+                ring_pinky_dist < 0.05
+            )
+            # Verificar que pulgar está doblado hacia dentro
+            thumb_folded = landmarks[4].x > landmarks[5].x - 0.05 and landmarks[4].x < landmarks[17].x + 0.05
+            if fingers_together and thumb_folded:
+                return 'B'
+        
+        # C - Mano en forma de C (CORREGIDO)
+        if not index and not middle and not ring and not pinky:
+            # Verificar forma de C: dedos curvados
+            curve_check = (
+                landmarks[8].x < landmarks[5].x and
+                landmarks[12].x < landmarks[9].x and
+                0.1 < thumb_index_dist < 0.25
+            )
+            if curve_check:
+                return 'C'
+        
+        # D - Índice arriba, resto forma O (MEJOR DETECCIÓN)
+        if index and not middle and not ring and not pinky:
+            # Verificar que los otros dedos forman un círculo con el pulgar
+            circle_formed = thumb_middle_dist < 0.08
+            if circle_formed and landmarks[8].y < landmarks[6].y:
+                return 'D'
+        
+        # E - Todos los dedos doblados (CORREGIDO)
+        if not thumb and not index and not middle and not ring and not pinky:
+            # Verificar que todos están realmente doblados
+            all_bent = (
+                landmarks[8].y > landmarks[6].y and
+                landmarks[12].y > landmarks[10].y and
+                landmarks[16].y > landmarks[14].y and
+                landmarks[20].y > landmarks[18].y
+            )
+            if all_bent:
+                return 'E'
+        
+        # F - OK sign (CORREGIDO)
+        if middle and ring and pinky:
+            # Verificar que pulgar e índice se tocan
+            if thumb_index_dist < 0.06:
+                return 'F'
+        
+        # G - Índice y pulgar horizontales apuntando
+        if thumb and index and not middle and not ring and not pinky:
+            horizontal = abs(landmarks[4].y - landmarks[8].y) < 0.08
+            perpendicular = abs(landmarks[4].x - landmarks[8].x) > 0.15
+            if horizontal and perpendicular:
+                return 'G'
+        
+        # H - Índice y medio horizontales juntos
+        if not thumb and index and middle and not ring and not pinky:
+            horizontal = abs(landmarks[8].y - landmarks[12].y) < 0.05
+            together = index_middle_dist < 0.08
+            pointing_side = abs(landmarks[8].x - landmarks[6].x) > 0.1
+            if horizontal and together and pointing_side:
+                return 'H'
+        
+        # I - Meñique arriba, resto cerrado
+        if not thumb and not index and not middle and not ring and pinky:
+            if landmarks[20].y < landmarks[18].y:
+                return 'I'
+        
+        # J - I con movimiento (detectamos solo la posición base)
+        # Similar a I, requeriría detección de movimiento
+        
+        # K - Índice y medio en V, pulgar en medio (CORREGIDO)
+        if thumb and index and middle and not ring and not pinky:
+            v_shape = index_middle_dist > 0.1
+            # Pulgar debe estar entre índice y medio
+            thumb_between = (
+                landmarks[4].y > landmarks[8].y and
+                landmarks[4].y < landmarks[6].y
+            )
+            if v_shape and thumb_between:
+                return 'K'
+        
+        # L - L con índice y pulgar
+        if thumb and index and not middle and not ring and not pinky:
+            # Verificar ángulo de 90 grados
+            angle = self.get_angle(landmarks[4], landmarks[2], landmarks[8])
+            if 70 < angle < 110:  # Aproximadamente 90 grados
+                return 'L'
+        
+        # M - Tres dedos sobre pulgar (CORREGIDO)
+        if not thumb and not index and not middle and not ring:
+            # Verificar que el pulgar está debajo de los tres primeros dedos
+            thumb_under = (
+                landmarks[4].y > landmarks[6].y and
+                landmarks[4].x > landmarks[5].x - 0.03 and
+                landmarks[4].x < landmarks[9].x + 0.03
+            )
+            if thumb_under:
+                return 'M'
+        
+        # N - Dos dedos sobre pulgar (CORREGIDO)
+        if not thumb and not index and not middle:
+            # Verificar que pulgar está debajo de índice y medio
+            thumb_under = (
+                landmarks[4].y > landmarks[6].y and
+                landmarks[4].x > landmarks[5].x - 0.03 and
+                landmarks[4].x < landmarks[9].x + 0.03
+            )
+            # Anular y meñique deben estar extendidos
+            if thumb_under and ring and pinky:
+                return 'N'
+        
+        # O - Todos los dedos formando O (CORREGIDO)
+        if not index and not middle and not ring and not pinky:
+            # Verificar forma circular
+            circle = (
+                thumb_index_dist < 0.08 and
+                thumb_middle_dist < 0.12 and
+                landmarks[8].x < landmarks[5].x
+            )
+            if circle:
+                return 'O'
+        
+        # P - Como K pero apuntando hacia abajo
+        if thumb and index and middle and not ring and not pinky:
+            pointing_down = landmarks[8].y > landmarks[6].y
+            v_shape = index_middle_dist > 0.08
+            if pointing_down and v_shape:
+                return 'P'
+        
+        # Q - Similar a G pero apuntando hacia abajo
+        if thumb and index and not middle and not ring and not pinky:
+            pointing_down = landmarks[8].y > landmarks[0].y
+            if pointing_down and thumb_index_dist > 0.1:
+                return 'Q'
+        
+        # R - Índice y medio cruzados
+        if not thumb and index and middle and not ring and not pinky:
+            # Verificar cruce
+            crossed = (
+                abs(landmarks[8].x - landmarks[12].x) < 0.04 and
+                abs(landmarks[8].y - landmarks[12].y) < 0.04
+            )
+            if crossed:
+                return 'R'
+        
+        # S - Puño con pulgar sobre dedos
+        if not index and not middle and not ring and not pinky:
+            thumb_on_top = (
+                landmarks[4].y < landmarks[6].y and
+                landmarks[4].x > landmarks[5].x and
+                landmarks[4].x < landmarks[17].x
+            )
+            if thumb_on_top:
+                return 'S'
+        
+        # T - Pulgar entre índice y medio
+        if not index and not middle and not ring and not pinky:
+            thumb_between = (
+                landmarks[4].y > landmarks[5].y and
+                landmarks[4].y < landmarks[9].y and
+                landmarks[4].x > landmarks[6].x - 0.03 and
+                landmarks[4].x < landmarks[6].x + 0.03
+            )
+            if thumb_between:
+                return 'T'
+        
+        # U - Índice y medio juntos arriba
+        if not thumb and index and middle and not ring and not pinky:
+            together = index_middle_dist < 0.05
+            pointing_up = landmarks[8].y < landmarks[6].y
+            if together and pointing_up:
+                return 'U'
+        
+        # V - Índice y medio en V separados (CORREGIDO)
+        if not thumb and index and middle and not ring and not pinky:
+            v_shape = index_middle_dist > 0.08
+            pointing_up = (
+                landmarks[8].y < landmarks[6].y and
+                landmarks[12].y < landmarks[10].y
+            )
+            if v_shape and pointing_up:
+                return 'V'
+        
+        # W - Tres dedos arriba separados
+        if not thumb and index and middle and ring and not pinky:
+            separated = (
+                index_middle_dist > 0.06 and
+                middle_ring_dist > 0.06
+            )
+            if separated:
+                return 'W'
+        
+        # X - Índice doblado formando gancho
+        if not thumb and not middle and not ring and not pinky:
+            # Índice doblado en la articulación
+            hooked = (
+                landmarks[8].y > landmarks[7].y and
+                landmarks[8].y < landmarks[6].y
+            )
+            if hooked:
+                return 'X'
+        
+        # Y - Pulgar y meñique extendidos
+        if thumb and not index and not middle and not ring and pinky:
+            spread = self.get_distance(landmarks[4], landmarks[20]) > 0.2
+            if spread:
+                return 'Y'
+        
+        # Z - Similar a D pero con movimiento en Z (detectamos posición base)
+        # Requeriría tracking de movimiento
+        
+        return None
+    
+    def recognize(self, landmarks):
+        """Reconoce tanto letras como números"""
+        # Primero intentar reconocer números
+        number = self.recognize_number(landmarks)
+        if number:
+            return number
+        
+        # Si no es número, intentar letra
+        letter = self.recognize_letter(landmarks)
+        return letter
@@ -0,0 +1,45 @@
+"""Reconocimiento de varias manos: el modelo las clasifica en una sola llamada"""
+
+import numpy as np
+
+from utils.landmark_classifier import LearnedRecognizer, recognize_hands
+
+
+class CountingClassifier:
+    """Clasificador falso: la letra depende de la x de la muñeca; cuenta las llamadas"""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, points):
+        self.calls.append(len(points))
+        labels = np.array(['A' if p[0, 0] < 0.5 else 'B' for p in points])
+        proba = np.array([0.9 if p[0, 0] < 0.8 else 0.3 for p in points])
+        return labels, proba
+
+
+def hand(x):
+    points = np.zeros((21, 3), np.float32)
+    points[:, 0] = x
+    return points
+
+
+def test_both_hands_in_one_call():
+    classifier = CountingClassifier()
+    recognizer = LearnedRecognizer(classifier, return_confidence=True)
+    hands = [hand(0.2), hand(0.6), hand(0.9)]
+
+    assert recognize_hands(recognizer, 'recognize', hands) == ['A', 'B', None]
+    assert recognize_hands(recognizer, 'recognize_letter', hands) == [('A', 90.0), ('B', 90.0), (None, 0)]
+    assert classifier.calls == [3, 3]
+    # Igual que llamar mano por mano
+    assert [recognizer.recognize_letter(h) for h in hands] == recognize_hands(recognizer, 'recognize_letter', hands)
+    assert recognize_hands(recognizer, 'recognize', []) == []
+
+
+def test_rules_are_called_per_hand():
+    class Rules:
+        def recognize_letter(self, landmarks):
+            return 'A' if landmarks[0, 0] < 0.5 else None
+
+    assert recognize_hands(Rules(), 'recognize_letter', [hand(0.2), hand(0.7)]) == ['A', None]
@@ -0,0 +1,51 @@
+"""Grabación de landmarks: símbolos UTF-8 y cierre mientras otro hilo agrega frames"""
+
+import threading
+
+import numpy as np
+
+from utils.landmark_recording import SYMBOL_WIDTH, LandmarkRecorder, LandmarkRecording, symbol_bytes
+
+
+def test_symbol_never_splits_a_character():
+    for symbol in ('Ñ', 'AÑO', 'ÑÑÑ', 'ESPACIO'):
+        encoded = symbol_bytes(symbol)
+        assert len(encoded) <= SYMBOL_WIDTH
+        assert symbol.startswith(encoded.decode('utf-8'))
+
+
+def test_symbols_round_trip(tmp_path):
+    path = str(tmp_path / 'session.slmk')
+    hand = np.zeros((21, 3), np.float32)
+    with LandmarkRecorder(path) as recorder:
+        for i, symbol in enumerate(('Ñ', 'AÑO', 'ÑÑÑ', None)):
+            recorder.append(i * 0.1, [hand], ['Right'], symbol, [0.9])
+    with LandmarkRecording(path) as recording:
+        assert [frame.symbol for frame in recording.replay()] == ['Ñ', 'AÑO', 'ÑÑ', None]
+
+
+def test_close_while_appending(tmp_path):
+    path = str(tmp_path / 'session.slmk')
+    recorder = LandmarkRecorder(path, block_frames=16)
+    hand = np.zeros((21, 3), np.float32)
+    stop = threading.Event()
+
+    def inference():
+        t = 0.0
+        while not stop.is_set():
+            recorder.append(t, [hand], ['Left'], 'Ñ', [0.5])
+            t += 0.01
+
+    thread = threading.Thread(target=inference)
+    thread.start()
+    for _ in range(20):
+        recorder.flush()
+    recorder.close()
+    stop.set()
+    thread.join()
+
+    with LandmarkRecording(path) as recording:
+        assert len(recording) > 0
+        timestamps = recording.column('timestamp')
+        assert np.all(np.diff(timestamps) > 0)
+        assert recording.frame(len(recording) - 1).symbol == 'Ñ'
@@ -0,0 +1,69 @@
+"""Pipeline con ruta directa: los frames inferidos llegan a la salida aunque lleguen tarde"""
+
+import threading
+import time
+
+from utils.pipeline import DropQueue, FramePacket, FramePipeline
+
+
+class EveryThirdPacer:
+    """Infiere uno de cada tres frames, a 200 FPS de captura"""
+
+    def __init__(self):
+        self.count = 0
+
+    def should_infer(self):
+        self.count += 1
+        return self.count % 3 == 1
+
+    def wait(self):
+        time.sleep(0.005)
+
+    def metrics(self):
+        return {}
+
+
+def test_inferred_frames_reach_the_output():
+    frames = iter(range(90))
+    inferred, rendered = [], []
+    lock = threading.Lock()
+
+    def source():
+        frame = next(frames, None)
+        if frame is None:
+            # Tiempo para que termine la inferencia en curso
+            time.sleep(0.1)
+        return frame
+
+    def infer(frame):
+        # Inferencia más lenta que la captura: sus frames salen detrás de los directos
+        time.sleep(0.02)
+        with lock:
+            inferred.append(frame)
+        return ('inferido', frame)
+
+    def render(data):
+        with lock:
+            rendered.append(data)
+
+    pipeline = FramePipeline(source, [('inferencia', infer), ('render', render)], report_interval=0,
+                             pacer=EveryThirdPacer(), bypass=lambda frame: ('directo', frame))
+    pipeline.run()
+
+    annotated = [frame for kind, frame in rendered if kind == 'inferido']
+    assert inferred and annotated == inferred
+    assert any(kind == 'directo' for kind, _ in rendered)
+
+
+def test_bypass_does_not_evict_a_waiting_inferred_frame():
+    queue = DropQueue(1)
+    queue.put(FramePacket(3, 0.0, 'inferido'))
+    bypass = FramePacket(4, 0.0, 'directo', inferred=False)
+    assert queue.put(bypass, keep=lambda waiting: waiting.inferred)
+    assert queue.get().data == 'inferido'
+    assert queue.dropped == 1
+
+    # Sin un inferido esperando, el directo más nuevo reemplaza al viejo
+    queue.put(FramePacket(5, 0.0, 'directo', inferred=False))
+    queue.put(FramePacket(6, 0.0, 'directo', inferred=False), keep=lambda waiting: waiting.inferred)
+    assert queue.get().index == 6
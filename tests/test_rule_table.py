@@ -0,0 +1,123 @@
+"""La tabla de decisión de main.py reconoce lo mismo que las cadenas de if de la versión base"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from legacy_main_rules import SignLanguageRecognizer as LegacyRecognizer
+from utils.hand_features import extract_features
+from utils.rule_table import NUM_MASKS, RuleTable, finger_mask, pattern_matches
+from utils.sign_rules import LETTER_RULES, NUMBER_RULES, combined_table, finger_states, letter_table, number_table
+
+
+def as_landmarks(points):
+    """Puntos (21, 3) como los objetos landmark de MediaPipe (valores float32)"""
+    return [SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in points.astype(np.float32)]
+
+
+def posed_hands():
+    """
+    Manos armadas a mano para cada una de las 32 combinaciones de dedos
+
+    Se varía la separación de los dedos, dónde queda la punta del pulgar
+    (tocando el índice, el medio, el meñique o lejos) y el lado de la mano.
+    """
+    bases = [0.40, 0.45, 0.50, 0.55]
+    for mask in range(NUM_MASKS):
+        extended = [bool(mask & (1 << bit)) for bit in range(5)]
+        for spread in (0.0, 0.03, 0.06, 0.12):
+            for thumb_target in (8, 12, 20, None):
+                points = np.zeros((21, 3), np.float32)
+                points[0] = (0.50, 0.90, 0.0)
+                for finger, base in enumerate(bases, 1):
+                    mcp = 1 + 4 * finger
+                    tip_x = base + (finger - 2.5) * spread
+                    points[mcp] = (base, 0.70, 0.0)
+                    if extended[finger]:
+                        points[mcp + 1:mcp + 4, 0] = np.linspace(base, tip_x, 4)[1:]
+                        points[mcp + 1:mcp + 4, 1] = (0.58, 0.50, 0.42)
+                    else:
+                        points[mcp + 1:mcp + 4, 0] = (base, base - 0.01, base - 0.02)
+                        points[mcp + 1:mcp + 4, 1] = (0.62, 0.68, 0.72)
+                points[1] = (0.36, 0.82, 0.0)
+                points[2] = (0.33, 0.76, 0.0)
+                points[3] = (0.31, 0.72, 0.0)
+                if thumb_target is None:
+                    points[4] = (0.36 if extended[0] else 0.26, 0.64, 0.0)
+                else:
+                    points[4] = points[thumb_target] + (0.01, 0.01, 0.0)
+                yield points
+                # La misma mano del otro lado
+                mirrored = points.copy()
+                mirrored[:, 0] = 1.0 - mirrored[:, 0]
+                yield mirrored
+
+
+def random_hands(n=20000, seed=0):
+    """
+    Manos sintéticas: puntos al azar en una caja de tamaño variable
+
+    Las cajas chicas generan las distancias cortas que piden 0, 9, O, etc. y
+    las grandes las separaciones de V, Y, etc.; los estados de los dedos
+    quedan repartidos entre las 32 máscaras.
+    """
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        center = rng.uniform(0.3, 0.7, size=2)
+        scale = rng.uniform(0.05, 0.6)
+        points = np.zeros((21, 3), np.float32)
+        points[:, :2] = center + scale * rng.uniform(-0.5, 0.5, size=(21, 2))
+        points[:, 2] = rng.uniform(-0.1, 0.1, size=21)
+        yield points
+
+
+@pytest.fixture(scope='module')
+def tables():
+    return number_table(), letter_table(), combined_table()
+
+
+def compare(hands, tables):
+    """Compara ambos reconocedores; devuelve las máscaras y los símbolos vistos"""
+    legacy = LegacyRecognizer()
+    numbers, letters, combined = tables
+    masks, seen = set(), set()
+    for i, points in enumerate(hands):
+        landmarks = as_landmarks(points)
+        f = extract_features(points)
+        states = finger_states(f)
+        assert states == legacy.get_finger_states(landmarks), f"mano {i}"
+        expected = (legacy.recognize_number(landmarks), legacy.recognize_letter(landmarks),
+                    legacy.recognize(landmarks))
+        got = (numbers.classify(states, f), letters.classify(states, f), combined.classify(states, f))
+        assert got == expected, f"mano {i}"
+        masks.add(finger_mask(states))
+        seen.update(s for s in expected if s)
+    return masks, seen
+
+
+def test_table_matches_baseline_on_posed_hands(tables):
+    masks, seen = compare(posed_hands(), tables)
+    assert len(masks) == NUM_MASKS
+    assert len(seen) >= 20, sorted(seen)
+
+
+def test_table_matches_baseline_on_random_hands(tables):
+    masks, seen = compare(random_hands(), tables)
+    assert len(masks) == NUM_MASKS
+    # Que la comparación no sea trivial: la mayoría de los símbolos aparece
+    symbols = {rule[0] for rule in NUMBER_RULES + LETTER_RULES}
+    assert len(seen) >= 0.8 * len(symbols), sorted(symbols - seen)
+
+
+def test_compiled_table_matches_linear_walk(tables):
+    hands = [extract_features(points) for points in random_hands(5000, seed=1)]
+    for table in tables:
+        assert table.verify(hands, finger_states) == []
+
+
+def test_pattern_syntax():
+    assert pattern_matches('1.0..', finger_mask([True, False, False, True, True]))
+    assert not pattern_matches('1.0..', finger_mask([True, True, True, False, False]))
+    with pytest.raises(ValueError):
+        RuleTable().add('A', '10x00')
@@ -0,0 +1,86 @@
+"""Historial con sesiones archivadas: paginación, ids y deduplicación por source"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils import session_store
+from utils.session_store import SessionStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(str(tmp_path / 'sessions.db'))
+    yield store
+    store.close()
+
+
+def add_sessions(store, n, start=datetime(2025, 1, 1)):
+    return [store.add({'start_time': (start + timedelta(hours=i)).isoformat(), 'text': f'S{i}'})
+            for i in range(n)]
+
+
+def all_ids(store):
+    ids, cursor = [], None
+    while True:
+        page, cursor = store.page(7, cursor)
+        ids += [s['id'] for s in page]
+        if cursor is None:
+            return ids
+
+
+def test_paging_spans_live_and_archived(store):
+    add_sessions(store, 50)
+    before = all_ids(store)
+    assert store.archive_before('2025-01-02T00:00:00', max_sessions=10) == 10
+    assert store.archive_before('2025-01-02T00:00:00', max_sessions=10) == 10
+    assert all_ids(store) == before
+    assert store.count() == 50
+    assert store.get(before[-1])['text'] == 'S0'
+    assert [s['text'] for s in store.between(None, None, batch=6)] == [f'S{i}' for i in range(50)]
+
+
+def test_ids_not_reused_after_dropping_segments(store):
+    ids = add_sessions(store, 30)
+    store.archive_before('2025-01-03T00:00:00', max_sessions=100)
+    # Se archivaron todas; después se borra el archivo entero
+    assert store.drop_segments(older_than='2026-01-01') == 30
+    assert store.count() == 0
+    new_id = store.add({'start_time': '2025-06-01T00:00:00', 'text': 'nueva'})
+    assert new_id > max(ids)
+
+
+def test_source_dedup_survives_archiving(store):
+    session = {'start_time': '2025-01-01T10:00:00', 'text': 'HOLA'}
+    assert store.add(session, source='journal/session_1.jsonl') is not None
+    store.archive_before('2025-02-01T00:00:00')
+    assert store.has_source('journal/session_1.jsonl')
+    assert store.add(session, source='journal/session_1.jsonl') is None
+    assert store.count() == 1
+
+
+def test_reads_skip_segments_dropped_during_the_read(store, monkeypatch):
+    ids = add_sessions(store, 20)
+    store.archive_before('2025-01-01T10:00:00', max_sessions=100)
+    real_open = session_store.gzip.open
+
+    def drop_then_open(path, mode):
+        # La retención corre entre la consulta al índice y la lectura del segmento
+        store.drop_segments(older_than='2026-01-01')
+        return real_open(path, mode)
+
+    monkeypatch.setattr(session_store.gzip, 'open', drop_then_open)
+    page, cursor = store.page(50)
+    assert [s['text'] for s in page] == [f'S{i}' for i in range(19, 9, -1)]
+    assert cursor is None
+    assert store.get(ids[0]) is None
+    assert [s['text'] for s in store.between()] == [f'S{i}' for i in range(10, 20)]
+    assert store.segment_cache == {}
+
+
+def test_reads_skip_a_segment_row_removed_after_the_query(store):
+    ids = add_sessions(store, 5)
+    store.archive_before('2025-01-01T02:00:00')
+    row = store.conn.execute(f'{session_store._ARCHIVED} WHERE id = ?', (ids[0],)).fetchone()
+    store.drop_segments(older_than='2026-01-01')
+    assert store._decode(row) is None
@@ -0,0 +1,55 @@
+"""Votación por tiempo: la misma seña se confirma a cualquier frecuencia de inferencia"""
+
+import pytest
+
+from utils.stability import StabilityVoter
+
+# (ventana, umbral) de main.py, main2.py/program.py y sign.py
+CONFIGS = [(0.4, 0.23), (0.33, 0.17), (0.5, 0.33)]
+
+
+def hold_latency(voter, fps, symbol='A', idle_s=1.0, hold_s=3.0):
+    """Frames sin mano durante idle_s y después la seña sostenida; segundos hasta confirmarla"""
+    step = 1.0 / fps
+    t = 0.0
+    while t < idle_s:
+        voter.miss(t)
+        t += step
+    start = t
+    while t - start < hold_s:
+        stable = voter.push(symbol, t)
+        if stable:
+            voter.commit(stable)
+            return t - start
+        t += step
+    return None
+
+
+@pytest.mark.parametrize('window_s, threshold_s', CONFIGS)
+def test_commits_at_any_pacer_rate(window_s, threshold_s):
+    latencies = {}
+    for fps in (5, 10, 30):
+        latencies[fps] = hold_latency(StabilityVoter.timed(window_s, threshold_s), fps)
+        assert latencies[fps] is not None, f"sin confirmación a {fps} FPS"
+    # Solo cambia el redondeo al frame siguiente
+    assert max(latencies.values()) - min(latencies.values()) <= 0.2 + 1e-6
+    assert max(latencies.values()) <= threshold_s + 0.2 + 1e-6
+
+
+@pytest.mark.parametrize('fps', [4.9, 5, 5.1])
+def test_pacer_floor_boundary(fps):
+    assert hold_latency(StabilityVoter.timed(0.4, 0.23), fps) is not None
+
+
+def test_commits_again_after_reset():
+    voter = StabilityVoter.timed(0.4, 0.23)
+    assert hold_latency(voter, 5) is not None
+    voter.reset()
+    # Después del reset el primer voto pesa el último intervalo medido
+    assert hold_latency(voter, 5, symbol='B', idle_s=0.0) <= 0.2 + 1e-6
+
+
+def test_frame_window_unchanged():
+    voter = StabilityVoter(threshold=5, maxlen=10)
+    results = [voter.push('A') for _ in range(5)]
+    assert results == [None, None, None, None, 'A']
@@ -0,0 +1,53 @@
+"""Transcripción por lotes: un video bueno deja su resumen y uno dañado un error"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip('cv2')
+pytest.importorskip('mediapipe')
+# init_worker importa la app (y con ella flet) para usar su reconocedor
+pytest.importorskip('flet')
+
+from tools import transcribe_videos  # noqa: E402
+
+
+@pytest.fixture
+def videos(tmp_path):
+    directory = tmp_path / 'videos'
+    directory.mkdir()
+    writer = cv2.VideoWriter(str(directory / 'bueno.avi'), cv2.VideoWriter_fourcc(*'MJPG'), 10, (160, 120))
+    for i in range(10):
+        writer.write(np.full((120, 160, 3), i * 20, np.uint8))
+    writer.release()
+    (directory / 'danado.mp4').write_bytes(os.urandom(2000))
+    return directory
+
+
+def read_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_transcribe_in_process(videos, tmp_path):
+    transcribe_videos.init_worker('main2', 'reglas', True)
+    good = transcribe_videos.transcribe((str(videos / 'bueno.avi'), str(tmp_path / 'bueno.jsonl')))
+    assert good['frames'] == 10 and 'error' not in good
+    assert read_jsonl(tmp_path / 'bueno.jsonl')[-1]['type'] == 'resumen'
+
+    bad = transcribe_videos.transcribe((str(videos / 'danado.mp4'), str(tmp_path / 'danado.jsonl')))
+    assert bad['video'].endswith('danado.mp4') and bad['error']
+
+
+def test_main_keeps_going_after_a_bad_video(videos, tmp_path, monkeypatch, capsys):
+    out = tmp_path / 'out'
+    monkeypatch.setattr(sys, 'argv', ['transcribe_videos.py', str(videos), '--out', str(out), '--workers', '1'])
+    assert transcribe_videos.main() == 1
+
+    printed = capsys.readouterr().out
+    assert "10 frames" in printed
+    assert "(1 con error)" in printed
+    assert read_jsonl(out / 'bueno.jsonl')[-1]['frames'] == 10
@@ -0,0 +1,109 @@
+"""Cola de voz con un motor falso: unión de frases, vencimiento, claves y cancelación"""
+
+import threading
+import time
+
+from utils.tts_worker import LOW, URGENT, TTSWorker
+
+
+class FakeEngine:
+    """Imita a pyttsx3: emite 'started-word' por palabra y respeta stop()"""
+
+    def __init__(self):
+        self.properties = {}
+        self.callbacks = []
+        self.pending = []
+        self.spoken = []
+        self.words = []
+        self.stopped = False
+
+    def setProperty(self, name, value):
+        self.properties[name] = value
+
+    def connect(self, topic, callback):
+        assert topic == 'started-word'
+        self.callbacks.append(callback)
+
+    def say(self, text):
+        self.pending.append(text)
+
+    def runAndWait(self):
+        self.stopped = False
+        for text in self.pending:
+            self.spoken.append(text)
+            for word in text.split():
+                for callback in self.callbacks:
+                    callback(text, 0, len(word))
+                if self.stopped:
+                    break
+                self.words.append(word)
+        self.pending = []
+
+    def stop(self):
+        self.stopped = True
+
+
+def run_queued(worker, engine):
+    """Arranca el hilo con la cola ya armada y espera a que se diga la última frase (LOW)"""
+    done = threading.Event()
+    worker.say("fin", priority=LOW, on_done=lambda text, error: done.set())
+    worker.start()
+    assert worker.wait_ready(2)
+    assert done.wait(2)
+    worker.close()
+    return engine.spoken
+
+
+def test_coalesce_and_stats():
+    engine = FakeEngine()
+    worker = TTSWorker(rate=120, volume=0.5, engine_factory=lambda: engine)
+    for word in ("hola", "como", "estas"):
+        assert worker.say(word, coalesce=True)
+    assert worker.queue_depth() == 3
+
+    assert run_queued(worker, engine) == ["hola como estas", "fin"]
+    assert engine.properties == {'rate': 120, 'volume': 0.5}
+    stats = worker.stats()
+    assert (stats['dichas'], stats['unidas'], stats['descartadas'], stats['errores']) == (2, 2, 0, 0)
+    assert stats['cola'] == 0
+    assert stats['latencia_ms']['count'] == 4
+
+
+def test_expired_phrase_is_dropped():
+    engine = FakeEngine()
+    worker = TTSWorker(engine_factory=lambda: engine)
+    worker.say("vieja", max_age=0.01)
+    worker.say("nueva", max_age=5)
+    time.sleep(0.05)
+
+    assert run_queued(worker, engine) == ["nueva", "fin"]
+    assert worker.stats()['descartadas'] == 1
+
+
+def test_key_replaces_pending_phrase():
+    engine = FakeEngine()
+    worker = TTSWorker(engine_factory=lambda: engine)
+    worker.say("letra A", key='letra')
+    worker.say("otra cosa")
+    worker.say("letra B", key='letra', priority=URGENT)
+
+    assert run_queued(worker, engine) == ["letra B", "otra cosa", "fin"]
+    stats = worker.stats()
+    assert (stats['dichas'], stats['descartadas']) == (3, 1)
+
+
+def test_cancel_cuts_at_next_word():
+    engine = FakeEngine()
+    worker = TTSWorker(engine_factory=lambda: engine)
+    done = threading.Event()
+    # Se cancela apenas empieza la frase: no llega a decirse ninguna palabra
+    worker.say("una frase bastante larga", on_start=lambda text: worker.cancel(),
+               on_done=lambda text, error: done.set())
+    worker.say("pendiente", priority=LOW)
+    worker.start()
+    assert done.wait(2)
+    worker.close()
+
+    assert engine.words == []
+    assert "pendiente" not in engine.spoken
+    assert worker.stats()['canceladas'] == 1
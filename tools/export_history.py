@@ -0,0 +1,64 @@
+"""
+Exportación del historial de sesiones para análisis
+Lee sign_language_history/sessions.db por lotes y escribe el rango de fechas
+pedido en JSONL, CSV o el .npz columnar comprimido (ver
+utils/history_export.py), con memoria constante sin importar cuántas
+sesiones haya.
+
+Uso: python tools/export_history.py --out historial.csv [--desde 2025-01-01] [--hasta 2025-04-01] [--letras]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.history_export import EXTENSIONS, FORMATS, HistoryExporter  # noqa: E402
+from utils.session_store import SessionStore  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta un rango de fechas del historial de sesiones")
+    parser.add_argument('--db', default=os.path.join('sign_language_history', 'sessions.db'))
+    parser.add_argument('--out', required=True, help="archivo de salida (.jsonl, .csv o .npz)")
+    parser.add_argument('--format', choices=FORMATS, help="por omisión, según la extensión de --out")
+    parser.add_argument('--desde', help="fecha de inicio incluida (ISO, p. ej. 2025-01-01)")
+    parser.add_argument('--hasta', help="fecha de fin excluida")
+    parser.add_argument('--letras', action='store_true', help="incluir tiempo y confianza de cada letra")
+    args = parser.parse_args()
+
+    export_format = args.format
+    if export_format is None:
+        by_extension = {ext: name for name, ext in EXTENSIONS.items()}
+        export_format = by_extension.get(os.path.splitext(args.out)[1].lower())
+        if export_format is None:
+            print(f"No se reconoce la extensión de {args.out}: usar --format")
+            return 1
+    if not os.path.exists(args.db):
+        print(f"No existe la base de sesiones {args.db}")
+        return 1
+
+    def on_progress(exported, total):
+        print(f"\r{exported}/{total} sesiones", end='', flush=True)
+
+    store = SessionStore(args.db)
+    t0 = time.perf_counter()
+    exporter = HistoryExporter(store, args.out, export_format, args.desde, args.hasta, args.letras,
+                               on_progress=on_progress).start()
+    try:
+        exporter.wait()
+    except KeyboardInterrupt:
+        exporter.cancel()
+        exporter.wait()
+    print()
+    store.close()
+    if exporter.error:
+        return 1
+    print(f"{exporter.exported} sesiones en {args.out} ({time.perf_counter() - t0:.1f} s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Exportación del clasificador a TFLite con cuantización post-entrenamiento
+Toma el .npz entrenado (NumPy o Keras), lo reconstruye en Keras y lo
+convierte a TFLite en fp32, fp16 o int8. La cuantización int8 se calibra con
+landmarks grabados con record_samples.py. Requiere requirements-train.txt;
+las apps cargan el .tflite con ai_edge_litert/tflite_runtime si están
+instalados.
+
+Uso: python tools/export_tflite.py --model models/landmark_classifier.npz --data data/samples.npz --quantization int8
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.landmark_classifier import DEFAULT_MODEL_PATH, LandmarkClassifier, normalize_landmarks  # noqa: E402
+from utils.model_export import classifier_to_keras, export_tflite  # noqa: E402
+from utils.samples import load_samples  # noqa: E402
+from utils.tflite_runtime import metadata_path, save_metadata  # noqa: E402
+
+QUANTIZATIONS = ('fp32', 'fp16', 'int8')
+
+
+def tflite_path(model_path, quantization):
+    return f"{os.path.splitext(model_path)[0]}_{quantization}.tflite"
+
+
+def export(classifier, out, quantization, calibration_points=None):
+    """Exporta el clasificador y su .meta.npz; devuelve el tamaño del .tflite en bytes"""
+    calibration = normalize_landmarks(calibration_points) if calibration_points is not None else None
+    # La estandarización va plegada en la primera capa: los metadatos solo llevan etiquetas
+    size = export_tflite(classifier_to_keras(classifier), out, quantization, calibration)
+    save_metadata(out, classifier.labels)
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta el clasificador a TFLite")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--data', default=os.path.join('data', 'samples.npz'),
+                        help="muestras grabadas para calibrar int8")
+    parser.add_argument('--quantization', choices=QUANTIZATIONS, nargs='+', default=['int8'])
+    parser.add_argument('--out', help="ruta del .tflite (solo con una cuantización)")
+    args = parser.parse_args()
+
+    classifier = LandmarkClassifier.load(args.model)
+    points = None
+    if 'int8' in args.quantization:
+        points, _ = load_samples(args.data)
+        print(f"Calibración int8 con {len(points)} muestras de {args.data}")
+
+    for quantization in args.quantization:
+        out = args.out if args.out and len(args.quantization) == 1 else tflite_path(args.model, quantization)
+        size = export(classifier, out, quantization, points)
+        print(f"{quantization}: {out} ({size / 1024:.1f} KB) + {metadata_path(out)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Inspección de grabaciones de landmarks (.slmk)
+Muestra duración, frames, manos y símbolos de una o más grabaciones de
+sesión, y opcionalmente vuelca los frames con un símbolo reconocido como
+muestras etiquetadas (mismo formato que record_samples.py) para entrenar.
+
+Uso: python tools/inspect_recording.py sign_language_history/recordings/*.slmk [--samples data/sesiones.npz]
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.landmark_recording import LandmarkRecording  # noqa: E402
+from utils.samples import load_samples, save_samples  # noqa: E402
+
+
+def describe(recording):
+    timestamps = recording.column('timestamp')
+    num_hands = recording.column('num_hands')
+    symbols = Counter(s.decode('utf-8') for s in recording.column('symbol') if s)
+    size = os.path.getsize(recording.path)
+    duration = float(timestamps[-1] - timestamps[0]) if len(timestamps) else 0.0
+    print(f"{recording.path}: {len(recording)} frames en {len(recording.blocks)} bloques, "
+          f"{duration:.1f} s, {size / 1024:.1f} KB ({size / max(len(recording), 1):.0f} bytes/frame, "
+          f"{recording.coord_dtype.name})")
+    print(f"    con mano: {int(np.count_nonzero(num_hands))} frames"
+          + (f" | símbolos: {', '.join(f'{k}={v}' for k, v in symbols.most_common())}" if symbols else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumen de grabaciones de landmarks")
+    parser.add_argument('recordings', nargs='+')
+    parser.add_argument('--samples', help="agregar los frames con símbolo a este archivo de muestras")
+    args = parser.parse_args()
+
+    points, labels = [], []
+    for path in args.recordings:
+        try:
+            recording = LandmarkRecording(path)
+        except (OSError, ValueError) as e:
+            print(f"No se pudo leer {path}: {e}")
+            continue
+        with recording:
+            describe(recording)
+            if args.samples:
+                for block in recording.blocks:
+                    # Primera mano de cada frame con un símbolo reconocido
+                    keep = (block['num_hands'] > 0) & (block['symbol'] != b'')
+                    points.extend(block['landmarks'][keep, 0].astype(np.float32))
+                    labels.extend(s.decode('utf-8') for s in block['symbol'][keep])
+
+    if args.samples:
+        if not labels:
+            print("No hay frames con símbolo para guardar")
+            return 1
+        if os.path.exists(args.samples):
+            old_points, old_labels = load_samples(args.samples)
+            points = list(old_points) + points
+            labels = list(old_labels) + labels
+        save_samples(args.samples, points, labels)
+        print(f"{len(labels)} muestras en {args.samples}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
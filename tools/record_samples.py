@@ -0,0 +1,87 @@
+"""
+Grabación de muestras etiquetadas para entrenar el clasificador
+Abre la cámara y, mientras se mantiene presionada una tecla (A-Z o 0-9), guarda
+los landmarks de la mano con esa etiqueta. La tecla '-' graba muestras sin
+seña. ESC termina y guarda; si el archivo ya existe se agregan las muestras.
+
+Uso: python tools/record_samples.py --out data/samples.npz [--camera 0]
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.frames import FramePreparer  # noqa: E402
+from utils.hand_features import landmarks_to_array  # noqa: E402
+from utils.landmark_classifier import NONE_LABEL  # noqa: E402
+from utils.samples import load_samples, save_samples  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Graba landmarks etiquetados desde la cámara")
+    parser.add_argument('--out', default=os.path.join('data', 'samples.npz'))
+    parser.add_argument('--camera', type=int, default=0)
+    args = parser.parse_args()
+
+    points, labels = [], []
+    if os.path.exists(args.out):
+        old_points, old_labels = load_samples(args.out)
+        points.extend(old_points)
+        labels.extend(old_labels)
+        print(f"{len(labels)} muestras previas en {args.out}")
+
+    cap = cv2.VideoCapture(args.camera)
+    if not cap.isOpened():
+        print("No se pudo acceder a la cámara")
+        return 1
+
+    hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=1,
+                                     min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    draw = mp.solutions.drawing_utils
+    preparer = FramePreparer()
+    counts = Counter(labels)
+
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        # Mismo preprocesamiento que las apps (espejo) para que las muestras coincidan
+        frame, rgb = preparer.prepare(frame)
+        results = hands.process(rgb)
+        hand = results.multi_hand_landmarks[0] if results.multi_hand_landmarks else None
+        if hand:
+            draw.draw_landmarks(frame, hand, mp.solutions.hands.HAND_CONNECTIONS)
+
+        key = cv2.waitKey(1) & 0xFF
+        if key == 27:
+            break
+        label = chr(key).upper() if key != 255 else None
+        if label and (label.isalnum() or label == NONE_LABEL) and hand:
+            points.append(landmarks_to_array(hand))
+            labels.append(label)
+            counts[label] += 1
+
+        status = f"Muestras: {len(labels)}"
+        if label and hand:
+            status += f" | grabando {label} ({counts[label]})"
+        cv2.putText(frame, status, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+        cv2.imshow('Grabación de muestras', frame)
+
+    cap.release()
+    cv2.destroyAllWindows()
+    if points:
+        save_samples(args.out, points, labels)
+        print(f"{len(labels)} muestras guardadas en {args.out}")
+        print(", ".join(f"{k}: {v}" for k, v in sorted(counts.items())))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
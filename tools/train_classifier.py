@@ -0,0 +1,86 @@
+"""
+Entrenamiento del clasificador de landmarks
+Entrena la red densa sobre las muestras grabadas con record_samples.py y
+exporta los pesos al .npz que cargan las apps en modo 'modelo'. Con --keras
+entrena con TensorFlow (requirements-train.txt) y exporta las capas Dense al
+mismo .npz; las apps nunca importan TensorFlow.
+
+Uso: python tools/train_classifier.py --data data/samples.npz [--out models/landmark_classifier.npz] [--keras]
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.landmark_classifier import DEFAULT_MODEL_PATH, normalize_landmarks, train_classifier  # noqa: E402
+from utils.samples import load_samples  # noqa: E402
+
+
+def train_keras(points, labels, hidden=(128, 64), epochs=200, batch_size=64,
+                learning_rate=1e-3, seed=0, val_split=0.15, patience=20):
+    """Entrena la misma red con Keras y la convierte al runtime NumPy"""
+    # TensorFlow solo se importa aquí: ni las apps ni el entrenamiento NumPy lo cargan
+    from tensorflow import keras
+
+    from utils.model_export import keras_to_classifier
+
+    keras.utils.set_random_seed(seed)
+    x = normalize_landmarks(points)
+    classes, y = np.unique(np.asarray(labels).astype(str), return_inverse=True)
+    mean = x.mean(axis=0)
+    std = x.std(axis=0) + 1e-6
+
+    model = keras.Sequential([keras.Input(shape=(x.shape[1],))])
+    for units in hidden:
+        model.add(keras.layers.Dense(units, activation='relu'))
+        model.add(keras.layers.Dropout(0.2))
+    model.add(keras.layers.Dense(len(classes), activation='softmax'))
+    model.compile(optimizer=keras.optimizers.Adam(learning_rate),
+                  loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+    fit = model.fit((x - mean) / std, y, epochs=epochs, batch_size=batch_size,
+                    validation_split=val_split, verbose=2,
+                    callbacks=[keras.callbacks.EarlyStopping(monitor='val_accuracy', patience=patience,
+                                                             restore_best_weights=True)])
+
+    history = [{'epoch': i + 1, 'val_acc': acc} for i, acc in enumerate(fit.history['val_accuracy'])]
+    return keras_to_classifier(model, classes, mean, std), history
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entrena el clasificador de landmarks")
+    parser.add_argument('--data', default=os.path.join('data', 'samples.npz'))
+    parser.add_argument('--out', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--hidden', type=int, nargs='+', default=[128, 64])
+    parser.add_argument('--epochs', type=int, default=200)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--lr', type=float, default=1e-3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--keras', action='store_true', help="entrenar con TensorFlow/Keras")
+    args = parser.parse_args()
+
+    points, labels = load_samples(args.data)
+    classes, counts = np.unique(labels, return_counts=True)
+    print(f"{len(labels)} muestras, {len(classes)} clases "
+          f"(mínimo {counts.min()} por clase: {classes[counts.argmin()]})")
+
+    train = train_keras if args.keras else train_classifier
+    classifier, history = train(points, labels, hidden=tuple(args.hidden),
+                                epochs=args.epochs, batch_size=args.batch_size,
+                                learning_rate=args.lr, seed=args.seed)
+    best = max(history, key=lambda h: h['val_acc'])
+    print(f"Mejor época {best['epoch']}: validación {best['val_acc']:.3f}")
+
+    directory = os.path.dirname(args.out)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    classifier.save(args.out)
+    print(f"Modelo guardado en {args.out} ({os.path.getsize(args.out) / 1024:.1f} KB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
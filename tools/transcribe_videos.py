@@ -0,0 +1,220 @@
+"""
+Transcripción por lotes de videos grabados, sin interfaz
+Reparte los videos de un directorio entre procesos (multiprocessing), cada
+uno con su propia instancia de Hands. Cada frame pasa por el mismo
+reconocedor por reglas (o el modelo) y la misma votación de estabilidad que
+la app elegida, usando el tiempo del video en lugar del reloj. Por video se
+escribe un .jsonl con los símbolos confirmados y su tiempo, y al final una
+línea con el texto completo.
+
+Uso: python tools/transcribe_videos.py videos/ --out transcripciones/ [--app main2] [--workers 4]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import get_context
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+
+# Por app: máximo de manos, confianzas de MediaPipe, método del reconocedor,
+# votación (ventana, umbral en segundos) y si el reconocedor devuelve confianza
+APPS = {
+    'main': {'max_num_hands': 1, 'detection': 0.7, 'tracking': 0.6,
+             'method': 'recognize', 'voter': (0.4, 0.23), 'confidence': False},
+    'main2': {'max_num_hands': 2, 'detection': 0.7, 'tracking': 0.5,
+              'method': 'recognize_letter', 'voter': (0.33, 0.17), 'confidence': False},
+    'program': {'max_num_hands': 1, 'detection': 0.7, 'tracking': 0.5,
+                'method': 'recognize_letter', 'voter': (0.33, 0.17), 'confidence': True},
+}
+
+# Estado de cada proceso del pool (se crea una vez en init_worker)
+_worker = {}
+
+
+def find_videos(directory):
+    """Videos del directorio (recursivo), los más grandes primero para repartir mejor"""
+    videos = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(VIDEO_EXTENSIONS):
+                videos.append(os.path.join(root, name))
+    return sorted(videos, key=os.path.getsize, reverse=True)
+
+
+def init_worker(app_name, recognizer_mode, mirror):
+    """Crea Hands, el seguimiento por ROI y el reconocedor una sola vez por proceso"""
+    import importlib
+
+    import cv2
+    import mediapipe as mp
+
+    from utils.frames import FramePreparer
+    from utils.landmark_classifier import select_recognizer
+    from utils.roi_tracker import ROIHandTracker
+
+    # Un hilo de OpenCV por proceso: el paralelismo lo da el pool
+    cv2.setNumThreads(1)
+    config = APPS[app_name]
+    app = importlib.import_module(app_name)
+    hands = mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=config['max_num_hands'],
+        min_detection_confidence=config['detection'],
+        min_tracking_confidence=config['tracking'],
+    )
+    kwargs = {'return_confidence': True} if config['confidence'] else {}
+    recognizer = select_recognizer(app.SignLanguageRecognizer(), recognizer_mode, **kwargs)
+    _worker.update(
+        config=config,
+        hands=hands,
+        tracker=ROIHandTracker(hands, max_num_hands=config['max_num_hands'], enabled=True),
+        recognizer=recognizer,
+        preparer=FramePreparer(),
+        mirror=mirror,
+    )
+
+
+def transcribe(job):
+    """
+    Procesa un video completo en el proceso actual; devuelve su resumen
+
+    Si el video falla queda como {'video', 'error'} y el pool sigue con los demás.
+    """
+    try:
+        return _transcribe(*job)
+    except Exception as e:
+        return {'video': job[0], 'error': f"{type(e).__name__}: {e}"}
+
+
+def _transcribe(video_path, out_path):
+    import cv2
+
+    from utils.hand_features import extract_features
+    from utils.landmark_classifier import recognize_hands
+    from utils.stability import StabilityVoter
+
+    config = _worker['config']
+    recognizer = _worker['recognizer']
+    # Sin seguimiento heredado del video anterior
+    _worker['hands'].reset()
+    _worker['tracker'].reset()
+    voter = StabilityVoter.timed(*config['voter'])
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return {'video': video_path, 'error': "No se pudo abrir el video"}
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+        text = ""
+        frames = 0
+        frames_with_hand = 0
+        cpu0, wall0 = time.process_time(), time.perf_counter()
+        with open(out_path, 'w', encoding='utf-8') as out:
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                # Tiempo del video (no del reloj) para que la votación no dependa de la velocidad de proceso
+                timestamp = frames / fps
+                frames += 1
+
+                _, rgb = _worker['preparer'].prepare(frame, mirror=_worker['mirror'])
+                results = _worker['tracker'].process(rgb)
+
+                symbol, confidence = None, None
+                if results.multi_hand_landmarks:
+                    frames_with_hand += 1
+                # Todas las manos del frame en una llamada al reconocedor
+                hands = [extract_features(h) for h in results.multi_hand_landmarks or []]
+                for result in recognize_hands(recognizer, config['method'], hands):
+                    if config['confidence']:
+                        result, confidence = result
+                    if result:
+                        symbol = result
+
+                if symbol:
+                    stable = voter.push(symbol, timestamp)
+                    if stable:
+                        voter.commit(stable)
+                        text += stable
+                        event = {'t': round(timestamp, 3), 'frame': frames - 1, 'symbol': stable}
+                        if confidence is not None:
+                            event['confidence'] = round(confidence, 1)
+                        out.write(json.dumps(event, ensure_ascii=False) + "\n")
+                else:
+                    voter.miss(timestamp)
+
+            summary = {
+                'video': video_path,
+                'text': text,
+                'frames': frames,
+                'frames_with_hand': frames_with_hand,
+                'duration_s': round(frames / fps, 3),
+                'cpu_s': round(time.process_time() - cpu0, 3),
+                'wall_s': round(time.perf_counter() - wall0, 3),
+            }
+            out.write(json.dumps(dict(summary, type='resumen'), ensure_ascii=False) + "\n")
+        return summary
+    finally:
+        cap.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe un directorio de videos con un pool de procesos")
+    parser.add_argument('videos', help="directorio con los videos")
+    parser.add_argument('--out', default='transcripciones', help="directorio de los .jsonl")
+    parser.add_argument('--app', choices=sorted(APPS), default='main2',
+                        help="reconocedor y votación de esta app")
+    parser.add_argument('--recognizer', choices=['reglas', 'modelo'], default='reglas')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--no-mirror', action='store_true',
+                        help="no aplicar espejo (videos ya grabados en espejo)")
+    args = parser.parse_args()
+
+    videos = find_videos(args.videos)
+    if not videos:
+        print(f"No hay videos en {args.videos}")
+        return 1
+    os.makedirs(args.out, exist_ok=True)
+    jobs = [(path, os.path.join(args.out, os.path.splitext(os.path.relpath(path, args.videos))[0]
+                                .replace(os.sep, '__') + '.jsonl'))
+            for path in videos]
+    workers = max(1, min(args.workers, len(jobs)))
+    print(f"{len(jobs)} videos, {workers} procesos, reconocedor de {args.app}.py ({args.recognizer})")
+
+    # spawn: cada proceso importa MediaPipe desde cero en lugar de heredar un grafo a medias
+    context = get_context('spawn')
+    t0 = time.perf_counter()
+    total_frames = 0
+    total_cpu = 0.0
+    failed = 0
+    with context.Pool(workers, initializer=init_worker,
+                      initargs=(args.app, args.recognizer, not args.no_mirror)) as pool:
+        for done, summary in enumerate(pool.imap_unordered(transcribe, jobs), 1):
+            if 'error' in summary:
+                failed += 1
+                print(f"[{done}/{len(jobs)}] {summary['video']}: {summary['error']}")
+                continue
+            total_frames += summary['frames']
+            total_cpu += summary['cpu_s']
+            video_fps = summary['frames'] / summary['wall_s'] if summary['wall_s'] else 0.0
+            print(f"[{done}/{len(jobs)}] {summary['video']}: {summary['frames']} frames, "
+                  f"{video_fps:.1f} frames/s, \"{summary['text']}\"")
+    elapsed = time.perf_counter() - t0
+
+    print(f"Total: {total_frames} frames en {elapsed:.1f} s ({failed} con error)")
+    if elapsed and total_frames:
+        print(f"Rendimiento: {total_frames / elapsed:.1f} frames/s, "
+              f"{total_frames / elapsed / workers:.1f} frames/s por proceso, "
+              f"{total_frames / total_cpu:.1f} frames/s por segundo de CPU")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
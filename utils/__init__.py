@@ -0,0 +1,3 @@
+"""
+Funciones auxiliares compartidas por las aplicaciones de lenguaje de señas
+"""
@@ -0,0 +1,157 @@
+"""
+Omisión de inferencia con extrapolación de landmarks
+MediaPipe corre cada N frames; en los intermedios los landmarks se
+extrapolan a partir de las dos últimas detecciones, de modo que el dibujo y
+los buffers de estabilidad siguen avanzando un paso por frame capturado.
+N se adapta a la velocidad de la mano: quieta (seña sostenida) se infiere
+poco, en movimiento se infiere en cada frame.
+"""
+
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from utils.hand_features import landmarks_to_array
+
+
+class InferenceSkipper:
+    """
+    Decide qué frames pasan por MediaPipe y predice los demás
+
+    min_interval / max_interval: rango de N (frames entre inferencias)
+    slow_speed / fast_speed: velocidad media de los landmarks (fracción del
+    frame por segundo) por debajo de la cual se usa max_interval y por encima
+    de la cual se usa min_interval
+    idle_interval: N cuando no hay mano (acota la demora en detectar una nueva)
+    max_horizon: segundos máximos de extrapolación desde la última detección
+    enabled: False infiere todos los frames (comportamiento original)
+    """
+
+    def __init__(self, min_interval=1, max_interval=4, slow_speed=0.15, fast_speed=0.8,
+                 idle_interval=2, max_horizon=0.2, enabled=True):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.slow_speed = slow_speed
+        self.fast_speed = fast_speed
+        self.idle_interval = idle_interval
+        self.max_horizon = max_horizon
+        self.enabled = enabled
+
+        self.interval = min_interval
+        self.frames_since_inference = None
+        self.speed = 0.0
+
+        # Últimas dos observaciones: (tiempo, [puntos (21, 3) por mano])
+        self.previous = None
+        self.latest = None
+        self.latest_results = None
+
+        # Métricas
+        self.inferred = 0
+        self.predicted = 0
+
+    def reset(self):
+        """Olvida las detecciones anteriores (p. ej. al reiniciar la cámara)"""
+        self.frames_since_inference = None
+        self.previous = None
+        self.latest = None
+        self.latest_results = None
+        self.interval = self.min_interval
+        self.speed = 0.0
+
+    def should_infer(self):
+        """Indica si el frame actual debe pasar por MediaPipe"""
+        if (not self.enabled or self.frames_since_inference is None
+                or self.frames_since_inference + 1 >= self.interval):
+            self.frames_since_inference = 0
+            self.inferred += 1
+            return True
+        self.frames_since_inference += 1
+        self.predicted += 1
+        return False
+
+    def observe(self, results, now=None):
+        """Registra el resultado de una inferencia y ajusta N según la velocidad"""
+        now = time.perf_counter() if now is None else now
+        hands = [landmarks_to_array(hand) for hand in (results.multi_hand_landmarks or [])]
+
+        self.previous = self.latest
+        self.latest = (now, hands)
+        self.latest_results = results
+
+        velocities = self._velocities()
+        if not hands:
+            self.speed = 0.0
+            self.interval = self.idle_interval
+        elif velocities is None:
+            # Mano recién aparecida: sin velocidad todavía, inferir el siguiente frame
+            self.speed = 0.0
+            self.interval = self.min_interval
+        else:
+            self.speed = max(float(np.linalg.norm(v[:, :2], axis=1).mean()) for v in velocities)
+            self.interval = self._interval_for(self.speed)
+
+    def predict(self, now=None):
+        """
+        Resultado equivalente al de hands.process() con landmarks extrapolados
+
+        Conserva multi_handedness de la última detección.
+        """
+        results = self.latest_results
+        if results is None or not results.multi_hand_landmarks:
+            return SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+
+        now = time.perf_counter() if now is None else now
+        t1, hands = self.latest
+        velocities = self._velocities()
+        dt = min(max(now - t1, 0.0), self.max_horizon)
+
+        landmark_lists = []
+        for i, (proto, points) in enumerate(zip(results.multi_hand_landmarks, hands)):
+            if velocities is not None:
+                points = points + velocities[i] * dt
+            landmark_lists.append(_to_landmark_list(proto, points))
+        return SimpleNamespace(multi_hand_landmarks=landmark_lists,
+                               multi_handedness=results.multi_handedness)
+
+    def _velocities(self):
+        """Velocidad de cada landmark entre las dos últimas detecciones, o None"""
+        if self.previous is None or self.latest is None:
+            return None
+        t0, before = self.previous
+        t1, after = self.latest
+        # Solo si las manos son las mismas en número (no hay correspondencia si no)
+        if t1 <= t0 or not after or len(before) != len(after):
+            return None
+        return [(b - a) / (t1 - t0) for a, b in zip(before, after)]
+
+    def _interval_for(self, speed):
+        if speed >= self.fast_speed:
+            # Movimiento rápido: inferir en cada frame para no perder la mano
+            return self.min_interval
+        if speed <= self.slow_speed:
+            return self.max_interval
+        frac = (speed - self.slow_speed) / (self.fast_speed - self.slow_speed)
+        return max(self.min_interval,
+                   round(self.max_interval - frac * (self.max_interval - self.min_interval)))
+
+    def metrics(self):
+        """Decisiones tomadas para reportes"""
+        total = self.inferred + self.predicted
+        return {
+            'enabled': self.enabled,
+            'interval': self.interval,
+            'speed': round(self.speed, 3),
+            'inferred': self.inferred,
+            'predicted': self.predicted,
+            'inference_ratio': round(self.inferred / total, 3) if total else 0.0,
+        }
+
+
+def _to_landmark_list(template, points):
+    """Crea un NormalizedLandmarkList del mismo tipo que template con los puntos dados"""
+    landmark_list = type(template)()
+    for x, y, z in points.tolist():
+        landmark_list.landmark.add(x=x, y=y, z=z)
+    return landmark_list
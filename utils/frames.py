@@ -0,0 +1,47 @@
+"""
+Preparación de frames sin copias
+El frame capturado se voltea en su propio buffer y la conversión a RGB para
+MediaPipe se escribe en un buffer reutilizado, así cada frame no reserva
+imágenes nuevas para el espejo y la conversión de color.
+"""
+
+import numpy as np
+
+from utils.startup import lazy_import
+
+# OpenCV se importa al primer uso, no al cargar la app
+cv2 = lazy_import('cv2')
+
+
+def mirror_in_place(frame):
+    """Aplica el efecto espejo sobre el mismo buffer del frame"""
+    return cv2.flip(frame, 1, dst=frame)
+
+
+class FramePreparer:
+    """
+    Prepara los frames de la cámara para la inferencia
+
+    El buffer RGB se reutiliza entre frames: solo es válido hasta la
+    siguiente llamada a prepare(), por eso se usa únicamente dentro de
+    hands.process() y nunca viaja por el pipeline. El frame BGR en espejo sí
+    pertenece al paquete de su frame y puede pasar a las etapas siguientes.
+    """
+
+    def __init__(self):
+        self.rgb = None
+
+    def prepare(self, frame, mirror=True):
+        """
+        Devuelve (frame_bgr, frame_rgb) listos para dibujar e inferir
+
+        frame_bgr es el mismo arreglo recibido, volteado en su lugar si
+        mirror es True; frame_rgb es el buffer reutilizado con la conversión
+        """
+        if mirror:
+            mirror_in_place(frame)
+
+        if self.rgb is None or self.rgb.shape != frame.shape:
+            self.rgb = np.empty_like(frame)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.rgb)
+        return frame, self.rgb
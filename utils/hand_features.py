@@ -0,0 +1,157 @@
+"""
+Extracción vectorizada de características de la mano
+Convierte los 21 landmarks de MediaPipe en un arreglo (21, 3) float32 y calcula
+en una sola pasada distancias, estados de los dedos y ángulos articulares.
+"""
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+FINGER_TIPS = [4, 8, 12, 16, 20]
+FINGER_PIPS = [3, 6, 10, 14, 18]
+FINGER_MCPS = [2, 5, 9, 13, 17]
+
+# Ternas (p1, vértice, p3) para los ángulos articulares: tres por dedo
+# (muñeca-base, base-medio, medio-punta) más la apertura pulgar-índice
+ANGLE_TRIPLES = [
+    (0, 1, 2), (1, 2, 3), (2, 3, 4),
+    (0, 5, 6), (5, 6, 7), (6, 7, 8),
+    (0, 9, 10), (9, 10, 11), (10, 11, 12),
+    (0, 13, 14), (13, 14, 15), (14, 15, 16),
+    (0, 17, 18), (17, 18, 19), (18, 19, 20),
+    (4, 2, 8),
+]
+ANGLE_INDEX = {triple: i for i, triple in enumerate(ANGLE_TRIPLES)}
+
+_TIPS = np.array(FINGER_TIPS)
+_MCPS = np.array(FINGER_MCPS)
+_ANGLE_P1, _ANGLE_P2, _ANGLE_P3 = (np.array(col) for col in zip(*ANGLE_TRIPLES))
+
+
+def landmarks_to_array(landmarks, out=None):
+    """Convierte los landmarks de MediaPipe en un arreglo (21, 3) float32"""
+    if isinstance(landmarks, np.ndarray):
+        points = landmarks.astype(np.float32, copy=False).reshape(NUM_LANDMARKS, 3)
+    else:
+        if hasattr(landmarks, 'landmark'):
+            landmarks = landmarks.landmark
+        coords = [c for p in landmarks for c in (p.x, p.y, p.z)]
+        points = np.array(coords, dtype=np.float32).reshape(NUM_LANDMARKS, 3)
+
+    if out is not None:
+        out[...] = points
+        return out
+    return points
+
+
+class HandFeatures:
+    """
+    Características de una mano, compartidas por los reconocedores
+
+    Las coordenadas se calculan al construir el objeto; distancias y ángulos
+    se calculan para todos los puntos en una sola operación vectorizada la
+    primera vez que se consultan y quedan en caché para el resto del frame.
+    """
+
+    __slots__ = ('points', 'xy', 'x', 'y',
+                 '_distances', '_angles', '_finger_angles')
+
+    def __init__(self, points):
+        self.points = points
+
+        # Coordenadas en float64 para que las distancias coincidan con el
+        # cálculo escalar original (los landmarks ya son float32 exactos)
+        self.xy = points[:, :2].astype(np.float64)
+
+        # Listas de floats de Python: el acceso escalar en las reglas es
+        # mucho más barato que indexar arreglos de NumPy
+        self.x, self.y = self.xy.T.tolist()
+
+        self._distances = None
+        self._angles = None
+        self._finger_angles = None
+
+    @property
+    def dist(self):
+        """Matriz (21, 21) de distancias euclidianas 2D entre todos los landmarks"""
+        if self._distances is None:
+            x = self.xy[:, 0]
+            y = self.xy[:, 1]
+            dx = x[:, None] - x
+            dy = y[:, None] - y
+            self._distances = np.sqrt(dx * dx + dy * dy)
+        return self._distances
+
+    @property
+    def angles(self):
+        """Ángulos articulares (grados) para cada terna de ANGLE_TRIPLES"""
+        if self._angles is None:
+            xy = self.xy
+            v1 = xy[_ANGLE_P1] - xy[_ANGLE_P2]
+            v2 = xy[_ANGLE_P3] - xy[_ANGLE_P2]
+            dot = v1[:, 0] * v2[:, 0] + v1[:, 1] * v2[:, 1]
+            norms = np.sqrt((v1 * v1).sum(axis=1)) * np.sqrt((v2 * v2).sum(axis=1))
+            cos_angle = np.clip(dot / (norms + 1e-6), -1.0, 1.0)
+            self._angles = np.degrees(np.arccos(cos_angle))
+        return self._angles
+
+    @property
+    def finger_angles(self):
+        """Orientación (radianes) de cada dedo, de la base a la punta"""
+        if self._finger_angles is None:
+            tip_mcp = self.xy[_TIPS] - self.xy[_MCPS]
+            self._finger_angles = np.arctan2(tip_mcp[:, 1], tip_mcp[:, 0]).tolist()
+        return self._finger_angles
+
+    def finger_states(self, margin=0.0, orientation=(9, 0)):
+        """
+        Determina qué dedos están extendidos [Pulgar, Índice, Medio, Anular, Meñique]
+
+        margin: cuánto debe sobresalir la punta sobre la articulación PIP
+        orientation: par de landmarks (a, b) que decide hacia dónde mira la
+        mano; si x[a] < x[b] el pulgar extendido queda a la izquierda del IP
+        """
+        x, y = self.x, self.y
+        a, b = orientation
+        if x[a] < x[b]:
+            thumb = x[4] < x[3]
+        else:
+            thumb = x[4] > x[3]
+        return [
+            thumb,
+            y[8] < y[6] - margin,
+            y[12] < y[10] - margin,
+            y[16] < y[14] - margin,
+            y[20] < y[18] - margin,
+        ]
+
+    def angle(self, p1, p2, p3):
+        """Ángulo (grados) en p2 formado por p1 y p3"""
+        idx = ANGLE_INDEX.get((p1, p2, p3))
+        if idx is not None:
+            return float(self.angles[idx])
+
+        x, y = self.x, self.y
+        v1 = np.array([x[p1] - x[p2], y[p1] - y[p2]])
+        v2 = np.array([x[p3] - x[p2], y[p3] - y[p2]])
+        cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-6)
+        return float(np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0))))
+
+
+def extract_features(landmarks):
+    """
+    Calcula las características de una mano a partir de sus landmarks
+
+    Acepta el NormalizedLandmarkList de MediaPipe, su lista `.landmark` o
+    un arreglo (21, 3)
+    """
+    return HandFeatures(landmarks_to_array(landmarks))
+
+
+def as_features(landmarks):
+    """Devuelve HandFeatures, calculándolas solo si aún no existen"""
+    if isinstance(landmarks, HandFeatures):
+        return landmarks
+    return extract_features(landmarks)
+
@@ -0,0 +1,223 @@
+"""
+Exportación masiva del historial
+Recorre un rango de fechas del SessionStore por lotes y escribe cada lote
+apenas se lee, así la memoria no depende del tamaño del historial. Formatos:
+
+  jsonl:    una sesión por línea (con letters anidadas si se piden)
+  csv:      una fila por sesión; las letras van a <nombre>_letras.csv
+  columnas: .npz comprimido por grupos de filas (como los row groups de
+            Parquet); cada columna de cada grupo es un .npy dentro del zip,
+            legible con np.load o read_columnar
+
+Con include_letters se agregan los tiempos (segundos desde el inicio) y las
+confianzas de cada letra confirmada. HistoryExporter corre la exportación en
+un hilo y avisa el progreso.
+"""
+
+import csv
+import json
+import os
+import threading
+import zipfile
+
+import numpy as np
+
+FORMATS = ('jsonl', 'csv', 'columnas')
+EXTENSIONS = {'jsonl': '.jsonl', 'csv': '.csv', 'columnas': '.npz'}
+
+SESSION_COLUMNS = ('id', 'start_time', 'end_time', 'text', 'letters_detected', 'accuracy', 'recovered')
+LETTER_COLUMNS = ('session_id', 't', 'letter', 'confidence')
+_DTYPES = {'id': np.int64, 'letters_detected': np.int32, 'accuracy': np.float32, 'recovered': np.bool_,
+           'session_id': np.int64, 't': np.float32, 'confidence': np.float32}
+
+
+def session_row(session):
+    return [session.get(column) for column in SESSION_COLUMNS]
+
+
+def letter_rows(session):
+    """[session_id, t, letra, confianza] por letra confirmada"""
+    return [[session.get('id'), t, letter, confidence]
+            for t, letter, confidence in session.get('letters') or []]
+
+
+class _JSONLWriter:
+    def __init__(self, path, include_letters):
+        self.file = open(path, 'w', encoding='utf-8')
+        self.include_letters = include_letters
+
+    def write(self, sessions):
+        for session in sessions:
+            if not self.include_letters:
+                session = {k: v for k, v in session.items() if k != 'letters'}
+            self.file.write(json.dumps(session, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class _CSVWriter:
+    def __init__(self, path, include_letters):
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(SESSION_COLUMNS)
+        self.letters_file = None
+        if include_letters:
+            self.letters_file = open(f"{os.path.splitext(path)[0]}_letras.csv", 'w', encoding='utf-8', newline='')
+            self.letters_writer = csv.writer(self.letters_file)
+            self.letters_writer.writerow(LETTER_COLUMNS)
+
+    def write(self, sessions):
+        self.writer.writerows(session_row(s) for s in sessions)
+        if self.letters_file:
+            for session in sessions:
+                self.letters_writer.writerows(letter_rows(session))
+
+    def close(self):
+        self.file.close()
+        if self.letters_file:
+            self.letters_file.close()
+
+
+class _ColumnarWriter:
+    """Un grupo de filas por lote: sesiones/gNNNNN/<columna>.npy y letras/gNNNNN/<columna>.npy"""
+
+    def __init__(self, path, include_letters):
+        self.zip = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED)
+        self.include_letters = include_letters
+        self.groups = 0
+
+    def _write_table(self, table, columns, rows):
+        for i, column in enumerate(columns):
+            values = [row[i] for row in rows]
+            dtype = _DTYPES.get(column)
+            if dtype is None:
+                array = np.array(['' if v is None else str(v) for v in values])
+            else:
+                array = np.array([0 if v is None else v for v in values], dtype)
+            # Cada columna se comprime y escribe sin pasar por un archivo temporal
+            with self.zip.open(f"{table}/g{self.groups:05d}/{column}.npy", 'w', force_zip64=True) as f:
+                np.save(f, array, allow_pickle=False)
+
+    def write(self, sessions):
+        if not sessions:
+            return
+        self._write_table('sesiones', SESSION_COLUMNS, [session_row(s) for s in sessions])
+        if self.include_letters:
+            rows = [row for s in sessions for row in letter_rows(s)]
+            self._write_table('letras', LETTER_COLUMNS, rows)
+        self.groups += 1
+
+    def close(self):
+        self.zip.close()
+
+
+_WRITERS = {'jsonl': _JSONLWriter, 'csv': _CSVWriter, 'columnas': _ColumnarWriter}
+
+
+def read_columnar(path, table='sesiones'):
+    """Une los grupos de filas de una tabla: {columna: arreglo}"""
+    columns = {}
+    with np.load(path, allow_pickle=False) as data:
+        for name in sorted(data.files):
+            prefix, _, column = name.split('/')
+            if prefix == table:
+                columns.setdefault(column, []).append(data[name])
+    return {column: np.concatenate(parts) for column, parts in columns.items()}
+
+
+def export_sessions(sessions, path, format='jsonl', include_letters=False, batch=500,
+                    progress=None, cancelled=None):
+    """
+    Escribe las sesiones (un iterable, p. ej. SessionStore.between) en path
+
+    progress(exportadas): después de cada lote; cancelled(): True para cortar
+    Devuelve la cantidad de sesiones exportadas.
+    """
+    if format not in _WRITERS:
+        raise ValueError(f"Formato desconocido: {format} (usar {', '.join(FORMATS)})")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    writer = _WRITERS[format](path, include_letters)
+    exported = 0
+    chunk = []
+    try:
+        for session in sessions:
+            chunk.append(session)
+            if len(chunk) == batch:
+                writer.write(chunk)
+                exported += len(chunk)
+                chunk = []
+                if progress:
+                    progress(exported)
+                if cancelled and cancelled():
+                    return exported
+        writer.write(chunk)
+        exported += len(chunk)
+        if progress:
+            progress(exported)
+    finally:
+        writer.close()
+    return exported
+
+
+class HistoryExporter:
+    """
+    Exportación en un hilo aparte
+
+    on_progress(exportadas, total) después de cada lote; on_done(ruta, exportadas, error)
+    al terminar. cancel() corta después del lote en curso.
+    """
+
+    def __init__(self, store, path, format='jsonl', start=None, end=None, include_letters=False,
+                 on_progress=None, on_done=None, batch=500):
+        self.store = store
+        self.path = path
+        self.format = format
+        self.start_time = start
+        self.end_time = end
+        self.include_letters = include_letters
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.batch = batch
+        self.total = 0
+        self.exported = 0
+        self.error = None
+        self.cancelled = threading.Event()
+        self.done = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    def _progress(self, exported):
+        self.exported = exported
+        if self.on_progress:
+            try:
+                self.on_progress(exported, self.total)
+            except Exception as e:
+                print(f"Error mostrando el progreso de exportación: {e}")
+
+    def _run(self):
+        try:
+            self.total = self.store.count(self.start_time, self.end_time)
+            self.exported = export_sessions(
+                self.store.between(self.start_time, self.end_time, self.batch), self.path,
+                self.format, self.include_letters, self.batch,
+                progress=self._progress, cancelled=self.cancelled.is_set)
+        except Exception as e:
+            print(f"Error exportando el historial: {e}")
+            self.error = e
+        self.done.set()
+        if self.on_done:
+            self.on_done(self.path, self.exported, self.error)
@@ -0,0 +1,140 @@
+"""
+Retención y compactación del historial en segundo plano
+Un hilo de baja prioridad recorre sign_language_history/ a pasos chicos
+(con pausas entre uno y otro, así nunca compite con la cámara):
+
+  1. Borra los session_*.json sueltos que ya están en la base.
+  2. Junta los translation_*.txt viejos en archive/traducciones_<AAAAMM>.zip.
+  3. Pasa las sesiones anteriores a archive_after_days a segmentos
+     comprimidos (siguen apareciendo en el historial).
+  4. Retención: borra los segmentos más viejos que max_age_days y, si el
+     archivo supera max_archive_mb, los más viejos hasta entrar.
+
+Cada paso es seguro ante un corte: se escribe lo nuevo antes de borrar lo viejo.
+"""
+
+import os
+import threading
+import zipfile
+from datetime import datetime, timedelta
+
+
+class HistoryMaintenance:
+    """
+    Tarea periódica sobre un SessionStore y su directorio
+
+    run_once(): una pasada completa (devuelve lo que hizo)
+    start() / stop(): la repite cada interval segundos en un hilo
+    """
+
+    def __init__(self, store, history_dir, archive_after_days=30, max_age_days=365, max_archive_mb=500,
+                 interval=3600, step=200, pause=0.05, start_delay=30):
+        self.store = store
+        self.history_dir = history_dir
+        self.archive_dir = os.path.join(history_dir, 'archive')
+        self.archive_after_days = archive_after_days
+        self.max_age_days = max_age_days
+        self.max_archive_mb = max_archive_mb
+        self.interval = interval
+        self.step = step
+        self.pause = pause
+        self.start_delay = start_delay
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self._loop, daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        """Corta después del paso en curso"""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
+
+    def _loop(self):
+        # Se espera un poco para no sumar trabajo al arranque de la app
+        if self.stopped.wait(self.start_delay):
+            return
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Error en el mantenimiento del historial: {e}")
+            if self.stopped.wait(self.interval):
+                return
+
+    def _yield(self):
+        """Pausa entre pasos; True si hay que cortar"""
+        return self.stopped.wait(self.pause)
+
+    def run_once(self, now=None):
+        """{'json_borrados', 'textos_archivados', 'sesiones_archivadas', 'sesiones_borradas', 'huerfanos'}"""
+        now = now or datetime.now()
+        report = {'json_borrados': 0, 'textos_archivados': 0, 'sesiones_archivadas': 0,
+                  'sesiones_borradas': 0, 'huerfanos': self.store.remove_orphan_segments()}
+        report['json_borrados'] = self.remove_imported_json()
+        report['textos_archivados'] = self.archive_translations(now - timedelta(days=self.archive_after_days))
+
+        cutoff = (now - timedelta(days=self.archive_after_days)).isoformat()
+        while not self.stopped.is_set():
+            archived = self.store.archive_before(cutoff, self.step)
+            report['sesiones_archivadas'] += archived
+            if archived < self.step or self._yield():
+                break
+
+        older_than = (now - timedelta(days=self.max_age_days)).isoformat() if self.max_age_days else None
+        max_bytes = int(self.max_archive_mb * 1024 * 1024) if self.max_archive_mb else None
+        if not self.stopped.is_set():
+            report['sesiones_borradas'] = self.store.drop_segments(older_than, max_bytes)
+            self.store.compact()
+        return report
+
+    def remove_imported_json(self):
+        """Borra los session_*.json que ya se importaron a la base"""
+        if not self.store.legacy_imported():
+            return 0
+        removed = 0
+        for filename in sorted(os.listdir(self.history_dir)):
+            if not (filename.startswith('session_') and filename.endswith('.json')):
+                continue
+            # Los que no se pudieron importar (p. ej. dañados) se dejan como están
+            if self.store.has_source(filename):
+                os.remove(os.path.join(self.history_dir, filename))
+                removed += 1
+                if removed % self.step == 0 and self._yield():
+                    break
+        return removed
+
+    def archive_translations(self, before):
+        """Mueve los translation_*.txt anteriores a before a un zip por mes"""
+        limit = before.timestamp()
+        by_month = {}
+        for filename in sorted(os.listdir(self.history_dir)):
+            if not (filename.startswith('translation_') and filename.endswith('.txt')):
+                continue
+            modified = os.path.getmtime(os.path.join(self.history_dir, filename))
+            if modified < limit:
+                by_month.setdefault(datetime.fromtimestamp(modified).strftime('%Y%m'), []).append(filename)
+        moved = 0
+        for month, filenames in sorted(by_month.items()):
+            os.makedirs(self.archive_dir, exist_ok=True)
+            for i in range(0, len(filenames), self.step):
+                with zipfile.ZipFile(os.path.join(self.archive_dir, f"traducciones_{month}.zip"), 'a',
+                                     compression=zipfile.ZIP_DEFLATED) as archive:
+                    present = set(archive.namelist())
+                    for filename in filenames[i:i + self.step]:
+                        # Si un corte dejó el archivo copiado pero sin borrar, no se duplica
+                        if filename not in present:
+                            archive.write(os.path.join(self.history_dir, filename), filename)
+                # Se borran recién con el zip cerrado (directorio central escrito)
+                for filename in filenames[i:i + self.step]:
+                    os.remove(os.path.join(self.history_dir, filename))
+                    moved += 1
+                if self._yield():
+                    return moved
+        return moved
@@ -0,0 +1,210 @@
+"""
+Codificación JPEG intercambiable y adaptativa
+Usa libjpeg-turbo (simplejpeg o PyTurboJPEG) cuando está instalado y OpenCV
+en caso contrario. El modo adaptativo baja la calidad y luego la resolución
+cuando el tiempo de codificación o el ancho de banda de salida superan su
+presupuesto, y las recupera poco a poco cuando vuelve a haber margen.
+"""
+
+import time
+
+try:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+except ImportError:
+    TurboJPEG = None
+
+from utils.startup import lazy_import
+
+# OpenCV se importa al primer uso, no al cargar la app
+cv2 = lazy_import('cv2')
+
+
+class OpenCVBackend:
+    """cv2.imencode: siempre disponible"""
+
+    name = 'opencv'
+
+    def encode(self, frame, quality):
+        ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, int(quality)])
+        return buffer.tobytes() if ok else None
+
+
+class SimpleJPEGBackend:
+    """simplejpeg: libjpeg-turbo empaquetado en la rueda de pip"""
+
+    name = 'simplejpeg'
+
+    def encode(self, frame, quality):
+        if not frame.flags['C_CONTIGUOUS']:
+            frame = frame.copy()
+        return simplejpeg.encode_jpeg(frame, quality=int(quality), colorspace='BGR',
+                                      colorsubsampling='420', fastdct=True)
+
+
+class TurboJPEGBackend:
+    """PyTurboJPEG: requiere la biblioteca libturbojpeg del sistema"""
+
+    name = 'turbojpeg'
+
+    def __init__(self):
+        self.jpeg = TurboJPEG()
+
+    def encode(self, frame, quality):
+        return self.jpeg.encode(frame, quality=int(quality), pixel_format=TJPF_BGR)
+
+
+def available_backends():
+    """Nombres de los backends que se pueden usar en este equipo"""
+    names = []
+    if simplejpeg is not None:
+        names.append('simplejpeg')
+    if TurboJPEG is not None:
+        try:
+            TurboJPEG()
+            names.append('turbojpeg')
+        except Exception:
+            # Módulo instalado pero sin libturbojpeg en el sistema
+            pass
+    names.append('opencv')
+    return names
+
+
+def create_backend(name=None):
+    """Crea el backend pedido o, sin nombre, el más rápido disponible"""
+    names = available_backends()
+    if name is None:
+        name = names[0]
+    if name not in names:
+        print(f"Backend JPEG '{name}' no disponible, usando {names[0]}")
+        name = names[0]
+    if name == 'simplejpeg':
+        return SimpleJPEGBackend()
+    if name == 'turbojpeg':
+        return TurboJPEGBackend()
+    return OpenCVBackend()
+
+
+class AdaptiveJPEGEncoder:
+    """
+    Codificador JPEG con calidad y escala ajustadas a un presupuesto
+
+    time_budget_ms: tiempo máximo de codificación por frame
+    bandwidth_budget: bytes/s de salida sumando todos los clientes (None sin límite)
+    adaptive: False fija la calidad y la resolución originales
+    """
+
+    def __init__(self, backend=None, quality=85, min_quality=50, min_scale=0.5,
+                 time_budget_ms=10.0, bandwidth_budget=None, adaptive=True,
+                 smoothing=0.2, cooldown=5, recover_after=30):
+        self.backend = backend if backend is not None else create_backend()
+        self.max_quality = quality
+        self.min_quality = min_quality
+        self.min_scale = min_scale
+        self.time_budget_ms = time_budget_ms
+        self.bandwidth_budget = bandwidth_budget
+        self.adaptive = adaptive
+        self.smoothing = smoothing
+        # Frames de espera tras un cambio (el promedio tarda en reflejarlo) y
+        # frames seguidos con margen antes de recuperar calidad
+        self.cooldown = cooldown
+        self.recover_after = recover_after
+
+        self.quality = quality
+        self.scale = 1.0
+        # Buffer reutilizado para el frame reducido; la salida JPEG sí es
+        # nueva en cada frame porque la retienen el flujo y la interfaz
+        self.resized = None
+
+        self.encode_ms = 0.0
+        self.frame_bytes = 0.0
+        self.fps = 0.0
+        self.last_time = None
+        self.frames = 0
+        self.wait_frames = 0
+        self.calm_frames = 0
+        self.quality_changes = 0
+        self.scale_changes = 0
+
+    def encode(self, frame, viewers=1):
+        """Codifica un frame BGR y devuelve los bytes JPEG (o None si falla)"""
+        t0 = time.perf_counter()
+        source = self._scaled(frame)
+        data = self.backend.encode(source, self.quality)
+        now = time.perf_counter()
+        if data is not None:
+            self._record(now - t0, len(data), now, max(viewers, 1))
+        return data
+
+    def _scaled(self, frame):
+        if self.scale >= 1.0:
+            return frame
+        height, width = frame.shape[:2]
+        size = (max(1, int(width * self.scale)), max(1, int(height * self.scale)))
+        if self.resized is not None and self.resized.shape[1::-1] != size:
+            self.resized = None
+        self.resized = cv2.resize(frame, size, dst=self.resized, interpolation=cv2.INTER_AREA)
+        return self.resized
+
+    def _record(self, seconds, size, now, viewers):
+        alpha = self.smoothing if self.frames else 1.0
+        self.frames += 1
+        self.encode_ms += alpha * (seconds * 1000 - self.encode_ms)
+        self.frame_bytes += alpha * (size - self.frame_bytes)
+        if self.last_time is not None and now > self.last_time:
+            self.fps += self.smoothing * (1.0 / (now - self.last_time) - self.fps)
+        self.last_time = now
+
+        if not self.adaptive:
+            return
+        if self.wait_frames > 0:
+            self.wait_frames -= 1
+            return
+        pressure = self.encode_ms / self.time_budget_ms
+        if self.bandwidth_budget and self.fps > 0:
+            bandwidth = self.frame_bytes * self.fps * viewers
+            pressure = max(pressure, bandwidth / self.bandwidth_budget)
+
+        if pressure > 1.0:
+            self.calm_frames = 0
+            # Primero calidad, después resolución
+            if self.quality > self.min_quality:
+                self.quality = max(self.min_quality, self.quality - 5)
+                self.quality_changes += 1
+                self.wait_frames = self.cooldown
+            elif self.scale > self.min_scale:
+                self.scale = max(self.min_scale, round(self.scale * 0.8, 3))
+                self.scale_changes += 1
+                self.wait_frames = self.cooldown
+        elif pressure < 0.6:
+            self.calm_frames += 1
+            if self.calm_frames < self.recover_after:
+                return
+            self.calm_frames = 0
+            # Con margen sostenido se recupera en orden inverso
+            if self.scale < 1.0:
+                self.scale = min(1.0, round(self.scale / 0.8, 3))
+                self.scale_changes += 1
+                self.wait_frames = self.cooldown
+            elif self.quality < self.max_quality:
+                self.quality = min(self.max_quality, self.quality + 5)
+                self.quality_changes += 1
+                self.wait_frames = self.cooldown
+        else:
+            self.calm_frames = 0
+
+    def metrics(self):
+        """Estado del codificador para reportes"""
+        return {
+            'backend': self.backend.name,
+            'quality': self.quality,
+            'scale': self.scale,
+            'encode_ms': round(self.encode_ms, 2),
+            'frame_kb': round(self.frame_bytes / 1024, 1),
+            'quality_changes': self.quality_changes,
+            'scale_changes': self.scale_changes,
+        }
@@ -0,0 +1,335 @@
+"""
+Clasificador aprendido sobre los 21 landmarks normalizados
+Red densa (MLP) entrenada con muestras grabadas; la inferencia son unas pocas
+multiplicaciones de matrices en NumPy sobre un lote, así ambas manos (o
+varios flujos) se clasifican en una sola llamada. Los pesos se guardan en un
+.npz compacto.
+"""
+
+import os
+
+import numpy as np
+
+from utils.hand_features import NUM_LANDMARKS, HandFeatures, landmarks_to_array
+
+NUM_FEATURES = NUM_LANDMARKS * 3
+
+# Etiqueta de las muestras grabadas sin seña
+NONE_LABEL = '-'
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'models', 'landmark_classifier.npz')
+
+
+def normalize_landmarks(points):
+    """
+    Convierte landmarks (21, 3) o un lote (N, 21, 3) en vectores (N, 63)
+
+    Origen en la muñeca y escala por el tamaño de la mano, así la posición y
+    la distancia a la cámara no cambian la entrada.
+    """
+    points = np.asarray(points, dtype=np.float32)
+    if points.ndim == 2:
+        points = points[None]
+    centered = points - points[:, :1, :]
+    scale = np.sqrt((centered[:, :, :2] ** 2).sum(axis=2)).max(axis=1)
+    centered /= np.maximum(scale, 1e-6)[:, None, None]
+    return centered.reshape(len(points), NUM_FEATURES)
+
+
+def as_points(hand):
+    """Arreglo (21, 3) a partir de HandFeatures, landmarks de MediaPipe o un arreglo"""
+    if isinstance(hand, HandFeatures):
+        return hand.points
+    return landmarks_to_array(hand)
+
+
+def softmax(logits):
+    logits = logits - logits.max(axis=1, keepdims=True)
+    np.exp(logits, out=logits)
+    logits /= logits.sum(axis=1, keepdims=True)
+    return logits
+
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+
+def _sigmoid(x):
+    np.negative(x, out=x)
+    np.exp(x, out=x)
+    x += 1
+    return np.reciprocal(x, out=x)
+
+
+# Activaciones soportadas por el runtime (nombres de Keras)
+ACTIVATIONS = {
+    'relu': _relu,
+    'linear': lambda x: x,
+    'tanh': lambda x: np.tanh(x, out=x),
+    'sigmoid': _sigmoid,
+    'softmax': softmax,
+}
+
+
+class LandmarkClassifier:
+    """
+    MLP con activación ReLU y salida softmax evaluado solo con NumPy
+
+    layers: lista de (W, b) en orden; labels: nombre de cada clase
+    mean / std: estandarización de la entrada (se incorpora a la primera capa)
+    activations: nombre de la activación de cada capa (por omisión ReLU en
+    las ocultas y softmax en la salida)
+    """
+
+    def __init__(self, layers, labels, mean=None, std=None, activations=None):
+        self.labels = np.asarray(labels)
+        self.layers = [(np.asarray(w, np.float32), np.asarray(b, np.float32)) for w, b in layers]
+        inputs = self.layers[0][0].shape[0]
+        self.mean = np.zeros(inputs, np.float32) if mean is None else np.asarray(mean, np.float32)
+        self.std = np.ones(inputs, np.float32) if std is None else np.asarray(std, np.float32)
+
+        if activations is None:
+            activations = ['relu'] * (len(self.layers) - 1) + ['softmax']
+        self.activations = [str(name) for name in activations]
+        unknown = set(self.activations) - set(ACTIVATIONS)
+        if unknown or len(self.activations) != len(self.layers):
+            raise ValueError(f"Activaciones no soportadas: {sorted(unknown) or self.activations}")
+        self.activation_funcs = [ACTIVATIONS[name] for name in self.activations]
+
+        # Estandarización plegada en la primera capa: ((x - m) / s) @ W + b
+        # equivale a x @ (W / s) + (b - (m / s) @ W), una operación menos por frame
+        w0, b0 = self.layers[0]
+        folded_w = (w0 / self.std[:, None]).astype(np.float32)
+        folded_b = (b0 - (self.mean / self.std) @ w0).astype(np.float32)
+        self.runtime_layers = [(folded_w, folded_b)] + self.layers[1:]
+
+    @property
+    def num_classes(self):
+        return len(self.labels)
+
+    def forward(self, x):
+        """Evalúa las capas sobre un lote de vectores de entrada (N, entradas)"""
+        for (w, b), activation in zip(self.runtime_layers, self.activation_funcs):
+            x = x @ w
+            x += b
+            x = activation(x)
+        return x
+
+    def predict_proba(self, points):
+        """Probabilidades (N, clases) para un lote de landmarks (N, 21, 3)"""
+        return self.forward(normalize_landmarks(points))
+
+    def predict(self, points):
+        """Devuelve (etiquetas, probabilidades) del lote"""
+        proba = self.predict_proba(points)
+        best = proba.argmax(axis=1)
+        return self.labels[best], proba[np.arange(len(best)), best]
+
+    def save(self, path):
+        """Guarda pesos, etiquetas y estandarización en un .npz"""
+        arrays = {'labels': self.labels.astype(str), 'mean': self.mean, 'std': self.std,
+                  'num_layers': np.array(len(self.layers)),
+                  'activations': np.array(self.activations)}
+        for i, (w, b) in enumerate(self.layers):
+            arrays[f'w{i}'] = w
+            arrays[f'b{i}'] = b
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Carga un clasificador guardado con save()"""
+        with np.load(path, allow_pickle=False) as data:
+            num_layers = int(data['num_layers'])
+            layers = [(data[f'w{i}'], data[f'b{i}']) for i in range(num_layers)]
+            activations = data['activations'].tolist() if 'activations' in data.files else None
+            return cls(layers, data['labels'], data['mean'], data['std'], activations)
+
+
+def load_classifier(path, num_threads=None):
+    """Carga un .npz con el runtime NumPy o un .tflite con el intérprete TFLite"""
+    if path.endswith('.tflite'):
+        from utils.tflite_runtime import TFLiteClassifier
+        return TFLiteClassifier(path, num_threads=num_threads)
+    return LandmarkClassifier.load(path)
+
+
+class LearnedRecognizer:
+    """
+    Adaptador con la misma interfaz que los reconocedores por reglas
+
+    min_confidence: probabilidad mínima (0-1) para aceptar una predicción
+    return_confidence: recognize_letter devuelve (letra, confianza %) como el
+    reconocedor de program.py en lugar de solo la letra
+    """
+
+    def __init__(self, classifier, min_confidence=0.6, return_confidence=False):
+        self.classifier = classifier
+        self.min_confidence = min_confidence
+        self.return_confidence = return_confidence
+
+    @classmethod
+    def load(cls, path, num_threads=None, **kwargs):
+        return cls(load_classifier(path, num_threads), **kwargs)
+
+    def recognize_batch(self, hands):
+        """Clasifica varias manos en una llamada; devuelve [(símbolo o None, confianza %)]"""
+        if not hands:
+            return []
+        points = np.stack([as_points(hand) for hand in hands])
+        labels, proba = self.classifier.predict(points)
+        return [
+            (str(label) if p >= self.min_confidence and label != NONE_LABEL else None, float(p) * 100)
+            for label, p in zip(labels, proba)
+        ]
+
+    def recognize_many(self, hands, method='recognize'):
+        """Lo mismo que recognize o recognize_letter para cada mano, con una sola pasada del modelo"""
+        results = self.recognize_batch(hands)
+        if method == 'recognize_letter' and self.return_confidence:
+            return [(symbol, confidence) if symbol else (None, 0) for symbol, confidence in results]
+        return [symbol for symbol, confidence in results]
+
+    def recognize(self, landmarks):
+        """Símbolo de una mano, o None si la confianza no alcanza"""
+        return self.recognize_many([landmarks])[0]
+
+    def recognize_letter(self, landmarks):
+        """Letra de una mano; con return_confidence, (letra, confianza %)"""
+        return self.recognize_many([landmarks], 'recognize_letter')[0]
+
+
+def recognize_hands(recognizer, method, hands):
+    """
+    Resultado de recognizer.<method>(mano) para cada mano del frame
+
+    El modelo clasifica todas las manos en una llamada (recognize_many); los
+    reconocedores por reglas las evalúan una por una.
+    """
+    if not hands:
+        return []
+    if hasattr(recognizer, 'recognize_many'):
+        return recognizer.recognize_many(hands, method)
+    recognize = getattr(recognizer, method)
+    return [recognize(hand) for hand in hands]
+
+
+def select_recognizer(rules, mode='reglas', model_path=DEFAULT_MODEL_PATH, **kwargs):
+    """
+    Devuelve el reconocedor elegido: 'reglas' (el de la app) o 'modelo'
+
+    Si el modelo no existe o no se puede cargar (o falta el runtime TFLite
+    para un .tflite) se usan las reglas.
+    """
+    if mode != 'modelo':
+        return rules
+    try:
+        return LearnedRecognizer.load(model_path, **kwargs)
+    except (OSError, KeyError, ValueError, ImportError) as e:
+        print(f"No se pudo cargar el modelo {model_path}: {e}. Se usan las reglas")
+        return rules
+
+
+def train_classifier(points, labels, hidden=(128, 64), epochs=200, batch_size=64,
+                     learning_rate=1e-3, l2=1e-4, val_split=0.15, patience=20,
+                     seed=0, verbose=True):
+    """
+    Entrena un LandmarkClassifier con Adam sobre muestras grabadas
+
+    points: (N, 21, 3) landmarks; labels: (N,) etiquetas
+    Devuelve (clasificador, historial) con el mejor modelo según validación.
+    """
+    rng = np.random.default_rng(seed)
+    x_all = normalize_landmarks(points)
+    labels = np.asarray(labels).astype(str)
+    classes, y_all = np.unique(labels, return_inverse=True)
+
+    order = rng.permutation(len(x_all))
+    n_val = int(len(order) * val_split) if len(order) >= 20 else 0
+    val_idx, train_idx = order[:n_val], order[n_val:]
+    x_train, y_train = x_all[train_idx], y_all[train_idx]
+    x_val, y_val = x_all[val_idx], y_all[val_idx]
+
+    mean = x_train.mean(axis=0)
+    std = x_train.std(axis=0) + 1e-6
+    x_train = (x_train - mean) / std
+    x_val = (x_val - mean) / std
+
+    sizes = [NUM_FEATURES, *hidden, len(classes)]
+    params = []
+    for fan_in, fan_out in zip(sizes[:-1], sizes[1:]):
+        # Inicialización He para ReLU
+        params.append(rng.normal(0, np.sqrt(2.0 / fan_in), (fan_in, fan_out)).astype(np.float32))
+        params.append(np.zeros(fan_out, np.float32))
+    moments = [np.zeros_like(p) for p in params]
+    velocities = [np.zeros_like(p) for p in params]
+    beta1, beta2, step = 0.9, 0.999, 0
+
+    def forward(x):
+        activations = [x]
+        for i in range(0, len(params), 2):
+            x = x @ params[i] + params[i + 1]
+            if i < len(params) - 2:
+                x = np.maximum(x, 0)
+            activations.append(x)
+        return activations
+
+    def accuracy(x, y):
+        if not len(x):
+            return float('nan')
+        return float((forward(x)[-1].argmax(axis=1) == y).mean())
+
+    history = []
+    best = (-1.0, None)
+    stale = 0
+    for epoch in range(epochs):
+        perm = rng.permutation(len(x_train))
+        loss_sum = 0.0
+        for start in range(0, len(perm), batch_size):
+            idx = perm[start:start + batch_size]
+            activations = forward(x_train[idx])
+            proba = softmax(activations[-1].copy())
+            loss_sum += float(-np.log(proba[np.arange(len(idx)), y_train[idx]] + 1e-9).sum())
+
+            grad = proba
+            grad[np.arange(len(idx)), y_train[idx]] -= 1
+            grad /= len(idx)
+            grads = [None] * len(params)
+            for layer in range(len(params) // 2 - 1, -1, -1):
+                w = params[2 * layer]
+                grads[2 * layer] = activations[layer].T @ grad + l2 * w
+                grads[2 * layer + 1] = grad.sum(axis=0)
+                if layer:
+                    grad = (grad @ w.T) * (activations[layer] > 0)
+
+            step += 1
+            for p, g, m, v in zip(params, grads, moments, velocities):
+                m *= beta1
+                m += (1 - beta1) * g
+                v *= beta2
+                v += (1 - beta2) * g * g
+                m_hat = m / (1 - beta1 ** step)
+                v_hat = v / (1 - beta2 ** step)
+                p -= (learning_rate * m_hat / (np.sqrt(v_hat) + 1e-8)).astype(np.float32)
+
+        train_acc = accuracy(x_train, y_train)
+        val_acc = accuracy(x_val, y_val) if n_val else train_acc
+        history.append({'epoch': epoch + 1, 'loss': loss_sum / len(x_train),
+                        'train_acc': train_acc, 'val_acc': val_acc})
+        if verbose and (epoch % 10 == 0 or epoch == epochs - 1):
+            print(f"Época {epoch + 1}: pérdida {loss_sum / len(x_train):.4f}, "
+                  f"entrenamiento {train_acc:.3f}, validación {val_acc:.3f}")
+
+        if val_acc > best[0]:
+            best = (val_acc, [p.copy() for p in params])
+            stale = 0
+        else:
+            stale += 1
+            if stale >= patience:
+                if verbose:
+                    print(f"Sin mejora en {patience} épocas, se detiene en la época {epoch + 1}")
+                break
+
+    best_params = best[1]
+    layers = [(best_params[i], best_params[i + 1]) for i in range(0, len(best_params), 2)]
+    return LandmarkClassifier(layers, classes, mean, std), history
@@ -0,0 +1,337 @@
+"""
+Grabación binaria de landmarks por frame y reproducción con mmap
+Cada frame guarda su tiempo, cuántas manos vio MediaPipe, la lateralidad y
+su puntaje, los 21 landmarks de cada mano (float16 o float32) y el símbolo
+reconocido. Los frames se agrupan en bloques columnares de ancho fijo (una
+columna contigua por campo) y al cerrar se agrega un índice de bloques al
+final del archivo. El lector mapea el archivo en memoria y devuelve vistas
+NumPy sobre cada bloque sin copiar; si falta el índice (la app se cerró de
+golpe) lo reconstruye recorriendo los bloques.
+
+Con dos manos en float16 son ~270 bytes por frame (~140 con una). Las apps
+graban solo si se pide con SIGNS_RECORD_LANDMARKS=1.
+
+Formato:
+  encabezado (16 bytes): b'SLMK', versión u16, bytes por coordenada u8, manos u8, reservado
+  bloques: b'BLK1', frames u32, columnas alineadas a 8 bytes (ver _block_layout)
+  índice: JSON con [offset, frames] por bloque + metadatos, largo u64 y b'SLMKEND1'
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_right
+from types import SimpleNamespace
+
+import numpy as np
+
+from utils.hand_features import NUM_LANDMARKS, landmarks_to_array
+
+MAGIC = b'SLMK'
+VERSION = 1
+_HEADER = struct.Struct('<4sHBB8x')
+_BLOCK = struct.Struct('<4sI')
+_BLOCK_MAGIC = b'BLK1'
+_FOOTER = struct.Struct('<Q8s')
+_FOOTER_MAGIC = b'SLMKEND1'
+
+# Lateralidad: índice en la columna handedness (-1 = sin mano en esa posición)
+HANDEDNESS = ('Left', 'Right')
+SYMBOL_WIDTH = 4
+
+_DTYPES = {2: np.float16, 4: np.float32}
+
+# Activa la grabación de landmarks en las apps
+RECORD_ENV = 'SIGNS_RECORD_LANDMARKS'
+
+
+def recording_requested():
+    return bool(os.environ.get(RECORD_ENV))
+
+
+def symbol_bytes(symbol):
+    """Símbolo en UTF-8 recortado a SYMBOL_WIDTH bytes sin partir un carácter (p. ej. 'Ñ')"""
+    return (symbol or '').encode('utf-8')[:SYMBOL_WIDTH].decode('utf-8', 'ignore').encode('utf-8')
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _block_layout(frames, max_hands, coord_dtype):
+    """Columnas de un bloque: [(nombre, dtype, forma, offset desde el inicio del bloque)]"""
+    columns = [
+        ('timestamp', np.float64, (frames,)),
+        ('num_hands', np.uint8, (frames,)),
+        ('handedness', np.int8, (frames, max_hands)),
+        ('score', np.float16, (frames, max_hands)),
+        ('landmarks', coord_dtype, (frames, max_hands, NUM_LANDMARKS, 3)),
+        ('symbol', f'S{SYMBOL_WIDTH}', (frames,)),
+    ]
+    layout = []
+    offset = _align(_BLOCK.size)
+    for name, dtype, shape in columns:
+        dtype = np.dtype(dtype)
+        layout.append((name, dtype, shape, offset))
+        offset = _align(offset + dtype.itemsize * int(np.prod(shape)))
+    return layout, offset
+
+
+def bytes_per_frame(max_hands=2, dtype='float16'):
+    """Bytes por frame en un bloque grande (sin contar encabezados)"""
+    _, size = _block_layout(1024, max_hands, np.dtype(dtype))
+    return size / 1024
+
+
+def _scan_blocks(f, start, end):
+    """Reconstruye el índice recorriendo los bloques; ignora un bloque final incompleto"""
+    f.seek(0)
+    _, _, coord_size, max_hands = _HEADER.unpack(f.read(_HEADER.size))
+    coord_dtype = _DTYPES[coord_size]
+    blocks = []
+    offset = start
+    while offset + _BLOCK.size <= end:
+        f.seek(offset)
+        magic, frames = _BLOCK.unpack(f.read(_BLOCK.size))
+        if magic != _BLOCK_MAGIC:
+            break
+        _, size = _block_layout(frames, max_hands, coord_dtype)
+        if offset + size > end:
+            break
+        blocks.append([offset, frames])
+        offset += size
+    return blocks, offset
+
+
+def _read_index(f):
+    """Devuelve (bloques, metadatos, fin de los datos); reconstruye si falta el índice"""
+    f.seek(0, os.SEEK_END)
+    end = f.tell()
+    if end >= _HEADER.size + _FOOTER.size:
+        f.seek(end - _FOOTER.size)
+        length, magic = _FOOTER.unpack(f.read(_FOOTER.size))
+        if magic == _FOOTER_MAGIC and length <= end - _HEADER.size - _FOOTER.size:
+            index_start = end - _FOOTER.size - length
+            f.seek(index_start)
+            try:
+                index = json.loads(f.read(length).decode('utf-8'))
+                return index['blocks'], index.get('meta', {}), index_start
+            except (ValueError, KeyError):
+                pass
+    blocks, data_end = _scan_blocks(f, _HEADER.size, end)
+    return blocks, {}, data_end
+
+
+class LandmarkRecorder:
+    """
+    Escribe frames en bloques de block_frames y el índice al cerrar
+
+    max_hands: manos por frame (las demás se descartan)
+    dtype: 'float16' (por omisión, ~1e-3 de error en coordenadas normalizadas) o 'float32'
+    append: continúa un archivo existente con el mismo formato
+    meta: diccionario JSON que se guarda en el índice (app, sesión, ...)
+
+    append, flush y close toman el mismo lock: el hilo de inferencia puede
+    seguir agregando frames mientras la interfaz cierra la grabación (los
+    frames que llegan después del cierre se descartan).
+    """
+
+    def __init__(self, path, max_hands=2, dtype='float16', block_frames=256, append=False, meta=None):
+        self.path = path
+        self.max_hands = max_hands
+        self.coord_dtype = np.dtype(dtype)
+        self.block_frames = block_frames
+        self.meta = dict(meta or {})
+        self.blocks = []
+        self.frames = 0
+        self.lock = threading.Lock()
+
+        if append and os.path.exists(path) and os.path.getsize(path) >= _HEADER.size:
+            self.file = open(path, 'r+b')
+            magic, _, coord_size, self.max_hands = _HEADER.unpack(self.file.read(_HEADER.size))
+            if magic != MAGIC:
+                self.file.close()
+                raise ValueError(f"{path} no es una grabación de landmarks")
+            self.coord_dtype = np.dtype(_DTYPES[coord_size])
+            self.blocks, old_meta, data_end = _read_index(self.file)
+            self.meta = {**old_meta, **self.meta}
+            self.frames = sum(n for _, n in self.blocks)
+            # El índice viejo se sobrescribe con los bloques nuevos
+            self.file.truncate(data_end)
+            self.file.seek(data_end)
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.file = open(path, 'wb')
+            self.file.write(_HEADER.pack(MAGIC, VERSION, self.coord_dtype.itemsize, self.max_hands))
+
+        layout, _ = _block_layout(block_frames, self.max_hands, self.coord_dtype)
+        self.buffers = {name: np.zeros(shape, dtype) for name, dtype, shape, _ in layout}
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, timestamp, hands=(), handedness=(), symbol=None, scores=()):
+        """
+        Agrega un frame
+
+        hands: landmarks por mano (de MediaPipe o arreglos (21, 3))
+        handedness: 'Left'/'Right' por mano; scores: puntaje de cada lateralidad
+        """
+        with self.lock:
+            if not self.file.closed:
+                self._append(timestamp, hands, handedness, symbol, scores)
+
+    def _append(self, timestamp, hands, handedness, symbol, scores):
+        i = self.count
+        b = self.buffers
+        b['timestamp'][i] = timestamp
+        b['handedness'][i] = -1
+        b['score'][i] = 0
+        n = 0
+        for n, hand in enumerate(hands[:self.max_hands], 1):
+            b['landmarks'][i, n - 1] = landmarks_to_array(hand)
+        b['num_hands'][i] = n
+        for j, label in enumerate(handedness[:n]):
+            b['handedness'][i, j] = HANDEDNESS.index(label) if label in HANDEDNESS else -1
+        for j, score in enumerate(scores[:n]):
+            b['score'][i, j] = score
+        b['symbol'][i] = symbol_bytes(symbol)
+
+        self.count += 1
+        self.frames += 1
+        if self.count == self.block_frames:
+            self._write_block()
+
+    def append_results(self, timestamp, results, symbol=None):
+        """Agrega un frame a partir del resultado de hands.process"""
+        hands = list(results.multi_hand_landmarks or [])
+        labels, scores = [], []
+        for handedness in (getattr(results, 'multi_handedness', None) or [])[:len(hands)]:
+            classification = handedness.classification[0]
+            labels.append(classification.label)
+            scores.append(classification.score)
+        self.append(timestamp, hands, labels, symbol, scores)
+
+    def _write_block(self):
+        n = self.count
+        if not n:
+            return
+        layout, size = _block_layout(n, self.max_hands, self.coord_dtype)
+        offset = self.file.tell()
+        block = bytearray(size)
+        _BLOCK.pack_into(block, 0, _BLOCK_MAGIC, n)
+        for name, dtype, shape, column_offset in layout:
+            data = self.buffers[name][:n]
+            block[column_offset:column_offset + data.nbytes] = data.tobytes()
+        self.file.write(block)
+        self.blocks.append([offset, n])
+        self.count = 0
+
+    def flush(self):
+        """Escribe los frames pendientes como un bloque (más corto) y vacía el buffer del archivo"""
+        with self.lock:
+            if self.file.closed:
+                return
+            self._write_block()
+            self.file.flush()
+
+    def close(self):
+        """Escribe lo pendiente y el índice; el archivo queda listo para LandmarkRecording"""
+        with self.lock:
+            if self.file.closed:
+                return
+            self._write_block()
+            index = json.dumps({'blocks': self.blocks, 'frames': self.frames,
+                                'meta': self.meta}).encode('utf-8')
+            self.file.write(index)
+            self.file.write(_FOOTER.pack(len(index), _FOOTER_MAGIC))
+            self.file.close()
+
+
+class LandmarkRecording:
+    """
+    Lectura con mmap: las columnas son vistas sobre el archivo, sin copias
+
+    blocks: lista de diccionarios columna -> arreglo, uno por bloque
+    column(nombre): la columna completa (copia solo si hay más de un bloque)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        magic, self.version, coord_size, self.max_hands = _HEADER.unpack(self.file.read(_HEADER.size))
+        if magic != MAGIC:
+            self.file.close()
+            raise ValueError(f"{path} no es una grabación de landmarks")
+        self.coord_dtype = np.dtype(_DTYPES[coord_size])
+        index, self.meta, _ = _read_index(self.file)
+
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.blocks = []
+        for offset, frames in index:
+            layout, _ = _block_layout(frames, self.max_hands, self.coord_dtype)
+            self.blocks.append({
+                name: np.frombuffer(self.mm, dtype, count=int(np.prod(shape)),
+                                    offset=offset + column_offset).reshape(shape)
+                for name, dtype, shape, column_offset in layout
+            })
+        self.starts = np.cumsum([0] + [len(b['timestamp']) for b in self.blocks]).tolist()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.starts[-1]
+
+    def close(self):
+        # Las vistas de los bloques apuntan al mmap: se sueltan antes de cerrarlo
+        self.blocks = []
+        try:
+            self.mm.close()
+        except BufferError:
+            # Quedan vistas vivas fuera del lector; el mmap se libera con ellas
+            pass
+        self.file.close()
+
+    def column(self, name):
+        """Columna completa; vista sin copia si la grabación tiene un solo bloque"""
+        parts = [block[name] for block in self.blocks]
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            layout, _ = _block_layout(0, self.max_hands, self.coord_dtype)
+            dtype, shape = next((d, s) for n, d, s, _ in layout if n == name)
+            return np.zeros(shape, dtype)
+        return np.concatenate(parts)
+
+    def frame(self, i):
+        """Frame i: tiempo, landmarks (manos, 21, 3) como vista, lateralidad y símbolo"""
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        k = bisect_right(self.starts, i) - 1
+        block, j = self.blocks[k], i - self.starts[k]
+        n = int(block['num_hands'][j])
+        return SimpleNamespace(
+            index=i,
+            timestamp=float(block['timestamp'][j]),
+            landmarks=block['landmarks'][j, :n],
+            handedness=[HANDEDNESS[h] if h >= 0 else None for h in block['handedness'][j, :n]],
+            scores=block['score'][j, :n],
+            symbol=block['symbol'][j].decode('utf-8') or None,
+        )
+
+    def replay(self):
+        """Recorre los frames en orden (para reconocedores, entrenamiento o depuración)"""
+        for i in range(len(self)):
+            yield self.frame(i)
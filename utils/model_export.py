@@ -0,0 +1,117 @@
+"""
+Exportación de modelos Keras al formato .npz del runtime NumPy y a TFLite
+La conversión a .npz solo recorre las capas del modelo ya construido (no
+importa TensorFlow), así el entrenamiento puede hacerse con Keras y las apps
+cargan los pesos con LandmarkClassifier sin arrastrar TensorFlow al proceso.
+La exportación a TFLite sí necesita TensorFlow y lo importa al llamarla.
+"""
+
+import numpy as np
+
+from utils.landmark_classifier import ACTIVATIONS, LandmarkClassifier
+
+# Capas que no hacen nada en inferencia
+_PASSTHROUGH_LAYERS = {'InputLayer', 'Dropout', 'GaussianNoise', 'GaussianDropout',
+                       'AlphaDropout', 'ActivityRegularization'}
+
+
+def _activation_name(layer):
+    activation = getattr(layer, 'activation', None)
+    if activation is None:
+        return 'linear'
+    name = getattr(activation, '__name__', str(activation))
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Activación no soportada en la capa {layer.name}: {name}")
+    return name
+
+
+def keras_to_classifier(model, labels, mean=None, std=None):
+    """
+    Convierte un modelo Keras secuencial de capas Dense en un LandmarkClassifier
+
+    Las capas Dropout y similares se omiten; una capa Activation separada se
+    aplica sobre la Dense anterior. Cualquier otra capa con pesos es un error.
+    """
+    layers, activations = [], []
+    for layer in model.layers:
+        kind = type(layer).__name__
+        if kind in _PASSTHROUGH_LAYERS:
+            continue
+        if kind == 'Activation':
+            if not layers or activations[-1] != 'linear':
+                raise ValueError(f"Activación {layer.name} sin una capa Dense lineal antes")
+            activations[-1] = _activation_name(layer)
+            continue
+        if kind != 'Dense':
+            raise ValueError(f"Capa no soportada por el runtime NumPy: {layer.name} ({kind})")
+
+        weights = layer.get_weights()
+        w = np.asarray(weights[0], np.float32)
+        b = np.asarray(weights[1], np.float32) if len(weights) > 1 else np.zeros(w.shape[1], np.float32)
+        layers.append((w, b))
+        activations.append(_activation_name(layer))
+
+    if not layers:
+        raise ValueError("El modelo no tiene capas Dense")
+    if len(labels) != layers[-1][0].shape[1]:
+        raise ValueError(f"{len(labels)} etiquetas para {layers[-1][0].shape[1]} salidas")
+    return LandmarkClassifier(layers, labels, mean, std, activations)
+
+
+def export_keras_model(model, path, labels, mean=None, std=None):
+    """Guarda un modelo Keras en el .npz que cargan las apps; devuelve el clasificador"""
+    classifier = keras_to_classifier(model, labels, mean, std)
+    classifier.save(path)
+    return classifier
+
+
+def classifier_to_keras(classifier):
+    """Reconstruye en Keras la red de un LandmarkClassifier (estandarización incluida en la primera capa)"""
+    from tensorflow import keras
+
+    inputs = classifier.runtime_layers[0][0].shape[0]
+    model = keras.Sequential([keras.Input(shape=(inputs,))])
+    for (w, b), activation in zip(classifier.runtime_layers, classifier.activations):
+        model.add(keras.layers.Dense(w.shape[1], activation=activation))
+        model.layers[-1].set_weights([w, b])
+    return model
+
+
+def export_tflite(model, path, quantization='fp32', calibration=None, max_calibration=500):
+    """
+    Convierte un modelo Keras a TFLite con cuantización post-entrenamiento
+
+    quantization: 'fp32', 'fp16' (pesos en float16) o 'int8' (pesos,
+    activaciones y entrada/salida enteras, calibradas con calibration)
+    calibration: lote de entradas ya preparadas (N, ...) tomadas de landmarks
+    grabados; obligatorio para int8
+    Devuelve el tamaño del archivo en bytes.
+    """
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if quantization == 'fp16':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantization == 'int8':
+        if calibration is None or not len(calibration):
+            raise ValueError("La cuantización int8 necesita un conjunto de calibración")
+        calibration = np.asarray(calibration, np.float32)
+        step = max(1, len(calibration) // max_calibration)
+
+        def representative_dataset():
+            for sample in calibration[::step]:
+                yield [sample[None]]
+
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+    elif quantization != 'fp32':
+        raise ValueError(f"Cuantización desconocida: {quantization}")
+
+    data = converter.convert()
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
@@ -0,0 +1,121 @@
+"""
+Control adaptativo del ritmo de frames
+Reemplaza el sleep fijo del bucle de cámara: espera solo lo que falta para el
+siguiente frame y, si la inferencia no entra en el presupuesto de CPU, baja la
+frecuencia de inferencia sin dejar de mostrar los frames.
+"""
+
+import threading
+import time
+
+
+class _InferenceSpan:
+    __slots__ = ('pacer', 't0')
+
+    def __init__(self, pacer):
+        self.pacer = pacer
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.pacer.record_inference(time.perf_counter() - self.t0)
+
+
+class FramePacer:
+    """
+    Marcapasos del bucle de cámara con inferencia adaptativa
+
+    target_fps: frecuencia objetivo de captura/visualización
+    min_inference_fps: frecuencia mínima de inferencia bajo presión de CPU
+    cpu_budget: fracción del intervalo de inferencia que puede ocupar MediaPipe
+    """
+
+    def __init__(self, target_fps=30.0, min_inference_fps=5.0, cpu_budget=0.5,
+                 smoothing=0.2):
+        self.target_fps = target_fps
+        self.period = 1.0 / target_fps
+        self.max_interval = 1.0 / min_inference_fps
+        self.cpu_budget = cpu_budget
+        self.smoothing = smoothing
+
+        self.inference_interval = self.period
+        self.inference_ms = 0.0
+        self.next_deadline = None
+        self.next_inference = 0.0
+        self.lock = threading.Lock()
+
+        # Métricas de las decisiones tomadas
+        self.frames = 0
+        self.late_frames = 0
+        self.sleep_ms = 0.0
+        self.inferred = 0
+        self.skipped = 0
+        self.rate_decreases = 0
+        self.rate_increases = 0
+
+    def wait(self):
+        """Espera hasta el siguiente frame descontando el tiempo ya trabajado"""
+        now = time.perf_counter()
+        self.frames += 1
+        if self.next_deadline is None:
+            self.next_deadline = now + self.period
+            return
+
+        delay = self.next_deadline - now
+        self.sleep_ms += self.smoothing * (max(delay, 0.0) * 1000 - self.sleep_ms)
+        if delay > 0:
+            time.sleep(delay)
+            self.next_deadline += self.period
+        else:
+            # Atrasados: no intentar recuperar frames perdidos
+            self.late_frames += 1
+            self.next_deadline = now + self.period
+
+    def should_infer(self):
+        """Indica si este frame debe pasar por la inferencia"""
+        now = time.perf_counter()
+        with self.lock:
+            # Tolerancia de medio periodo para no saltar frames por jitter
+            if now + self.period * 0.5 >= self.next_inference:
+                self.next_inference = now + self.inference_interval
+                return True
+            self.skipped += 1
+            return False
+
+    def measure(self):
+        """Bloque with que mide una inferencia real: with pacer.measure(): hands.process(rgb)"""
+        return _InferenceSpan(self)
+
+    def record_inference(self, seconds):
+        """Registra la duración de una inferencia y ajusta su frecuencia"""
+        with self.lock:
+            self.inferred += 1
+            alpha = self.smoothing if self.inferred > 1 else 1.0
+            self.inference_ms += alpha * (seconds * 1000 - self.inference_ms)
+
+            budget_ms = self.inference_interval * 1000 * self.cpu_budget
+            if self.inference_ms > budget_ms and self.inference_interval < self.max_interval:
+                # Presión de CPU: reducir la frecuencia de inferencia
+                self.inference_interval = min(self.max_interval, self.inference_interval * 1.25)
+                self.rate_decreases += 1
+            elif self.inference_ms < budget_ms * 0.5 and self.inference_interval > self.period:
+                # Hay margen: recuperar frecuencia poco a poco
+                self.inference_interval = max(self.period, self.inference_interval * 0.9)
+                self.rate_increases += 1
+
+    def metrics(self):
+        """Decisiones del marcapasos para reportes"""
+        with self.lock:
+            return {
+                'target_fps': self.target_fps,
+                'inference_fps': round(1.0 / self.inference_interval, 1),
+                'inference_ms': round(self.inference_ms, 2),
+                'sleep_ms': round(self.sleep_ms, 2),
+                'late_frames': self.late_frames,
+                'inferred': self.inferred,
+                'skipped': self.skipped,
+                'rate_decreases': self.rate_decreases,
+                'rate_increases': self.rate_increases,
+            }
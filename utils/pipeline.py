@@ -0,0 +1,271 @@
+"""
+Pipeline de video por etapas
+Captura, inferencia, codificación y render corren en hilos separados unidos
+por colas acotadas; cuando una etapa se atrasa se descarta el frame más viejo
+en lugar de acumular latencia.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class DropQueue:
+    """Cola acotada que descarta el elemento más viejo cuando está llena"""
+
+    def __init__(self, maxsize=1):
+        self.items = deque(maxlen=maxsize)
+        self.cond = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, item, keep=None):
+        """
+        Encola un elemento; devuelve True si se descartó uno
+
+        keep(viejo): con la cola llena, si devuelve True se descarta el
+        elemento nuevo en lugar del más viejo
+        """
+        with self.cond:
+            dropped = len(self.items) == self.items.maxlen
+            if dropped:
+                self.dropped += 1
+                if keep is not None and keep(self.items[0]):
+                    return True
+            self.items.append(item)
+            self.cond.notify()
+            return dropped
+
+    def get(self, timeout=0.1):
+        """Devuelve el siguiente elemento o None si no llegó ninguno a tiempo"""
+        with self.cond:
+            if not self.items and not self.closed:
+                self.cond.wait(timeout)
+            if self.items:
+                return self.items.popleft()
+            return None
+
+    def close(self):
+        """Despierta a los consumidores para que terminen"""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+class FramePacket:
+    """
+    Frame en tránsito por el pipeline con su marca de tiempo de captura
+
+    inferred: False si tomó la ruta directa (bypass) sin pasar por la inferencia
+    """
+
+    __slots__ = ('index', 't_capture', 'data', 'inferred')
+
+    def __init__(self, index, t_capture, data, inferred=True):
+        self.index = index
+        self.t_capture = t_capture
+        self.data = data
+        self.inferred = inferred
+
+
+class StageStats:
+    """Estadísticas de una etapa: FPS, tiempo de servicio y latencia desde la captura"""
+
+    def __init__(self, name, window=60, smoothing=0.1):
+        self.name = name
+        self.count = 0
+        self.errors = 0
+        self.service_ms = 0.0
+        self.latency_ms = 0.0
+        self.smoothing = smoothing
+        self.timestamps = deque(maxlen=window)
+        self.lock = threading.Lock()
+
+    def record(self, service_s, latency_s, now):
+        """Registra un frame procesado por la etapa"""
+        with self.lock:
+            alpha = self.smoothing if self.count else 1.0
+            self.service_ms += alpha * (service_s * 1000 - self.service_ms)
+            self.latency_ms += alpha * (latency_s * 1000 - self.latency_ms)
+            self.count += 1
+            self.timestamps.append(now)
+
+    @property
+    def fps(self):
+        with self.lock:
+            if len(self.timestamps) < 2:
+                return 0.0
+            span = self.timestamps[-1] - self.timestamps[0]
+            return (len(self.timestamps) - 1) / span if span > 0 else 0.0
+
+    def as_dict(self):
+        return {
+            'fps': round(self.fps, 1),
+            'service_ms': round(self.service_ms, 2),
+            'latency_ms': round(self.latency_ms, 2),
+            'frames': self.count,
+            'dropped': 0,
+            'errors': self.errors,
+        }
+
+
+class FramePipeline:
+    """
+    Pipeline captura -> etapas -> salida con un hilo por etapa
+
+    source: función sin argumentos que devuelve el siguiente frame o None
+    para terminar. stages: lista de (nombre, función); cada función recibe
+    el dato de la etapa anterior y devuelve el de la siguiente (None
+    descarta el frame).
+
+    pacer: FramePacer opcional que marca el ritmo de la captura y decide qué
+    frames pasan por la primera etapa (inferencia); los demás se transforman
+    con bypass y van directo a la segunda etapa, así se siguen mostrando
+    aunque la inferencia esté ocupada. La primera etapa informa al pacer solo
+    las llamadas reales a MediaPipe (with pacer.measure()): los frames que
+    resuelve sin inferir (extrapolados) no cuentan como carga. bypass corre
+    en el hilo de captura, así que lo que lea de la inferencia debe estar
+    protegido por un lock.
+    """
+
+    def __init__(self, source, stages, queue_size=1, report_interval=10.0,
+                 name="cámara", pacer=None, bypass=None):
+        self.source = source
+        self.pacer = pacer
+        self.bypass = bypass
+        self.stage_names = [stage_name for stage_name, _ in stages]
+        self.stage_funcs = [func for _, func in stages]
+        self.queues = [DropQueue(queue_size) for _ in stages]
+        self.capture_stats = StageStats('captura')
+        self.stats_by_stage = [StageStats(stage_name) for stage_name in self.stage_names]
+        self.report_interval = report_interval
+        self.name = name
+        self.running = False
+        self.threads = []
+        self.frame_index = 0
+
+    def start(self):
+        """Arranca los hilos de las etapas (la captura corre en run())"""
+        self.running = True
+        self.threads = [
+            threading.Thread(target=self._stage_loop, args=(i,), daemon=True,
+                             name=f"pipeline-{stage_name}")
+            for i, stage_name in enumerate(self.stage_names)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def run(self):
+        """Bucle de captura en el hilo actual; termina cuando source devuelve None"""
+        if not self.running:
+            self.start()
+        last_report = time.perf_counter()
+        try:
+            while self.running:
+                t0 = time.perf_counter()
+                try:
+                    frame = self.source()
+                except Exception as e:
+                    print(f"Error en captura: {e}")
+                    break
+                if frame is None:
+                    break
+
+                now = time.perf_counter()
+                self.capture_stats.record(now - t0, 0.0, now)
+                packet = FramePacket(self.frame_index, now, frame)
+                self.frame_index += 1
+                if self.pacer and self.bypass and len(self.queues) > 1 and not self.pacer.should_infer():
+                    packet.data = self.bypass(frame)
+                    packet.inferred = False
+                    # Un frame inferido que espera su turno vale más que uno directo
+                    self.queues[1].put(packet, keep=lambda waiting: waiting.inferred)
+                else:
+                    self.queues[0].put(packet)
+                if self.pacer:
+                    self.pacer.wait()
+
+                if self.report_interval and now - last_report >= self.report_interval:
+                    print(self.format_stats())
+                    last_report = now
+        finally:
+            self.stop()
+
+    def stop(self, timeout=1.0):
+        """Detiene todas las etapas y espera a que terminen"""
+        self.running = False
+        for q in self.queues:
+            q.close()
+        current = threading.current_thread()
+        for thread in self.threads:
+            if thread is not current:
+                thread.join(timeout)
+
+    def _stage_loop(self, i):
+        """Bucle de una etapa: toma de su cola, procesa y pasa a la siguiente"""
+        func = self.stage_funcs[i]
+        stats = self.stats_by_stage[i]
+        inbox = self.queues[i]
+        outbox = self.queues[i + 1] if i + 1 < len(self.queues) else None
+        # Último índice por ruta: un frame inferido llega siempre después de
+        # los directos más nuevos, y descartarlo dejaría sin anotaciones la salida
+        last_index = {True: -1, False: -1}
+
+        while self.running:
+            packet = inbox.get()
+            if packet is None:
+                continue
+            if packet.index < last_index[packet.inferred]:
+                # Llegó después de un frame más nuevo de su misma ruta: descartar
+                continue
+            last_index[packet.inferred] = packet.index
+
+            t0 = time.perf_counter()
+            try:
+                result = func(packet.data)
+            except Exception as e:
+                stats.errors += 1
+                print(f"Error en etapa {stats.name}: {e}")
+                continue
+            now = time.perf_counter()
+            stats.record(now - t0, now - packet.t_capture, now)
+
+            if result is None or outbox is None:
+                continue
+            packet.data = result
+            outbox.put(packet)
+
+    def stats(self):
+        """Estadísticas por etapa más el resumen extremo a extremo"""
+        stages = {'captura': self.capture_stats.as_dict()}
+        for stage, inbox in zip(self.stats_by_stage, self.queues):
+            stages[stage.name] = stage.as_dict()
+            # Frames viejos descartados a la entrada de la etapa
+            stages[stage.name]['dropped'] = inbox.dropped
+        last = self.stats_by_stage[-1] if self.stats_by_stage else self.capture_stats
+        stats = {
+            'stages': stages,
+            'fps': round(last.fps, 1),
+            'latency_ms': round(last.latency_ms, 2),
+        }
+        if self.pacer:
+            stats['pacing'] = self.pacer.metrics()
+        return stats
+
+    def format_stats(self):
+        """Resumen en una línea para el log"""
+        stats = self.stats()
+        parts = [
+            f"{name} {s['fps']:.0f}fps {s['service_ms']:.1f}ms "
+            f"(lat {s['latency_ms']:.0f}ms, desc {s['dropped']})"
+            for name, s in stats['stages'].items()
+        ]
+        if 'pacing' in stats:
+            pacing = stats['pacing']
+            parts.append(
+                f"ritmo {pacing['target_fps']:.0f}fps, inferencia {pacing['inference_fps']:.0f}fps "
+                f"({pacing['inference_ms']:.1f}ms, omitidos {pacing['skipped']}, "
+                f"atrasados {pacing['late_frames']})"
+            )
+        return (f"[{self.name}] {stats['fps']:.1f} FPS, latencia {stats['latency_ms']:.0f} ms | "
+                + " | ".join(parts))
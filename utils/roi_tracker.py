@@ -0,0 +1,143 @@
+"""
+Inferencia de MediaPipe recortada a la región de la mano
+Con la caja de las manos del frame anterior se recorta una región con margen
+y MediaPipe procesa solo ese recorte; los landmarks se devuelven en
+coordenadas del frame completo. Si la mano se pierde se vuelve a detectar en
+el frame completo.
+"""
+
+
+class ROIHandTracker:
+    """
+    Envoltura de mp.solutions.hands.Hands con recorte por región de interés
+
+    padding: margen alrededor de la caja de las manos (fracción de su lado)
+    min_size: lado mínimo del recorte (fracción del frame) para no perder la
+    mano en movimientos rápidos
+    max_area: si el recorte supera esta fracción del frame se usa el frame
+    completo (recortar no ahorraría nada)
+    redetect_interval: con menos manos de las configuradas, cada cuántos
+    frames se busca en el frame completo una mano nueva fuera del recorte
+    enabled: False procesa siempre el frame completo (comportamiento original)
+    """
+
+    def __init__(self, hands, max_num_hands=1, padding=0.35, min_size=0.3,
+                 max_area=0.6, redetect_interval=15, enabled=True):
+        self.hands = hands
+        self.max_num_hands = max_num_hands
+        self.padding = padding
+        self.min_size = min_size
+        self.max_area = max_area
+        self.redetect_interval = redetect_interval
+        self.enabled = enabled
+
+        # Recorte actual en píxeles (x0, y0, x1, y1) o None para frame completo
+        self.roi = None
+        self.last_results = None
+        self.frames_since_full = 0
+
+        # Métricas
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.fallbacks = 0
+
+    def reset(self):
+        """Olvida la región actual (p. ej. al reiniciar la cámara)"""
+        self.roi = None
+        self.last_results = None
+        self.frames_since_full = 0
+
+    def process(self, rgb_frame):
+        """Equivalente a hands.process(rgb_frame) con recorte cuando hay una mano previa"""
+        height, width = rgb_frame.shape[:2]
+        need_full = (
+            not self.enabled
+            or self.roi is None
+            or (self.frames_since_full >= self.redetect_interval
+                and self._count(self.last_results) < self.max_num_hands)
+        )
+
+        if not need_full:
+            x0, y0, x1, y1 = self.roi
+            results = self.hands.process(rgb_frame[y0:y1, x0:x1])
+            if results.multi_hand_landmarks:
+                self._to_frame_coords(results, self.roi, width, height)
+                self.roi_frames += 1
+                self.frames_since_full += 1
+                self._update_roi(results, width, height)
+                return results
+            # Mano perdida dentro del recorte: repetir en el frame completo
+            self.fallbacks += 1
+
+        results = self.hands.process(rgb_frame)
+        self.full_frames += 1
+        self.frames_since_full = 0
+        self._update_roi(results, width, height)
+        return results
+
+    def _update_roi(self, results, width, height):
+        self.last_results = results
+        if not self.enabled or not results.multi_hand_landmarks:
+            self.roi = None
+            return
+
+        xs = [p.x for hand in results.multi_hand_landmarks for p in hand.landmark]
+        ys = [p.y for hand in results.multi_hand_landmarks for p in hand.landmark]
+        bx0, bx1 = min(xs) * width, max(xs) * width
+        by0, by1 = min(ys) * height, max(ys) * height
+
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            margin_x = (bx1 - bx0) * self.padding * 0.5
+            margin_y = (by1 - by0) * self.padding * 0.5
+            if (bx0 - margin_x >= x0 and bx1 + margin_x <= x1
+                    and by0 - margin_y >= y0 and by1 + margin_y <= y1):
+                # La mano sigue bien dentro del recorte: no moverlo, así el
+                # seguimiento interno de MediaPipe conserva sus coordenadas
+                return
+
+        # Caja cuadrada centrada en las manos con margen
+        side = max(bx1 - bx0, by1 - by0) * (1 + 2 * self.padding)
+        side = max(side, self.min_size * min(width, height))
+        cx, cy = (bx0 + bx1) / 2, (by0 + by1) / 2
+        x0 = int(max(0, cx - side / 2))
+        y0 = int(max(0, cy - side / 2))
+        x1 = int(min(width, cx + side / 2))
+        y1 = int(min(height, cy + side / 2))
+
+        if (x1 - x0) * (y1 - y0) > self.max_area * width * height or x1 <= x0 or y1 <= y0:
+            self.roi = None
+        else:
+            self.roi = (x0, y0, x1, y1)
+
+    @staticmethod
+    def _to_frame_coords(results, roi, width, height):
+        """Convierte en su lugar los landmarks del recorte a coordenadas del frame"""
+        x0, y0, x1, y1 = roi
+        sx = (x1 - x0) / width
+        sy = (y1 - y0) / height
+        ox = x0 / width
+        oy = y0 / height
+        for hand in results.multi_hand_landmarks:
+            for p in hand.landmark:
+                p.x = p.x * sx + ox
+                p.y = p.y * sy + oy
+                # z usa la misma escala que x
+                p.z = p.z * sx
+
+    @staticmethod
+    def _count(results):
+        if results is None or not results.multi_hand_landmarks:
+            return 0
+        return len(results.multi_hand_landmarks)
+
+    def metrics(self):
+        """Uso del recorte para reportes"""
+        total = self.roi_frames + self.full_frames
+        return {
+            'enabled': self.enabled,
+            'roi_frames': self.roi_frames,
+            'full_frames': self.full_frames,
+            'fallbacks': self.fallbacks,
+            'roi_ratio': round(self.roi_frames / total, 3) if total else 0.0,
+        }
@@ -0,0 +1,107 @@
+"""
+Motor de reglas compilado en tabla de decisión
+Cada regla declara qué dedos deben estar extendidos o doblados; al compilar,
+las reglas se reparten en una tabla indexada por la máscara de 5 bits de los
+dedos, de modo que en cada frame solo se evalúan los candidatos posibles.
+"""
+
+NUM_MASKS = 32
+
+
+def finger_mask(states):
+    """Codifica [Pulgar, Índice, Medio, Anular, Meñique] como máscara de 5 bits (pulgar = bit 0)"""
+    mask = 0
+    for bit, extended in enumerate(states):
+        if extended:
+            mask |= 1 << bit
+    return mask
+
+
+def pattern_matches(pattern, mask):
+    """
+    Indica si una máscara cumple un patrón de dedos
+
+    El patrón tiene un carácter por dedo en el orden [Pulgar, Índice, Medio,
+    Anular, Meñique]: '1' extendido, '0' doblado y '.' indiferente.
+    """
+    for bit, required in enumerate(pattern):
+        extended = bool(mask & (1 << bit))
+        if required == '1' and not extended:
+            return False
+        if required == '0' and extended:
+            return False
+    return True
+
+
+class RuleTable:
+    """Tabla de decisión: máscara de dedos -> reglas candidatas en orden de prioridad"""
+
+    def __init__(self, rules=()):
+        self.rules = []
+        self.table = None
+        for rule in rules:
+            self.add(*rule)
+
+    def add(self, symbol, pattern, predicate=None):
+        """Agrega una regla; predicate(features) refina el patrón de dedos"""
+        if len(pattern) != 5 or set(pattern) - set('01.'):
+            raise ValueError(f"Patrón de dedos inválido: {pattern!r}")
+        self.rules.append((symbol, pattern, predicate))
+        self.table = None
+        return self
+
+    def extend(self, other):
+        """Agrega al final las reglas de otra tabla"""
+        for rule in other.rules:
+            self.add(*rule)
+        return self
+
+    def compile(self):
+        """Reparte las reglas por máscara conservando su orden de prioridad"""
+        table = []
+        for mask in range(NUM_MASKS):
+            candidates = []
+            for symbol, pattern, predicate in self.rules:
+                if not pattern_matches(pattern, mask):
+                    continue
+                candidates.append((symbol, predicate))
+                if predicate is None:
+                    # Regla incondicional: las siguientes nunca se alcanzan
+                    break
+            table.append(tuple(candidates))
+        self.table = tuple(table)
+        return self
+
+    def classify(self, states, features):
+        """Devuelve el primer símbolo cuyo predicado se cumple, o None"""
+        if self.table is None:
+            self.compile()
+        for symbol, predicate in self.table[finger_mask(states)]:
+            if predicate is None or predicate(features):
+                return symbol
+        return None
+
+    def classify_linear(self, states, features):
+        """Evalúa todas las reglas en orden, sin tabla (referencia para verificar)"""
+        mask = finger_mask(states)
+        for symbol, pattern, predicate in self.rules:
+            if pattern_matches(pattern, mask) and (predicate is None or predicate(features)):
+                return symbol
+        return None
+
+    def verify(self, samples, get_states):
+        """
+        Comprueba que la tabla compilada y la evaluación lineal coinciden
+
+        samples: características (o landmarks) grabados
+        get_states: función que obtiene los estados de los dedos de una muestra
+        Devuelve la lista de (índice, esperado, obtenido) que no coinciden.
+        """
+        mismatches = []
+        for i, features in enumerate(samples):
+            states = get_states(features)
+            expected = self.classify_linear(states, features)
+            got = self.classify(states, features)
+            if expected != got:
+                mismatches.append((i, expected, got))
+        return mismatches
@@ -0,0 +1,23 @@
+"""
+Archivos de muestras etiquetadas
+Landmarks (N, 21, 3) con su etiqueta en un .npz, usados para entrenar y
+evaluar los reconocedores sin cámara.
+"""
+
+import os
+
+import numpy as np
+
+
+def load_samples(path):
+    """Devuelve (puntos (N, 21, 3) float32, etiquetas (N,)) de un archivo de muestras"""
+    with np.load(path, allow_pickle=False) as data:
+        return data['points'].astype(np.float32), data['labels'].astype(str)
+
+
+def save_samples(path, points, labels):
+    """Guarda las muestras en un .npz comprimido, creando la carpeta si hace falta"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    np.savez_compressed(path, points=np.asarray(points, np.float32), labels=np.asarray(labels, str))
@@ -0,0 +1,142 @@
+"""
+Diario de la sesión en curso, a prueba de cortes
+Cada letra confirmada, palabra y actualización de estadísticas se agrega
+como una línea JSON a un archivo de solo-agregado. Quien registra solo
+encola el evento: un hilo escritor lo escribe y agrupa los fsync (a lo sumo
+uno cada fsync_interval segundos), así el disco nunca frena a la cámara.
+Si la app se cierra de golpe, replay_journal reconstruye la sesión en el
+próximo arranque; una última línea cortada a la mitad se ignora.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+_STOP = object()
+
+
+class SessionJournal:
+    """
+    Escritor en segundo plano de un diario .jsonl
+
+    record(evento, **datos): encola sin bloquear
+    close(remove): escribe lo pendiente, hace fsync y opcionalmente borra el archivo
+    """
+
+    def __init__(self, path, fsync_interval=0.5, max_batch=256):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.max_batch = max_batch
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, 'a', encoding='utf-8')
+        self.queue = queue.SimpleQueue()
+        self.events = 0
+        self.syncs = 0
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def record(self, event, **data):
+        if not self.closed:
+            self.queue.put({'t': time.time(), 'evento': event, **data})
+
+    def close(self, remove=False, timeout=2.0):
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(_STOP)
+        self.thread.join(timeout)
+        if remove:
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                print(f"No se pudo borrar el diario {self.path}: {e}")
+
+    def _next_batch(self, timeout):
+        try:
+            batch = [self.queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        unsynced = False
+        last_sync = time.monotonic()
+        while True:
+            # Con datos sin fsync se espera solo hasta que toque el próximo
+            timeout = max(0.0, last_sync + self.fsync_interval - time.monotonic()) if unsynced else None
+            batch = self._next_batch(timeout)
+            stop = any(item is _STOP for item in batch)
+            lines = [json.dumps(item, ensure_ascii=False) + "\n" for item in batch if item is not _STOP]
+            try:
+                if lines:
+                    self.file.writelines(lines)
+                    self.file.flush()
+                    self.events += len(lines)
+                    unsynced = True
+                if unsynced and (stop or time.monotonic() - last_sync >= self.fsync_interval):
+                    os.fsync(self.file.fileno())
+                    self.syncs += 1
+                    unsynced = False
+                    last_sync = time.monotonic()
+            except OSError as e:
+                print(f"Error escribiendo el diario de la sesión: {e}")
+            if stop:
+                self.file.close()
+                return
+
+
+def replay_journal(path):
+    """
+    Reconstruye la sesión de un diario; None si no tiene eventos
+
+    Eventos: inicio, letra, espacio, borrar, estadisticas, grabacion.
+    """
+    session = None
+    first_time = last_time = None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # Última línea a medio escribir al momento del corte
+                    break
+                kind = event.get('evento')
+                last_time = event.get('t', last_time)
+                if session is None:
+                    first_time = event.get('t', 0)
+                    session = {'start_time': datetime.fromtimestamp(first_time).isoformat(),
+                               'letters_detected': 0, 'text': '', 'accuracy': 0.0, 'letters': []}
+                if kind == 'inicio':
+                    session['start_time'] = event.get('start_time', session['start_time'])
+                elif kind == 'letra':
+                    session['text'] += event.get('letra', '')
+                    session['letters'].append([round(last_time - first_time, 3), event.get('letra', ''),
+                                               event.get('confianza')])
+                elif kind == 'espacio':
+                    session['text'] += ' '
+                elif kind == 'borrar':
+                    session.update(text='', letters_detected=0, accuracy=0.0, letters=[])
+                elif kind == 'estadisticas':
+                    session['letters_detected'] = event.get('letras', session['letters_detected'])
+                    session['accuracy'] = event.get('precision', session['accuracy'])
+                elif kind == 'grabacion':
+                    session['recording'] = event.get('ruta')
+    except OSError as e:
+        print(f"No se pudo leer el diario {path}: {e}")
+        return None
+    if session is not None:
+        session['end_time'] = datetime.fromtimestamp(last_time).isoformat() if last_time else None
+        session['recovered'] = True
+    return session
@@ -0,0 +1,359 @@
+"""
+Historial de sesiones indexado (SQLite en modo WAL)
+Cada sesión es una fila con sus campos principales en columnas y el
+diccionario completo en JSON. El índice por fecha de inicio permite pedir
+páginas ordenadas por tiempo con paginación por cursor (la última fecha
+vista), así abrir el historial cuesta lo mismo con 10 que con 100 000
+sesiones. Los session_*.json de versiones anteriores se importan una vez.
+
+Las sesiones viejas se archivan en segmentos comprimidos (archive/*.jsonl.gz,
+cientos de sesiones por archivo); en la base queda solo su fila de índice
+(id, fecha, segmento, posición), así que page, between y get las siguen
+devolviendo junto con las activas.
+"""
+
+import gzip
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    start_time TEXT NOT NULL,
+    end_time TEXT,
+    text TEXT,
+    letters INTEGER,
+    accuracy REAL,
+    source TEXT UNIQUE,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_start ON sessions (start_time DESC, id DESC);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    first_start TEXT NOT NULL,
+    last_start TEXT NOT NULL,
+    sessions INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS archived (
+    id INTEGER PRIMARY KEY,
+    start_time TEXT NOT NULL,
+    segment INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS archived_by_start ON archived (start_time DESC, id DESC);
+CREATE INDEX IF NOT EXISTS archived_by_segment ON archived (segment);
+"""
+
+# Sesiones activas y archivadas con las mismas columnas: (id, inicio, datos, segmento, posición)
+_LIVE = 'SELECT id, start_time, data, NULL, NULL FROM sessions'
+_ARCHIVED = 'SELECT id, start_time, NULL, segment, position FROM archived'
+
+# Marca en la tabla meta: los JSON sueltos ya se importaron
+_LEGACY_IMPORTED = 'json_importados'
+# Mayor id que existió (los segmentos borrados por retención no liberan ids)
+_LAST_ID = 'ultimo_id'
+
+# Siguiente id: mayor entre activas, archivadas y las ya borradas
+_NEXT_ID = ('(SELECT COALESCE(MAX(id), 0) + 1 FROM ('
+            'SELECT MAX(id) AS id FROM sessions UNION ALL SELECT MAX(id) FROM archived '
+            f"UNION ALL SELECT CAST(value AS INTEGER) FROM meta WHERE key = '{_LAST_ID}'))")
+
+
+class SessionStore:
+    """
+    Sesiones en una base SQLite compartida entre hilos
+
+    add(session): guarda un diccionario (necesita 'start_time' ISO 8601)
+    page(limit, before): sesiones más recientes primero; before es el cursor
+    devuelto por la página anterior
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Una conexión para toda la app; el lock serializa su uso entre hilos
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock:
+            # Solo tiene efecto en una base nueva: permite devolver espacio con compact()
+            self.conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            # WAL: las lecturas del historial no esperan a las escrituras
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.executescript(_SCHEMA)
+            columns = {row[1] for row in self.conn.execute('PRAGMA table_info(archived)')}
+            if 'source' not in columns:
+                self.conn.execute('ALTER TABLE archived ADD COLUMN source TEXT')
+            self.conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS archived_by_source ON archived (source) '
+                              'WHERE source IS NOT NULL')
+            self.conn.commit()
+        self.archive_dir = os.path.join(directory or '.', 'archive')
+        # Últimos segmentos descomprimidos (una página suele caer en uno o dos)
+        self.segment_cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def add(self, session, source=None):
+        """Guarda una sesión y devuelve su id; con source repetido no se duplica"""
+        with self.lock, self.conn:
+            # Una sesión ya archivada con el mismo source tampoco se duplica
+            if source is not None and self.conn.execute(
+                    'SELECT 1 FROM archived WHERE source = ?', (source,)).fetchone():
+                return None
+            # Archivar o borrar segmentos nunca libera ids
+            cursor = self.conn.execute(
+                'INSERT OR IGNORE INTO sessions (id, start_time, end_time, text, letters, accuracy, source, data) '
+                f'VALUES ({_NEXT_ID}, ?, ?, ?, ?, ?, ?, ?)',
+                (session.get('start_time', ''), session.get('end_time'), session.get('text'),
+                 session.get('letters_detected'), session.get('accuracy'), source,
+                 json.dumps(session, ensure_ascii=False)),
+            )
+            return cursor.lastrowid if cursor.rowcount else None
+
+    def count(self, start=None, end=None):
+        """Sesiones (activas y archivadas) con start <= inicio < end (sin límites: todas)"""
+        total = 0
+        for table in ('sessions', 'archived'):
+            query, params = self._range(f'SELECT COUNT(*) FROM {table}', start, end)
+            with self.lock:
+                total += self.conn.execute(query, params).fetchone()[0]
+        return total
+
+    def get(self, session_id):
+        with self.lock:
+            row = self.conn.execute(f'{_LIVE} WHERE id = ? UNION ALL {_ARCHIVED} WHERE id = ?',
+                                    (session_id, session_id)).fetchone()
+        return self._decode(row) if row else None
+
+    def page(self, limit=20, before=None):
+        """
+        (sesiones, cursor): hasta limit sesiones anteriores al cursor, más recientes primero
+
+        El cursor es None cuando no quedan más. Recorre el índice desde la
+        posición del cursor: no depende de cuántas sesiones haya.
+        """
+        where, params = '', ()
+        if before is not None:
+            where = ' WHERE (start_time, id) < (?, ?)'
+            params = tuple(before)
+        query = f'{_LIVE}{where} UNION ALL {_ARCHIVED}{where} ORDER BY start_time DESC, id DESC LIMIT ?'
+        with self.lock:
+            rows = self.conn.execute(query, params + params + (limit + 1,)).fetchall()
+        more = len(rows) > limit
+        rows = rows[:limit]
+        cursor = (rows[-1][1], rows[-1][0]) if more else None
+        # Las archivadas cuyo segmento borró la retención mientras tanto se saltean
+        sessions = [session for session in map(self._decode, rows) if session is not None]
+        return sessions, cursor
+
+    def between(self, start=None, end=None, batch=500):
+        """
+        Recorre en orden cronológico las sesiones con start <= inicio < end
+
+        Lee de a batch filas por el índice: la memoria no depende del rango.
+        """
+        last = None
+        while True:
+            parts, params = [], ()
+            for select in (_LIVE, _ARCHIVED):
+                query, part_params = self._range(select, start, end)
+                if last is not None:
+                    query += ' AND (start_time, id) > (?, ?)'
+                    part_params += last
+                parts.append(query)
+                params += part_params
+            query = ' UNION ALL '.join(parts) + ' ORDER BY start_time, id LIMIT ?'
+            with self.lock:
+                rows = self.conn.execute(query, params + (batch,)).fetchall()
+            for row in rows:
+                session = self._decode(row)
+                if session is not None:
+                    yield session
+            if len(rows) < batch:
+                return
+            last = (rows[-1][1], rows[-1][0])
+
+    @staticmethod
+    def _range(query, start, end):
+        """Agrega el filtro de fechas (ISO 8601, se comparan como texto)"""
+        query += ' WHERE 1'
+        params = ()
+        if start is not None:
+            query += ' AND start_time >= ?'
+            params += (start,)
+        if end is not None:
+            query += ' AND start_time < ?'
+            params += (end,)
+        return query, params
+
+    def has_source(self, source):
+        with self.lock:
+            return self.conn.execute('SELECT 1 FROM sessions WHERE source = ? UNION ALL '
+                                     'SELECT 1 FROM archived WHERE source = ?', (source, source)).fetchone() is not None
+
+    def legacy_imported(self):
+        with self.lock:
+            return self.conn.execute('SELECT 1 FROM meta WHERE key = ?', (_LEGACY_IMPORTED,)).fetchone() is not None
+
+    def import_json_dir(self, directory, prefix='session_'):
+        """Importa (una sola vez) los session_*.json sueltos; devuelve cuántos se agregaron"""
+        if self.legacy_imported() or not os.path.isdir(directory):
+            return 0
+        added = 0
+        for filename in sorted(os.listdir(directory)):
+            if not (filename.startswith(prefix) and filename.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                    session = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"No se pudo importar {filename}: {e}")
+                continue
+            if self.add(session, source=filename) is not None:
+                added += 1
+        with self.lock, self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (_LEGACY_IMPORTED, '1'))
+        return added
+
+    def archive_before(self, cutoff, max_sessions=500):
+        """
+        Pasa a un segmento comprimido hasta max_sessions sesiones activas anteriores a cutoff
+
+        Primero se escribe el segmento completo (con fsync) y recién después
+        se mueven las filas en una sola transacción: un corte en el medio deja
+        a lo sumo un archivo huérfano que borra remove_orphan_segments.
+        Devuelve cuántas sesiones se archivaron.
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT id, start_time, data, source FROM sessions WHERE start_time < ? '
+                'ORDER BY start_time, id LIMIT ?', (cutoff, max_sessions)).fetchall()
+        if not rows:
+            return 0
+        os.makedirs(self.archive_dir, exist_ok=True)
+        name = f"segment_{rows[0][1][:10]}_{rows[0][0]}.jsonl.gz"
+        path = os.path.join(self.archive_dir, name)
+        with open(f"{path}.tmp", 'wb') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6) as f:
+                for _, _, data, _ in rows:
+                    f.write(data.encode('utf-8') + b"\n")
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(f"{path}.tmp", path)
+
+        with self.lock, self.conn:
+            segment = self.conn.execute(
+                'INSERT INTO segments (path, first_start, last_start, sessions, bytes) VALUES (?, ?, ?, ?, ?)',
+                (name, rows[0][1], rows[-1][1], len(rows), os.path.getsize(path))).lastrowid
+            self.conn.executemany(
+                'INSERT INTO archived (id, start_time, segment, position, source) VALUES (?, ?, ?, ?, ?)',
+                [(row[0], row[1], segment, i, row[3]) for i, row in enumerate(rows)])
+            self.conn.executemany('DELETE FROM sessions WHERE id = ?', [(row[0],) for row in rows])
+        return len(rows)
+
+    def drop_segments(self, older_than=None, max_bytes=None):
+        """
+        Retención: borra los segmentos más viejos que older_than y, si el
+        archivo supera max_bytes, los más viejos hasta entrar. Devuelve las
+        sesiones borradas.
+        """
+        with self.lock:
+            segments = self.conn.execute(
+                'SELECT id, path, last_start, bytes, sessions FROM segments ORDER BY last_start, id').fetchall()
+        total_bytes = sum(s[3] for s in segments)
+        dropped = 0
+        for segment, name, last_start, size, sessions in segments:
+            too_old = older_than is not None and last_start < older_than
+            too_big = max_bytes is not None and total_bytes > max_bytes
+            if not (too_old or too_big):
+                break
+            with self.lock, self.conn:
+                self.conn.execute(f'INSERT OR REPLACE INTO meta (key, value) SELECT ?, {_NEXT_ID} - 1', (_LAST_ID,))
+                self.conn.execute('DELETE FROM archived WHERE segment = ?', (segment,))
+                self.conn.execute('DELETE FROM segments WHERE id = ?', (segment,))
+                with self.cache_lock:
+                    self.segment_cache.pop(segment, None)
+            # Un lector que ya tenía la fila puede no encontrar el archivo: lo saltea
+            try:
+                os.remove(os.path.join(self.archive_dir, name))
+            except OSError as e:
+                print(f"No se pudo borrar el segmento {name}: {e}")
+            total_bytes -= size
+            dropped += sessions
+        return dropped
+
+    def remove_orphan_segments(self):
+        """Borra segmentos que no llegaron a registrarse (corte durante archive_before)"""
+        if not os.path.isdir(self.archive_dir):
+            return 0
+        with self.lock:
+            known = {row[0] for row in self.conn.execute('SELECT path FROM segments')}
+        removed = 0
+        for name in os.listdir(self.archive_dir):
+            if name.startswith('segment_') and name not in known:
+                os.remove(os.path.join(self.archive_dir, name))
+                removed += 1
+        return removed
+
+    def compact(self, pages=256):
+        """Devuelve al sistema hasta pages páginas libres (bases creadas con auto_vacuum incremental)"""
+        with self.lock:
+            self.conn.execute(f'PRAGMA incremental_vacuum({int(pages)})').fetchall()
+
+    def archive_stats(self):
+        """{'sessions', 'archived', 'segments', 'archive_bytes'}"""
+        with self.lock:
+            live = self.conn.execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+            archived, segments, size = self.conn.execute(
+                'SELECT COALESCE(SUM(sessions), 0), COUNT(*), COALESCE(SUM(bytes), 0) FROM segments').fetchone()
+        return {'sessions': live, 'archived': archived, 'segments': segments, 'archive_bytes': size}
+
+    def _segment_lines(self, segment):
+        """Líneas del segmento; None si drop_segments lo borró después de leer el índice"""
+        with self.cache_lock:
+            lines = self.segment_cache.get(segment)
+            if lines is not None:
+                self.segment_cache.move_to_end(segment)
+                return lines
+        query = 'SELECT path FROM segments WHERE id = ?'
+        with self.lock:
+            row = self.conn.execute(query, (segment,)).fetchone()
+        if row is None:
+            return None
+        try:
+            with gzip.open(os.path.join(self.archive_dir, row[0]), 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return None
+        with self.lock:
+            # Si se borró durante la lectura no se guarda (el id del segmento puede reusarse)
+            if self.conn.execute(query, (segment,)).fetchone() == row:
+                with self.cache_lock:
+                    self.segment_cache[segment] = lines
+                    while len(self.segment_cache) > 4:
+                        self.segment_cache.popitem(last=False)
+        return lines
+
+    def _decode(self, row):
+        """Sesión de una fila de _LIVE/_ARCHIVED; None si su segmento ya no existe"""
+        session_id, _, data, segment, position = row
+        if data is None:
+            lines = self._segment_lines(segment)
+            if lines is None:
+                return None
+            data = lines[position]
+        session = json.loads(data)
+        session['id'] = session_id
+        return session
@@ -0,0 +1,291 @@
+"""
+Reglas de main.py para utils/rule_table.RuleTable
+Cada regla es (símbolo, patrón de dedos, predicado) con el patrón en el
+orden [Pulgar, Índice, Medio, Anular, Meñique] ('1' extendido, '0' doblado,
+'.' indiferente) y en orden de prioridad. Los predicados reciben un
+HandFeatures y refinan el patrón con distancias y posiciones.
+"""
+
+from utils.hand_features import as_features
+from utils.rule_table import RuleTable
+
+
+def finger_states(landmarks):
+    """Dedos extendidos: pulgar según la orientación de la mano (17 vs 5), resto con margen vertical de 0.02"""
+    return as_features(landmarks).finger_states(margin=0.02, orientation=(17, 5))
+
+
+# --- Números ---
+
+def number_0(f):
+    # 0 - Círculo con pulgar e índice (OK sign)
+    return f.dist[4, 8] < 0.06
+
+
+def number_2(f):
+    # 2 - Índice y medio extendidos (forma de V), dedos separados
+    return f.dist[8, 12] > 0.08
+
+
+def number_3(f):
+    # 3 - Pulgar, índice y medio extendidos
+    return f.dist[8, 12] > 0.08
+
+
+def number_9(f):
+    # 9 - Todos extendidos menos el pulgar
+    d = f.dist
+    return d[8, 12] < 0.06 and d[12, 16] < 0.06
+
+
+def number_10(f):
+    # 10 - Puño cerrado con pulgar extendido hacia arriba
+    return f.y[4] < f.y[2] - 0.05
+
+
+def number_11(f):
+    # 11 - Índice y pulgar extendidos (forma de pistola)
+    return f.dist[4, 8] > 0.15
+
+
+def number_12(f):
+    # 12 - Índice, medio y pulgar formando un 3
+    return f.dist[8, 12] < 0.06
+
+
+def number_13(f):
+    # 13 - Similar a 12 pero dedos más juntos
+    d = f.dist
+    return d[8, 12] < 0.06 and d[12, 16] < 0.06
+
+
+def number_14(f):
+    # 14 - Cuatro dedos juntos sin pulgar
+    d = f.dist
+    return d[8, 12] < 0.06 and d[12, 16] < 0.06 and d[16, 20] < 0.06
+
+
+def number_15(f):
+    # 15 - Todos los dedos extendidos y juntos
+    d = f.dist
+    return d[8, 12] < 0.06 and d[12, 16] < 0.06 and d[16, 20] < 0.06
+
+
+# --- Letras ---
+
+def letter_A(f):
+    # A - Puño cerrado con pulgar al costado
+    return f.y[4] > f.y[6]
+
+
+def letter_B(f):
+    # B - Mano abierta, dedos juntos, pulgar doblado hacia dentro
+    x, d = f.x, f.dist
+    fingers_together = (
+        d[8, 12] < 0.05 and
+        d[12, 16] < 0.05 and
+        d[16, 20] < 0.05
+    )
+    thumb_folded = x[4] > x[5] - 0.05 and x[4] < x[17] + 0.05
+    return fingers_together and thumb_folded
+
+
+def letter_C(f):
+    # C - Mano en forma de C: dedos curvados
+    x = f.x
+    return x[8] < x[5] and x[12] < x[9] and 0.1 < f.dist[4, 8] < 0.25
+
+
+def letter_D(f):
+    # D - Índice arriba, resto forma un círculo con el pulgar
+    return f.dist[4, 12] < 0.08 and f.y[8] < f.y[6]
+
+
+def letter_E(f):
+    # E - Todos los dedos realmente doblados
+    y = f.y
+    return (
+        y[8] > y[6] and
+        y[12] > y[10] and
+        y[16] > y[14] and
+        y[20] > y[18]
+    )
+
+
+def letter_F(f):
+    # F - OK sign: pulgar e índice se tocan
+    return f.dist[4, 8] < 0.06
+
+
+def letter_G(f):
+    # G - Índice y pulgar horizontales apuntando
+    x, y = f.x, f.y
+    horizontal = abs(y[4] - y[8]) < 0.08
+    perpendicular = abs(x[4] - x[8]) > 0.15
+    return horizontal and perpendicular
+
+
+def letter_H(f):
+    # H - Índice y medio horizontales juntos
+    x, y = f.x, f.y
+    horizontal = abs(y[8] - y[12]) < 0.05
+    together = f.dist[8, 12] < 0.08
+    pointing_side = abs(x[8] - x[6]) > 0.1
+    return horizontal and together and pointing_side
+
+
+def letter_I(f):
+    # I - Meñique arriba, resto cerrado
+    # (J sería I con movimiento; solo se detecta la posición base)
+    return f.y[20] < f.y[18]
+
+
+def letter_K(f):
+    # K - Índice y medio en V, pulgar entre índice y medio
+    y = f.y
+    return f.dist[8, 12] > 0.1 and y[4] > y[8] and y[4] < y[6]
+
+
+def letter_L(f):
+    # L - Índice y pulgar a aproximadamente 90 grados
+    return 70 < f.angle(4, 2, 8) < 110
+
+
+def letter_M(f):
+    # M - Tres dedos sobre el pulgar
+    x, y = f.x, f.y
+    return y[4] > y[6] and x[4] > x[5] - 0.03 and x[4] < x[9] + 0.03
+
+
+def letter_N(f):
+    # N - Dos dedos sobre el pulgar, anular y meñique extendidos
+    x, y = f.x, f.y
+    return y[4] > y[6] and x[4] > x[5] - 0.03 and x[4] < x[9] + 0.03
+
+
+def letter_O(f):
+    # O - Todos los dedos formando O
+    d = f.dist
+    return d[4, 8] < 0.08 and d[4, 12] < 0.12 and f.x[8] < f.x[5]
+
+
+def letter_P(f):
+    # P - Como K pero apuntando hacia abajo
+    return f.y[8] > f.y[6] and f.dist[8, 12] > 0.08
+
+
+def letter_Q(f):
+    # Q - Similar a G pero apuntando hacia abajo
+    return f.y[8] > f.y[0] and f.dist[4, 8] > 0.1
+
+
+def letter_R(f):
+    # R - Índice y medio cruzados
+    x, y = f.x, f.y
+    return abs(x[8] - x[12]) < 0.04 and abs(y[8] - y[12]) < 0.04
+
+
+def letter_S(f):
+    # S - Puño con pulgar sobre los dedos
+    x = f.x
+    return f.y[4] < f.y[6] and x[4] > x[5] and x[4] < x[17]
+
+
+def letter_T(f):
+    # T - Pulgar entre índice y medio
+    x, y = f.x, f.y
+    return (
+        y[4] > y[5] and
+        y[4] < y[9] and
+        x[4] > x[6] - 0.03 and
+        x[4] < x[6] + 0.03
+    )
+
+
+def letter_U(f):
+    # U - Índice y medio juntos arriba
+    return f.dist[8, 12] < 0.05 and f.y[8] < f.y[6]
+
+
+def letter_V(f):
+    # V - Índice y medio en V separados
+    y = f.y
+    return f.dist[8, 12] > 0.08 and y[8] < y[6] and y[12] < y[10]
+
+
+def letter_W(f):
+    # W - Tres dedos arriba separados
+    d = f.dist
+    return d[8, 12] > 0.06 and d[12, 16] > 0.06
+
+
+def letter_X(f):
+    # X - Índice doblado formando gancho
+    y = f.y
+    return y[8] > y[7] and y[8] < y[6]
+
+
+def letter_Y(f):
+    # Y - Pulgar y meñique extendidos y separados
+    # (Z sería D con movimiento; requeriría tracking)
+    return f.dist[4, 20] > 0.2
+
+
+NUMBER_RULES = [
+    ('0', '00111', number_0),
+    ('1', '01000'),
+    ('2', '01100', number_2),
+    ('3', '11100', number_3),
+    ('4', '01111'),
+    ('5', '11111'),
+    ('6', '10001'),
+    ('7', '11100'),
+    ('8', '11110'),
+    ('9', '01111', number_9),
+    ('10', '10000', number_10),
+    ('11', '11000', number_11),
+    ('12', '11100', number_12),
+    ('13', '11110', number_13),
+    ('14', '01111', number_14),
+    ('15', '11111', number_15),
+]
+
+LETTER_RULES = [
+    ('A', '10000', letter_A),
+    ('B', '01111', letter_B),
+    ('C', '.0000', letter_C),
+    ('D', '.1000', letter_D),
+    ('E', '00000', letter_E),
+    ('F', '..111', letter_F),
+    ('G', '11000', letter_G),
+    ('H', '01100', letter_H),
+    ('I', '00001', letter_I),
+    ('K', '11100', letter_K),
+    ('L', '11000', letter_L),
+    ('M', '0000.', letter_M),
+    ('N', '00011', letter_N),
+    ('O', '.0000', letter_O),
+    ('P', '11100', letter_P),
+    ('Q', '11000', letter_Q),
+    ('R', '01100', letter_R),
+    ('S', '.0000', letter_S),
+    ('T', '.0000', letter_T),
+    ('U', '01100', letter_U),
+    ('V', '01100', letter_V),
+    ('W', '01110', letter_W),
+    ('X', '0.000', letter_X),
+    ('Y', '10001', letter_Y),
+]
+
+
+def number_table():
+    return RuleTable(NUMBER_RULES).compile()
+
+
+def letter_table():
+    return RuleTable(LETTER_RULES).compile()
+
+
+def combined_table():
+    """Primero números y luego letras, igual que recognize()"""
+    return RuleTable(NUMBER_RULES + LETTER_RULES).compile()
@@ -0,0 +1,143 @@
+"""
+Votación de estabilidad incremental
+Mantiene un histograma de los símbolos dentro de la ventana que se actualiza
+al entrar y salir cada voto, así decidir si un símbolo es estable cuesta lo
+mismo sin importar el largo de la ventana. La ventana puede medirse en
+frames (comportamiento original) o en segundos (independiente de los FPS).
+"""
+
+import time
+from collections import deque
+
+_EPSILON = 1e-9
+
+
+class StabilityVoter:
+    """
+    Ventana de votos con histograma acumulado
+
+    Modo frames (window_s=None): la ventana guarda los últimos maxlen votos y
+    threshold es una cantidad de frames, igual que el deque original.
+    Modo tiempo (window_s en segundos): cada voto pesa el tiempo transcurrido
+    desde el frame anterior (como máximo max_step) y threshold está en
+    segundos. El primer voto después de reset pesa el último intervalo
+    medido, así la latencia de confirmación es la misma a 5 o a 30 FPS.
+    max_step (por defecto la mitad de la ventana) tiene que cubrir el mayor
+    intervalo entre inferencias: con FramePacer en su piso de 5 FPS son 0.2 s.
+
+    hysteresis: peso extra que necesita un símbolo distinto al último
+    confirmado mientras ese último siga presente en la ventana
+    """
+
+    def __init__(self, threshold=5, maxlen=10, window_s=None, hysteresis=0.0, max_step=None):
+        self.threshold = threshold
+        self.maxlen = maxlen
+        self.window_s = window_s
+        self.hysteresis = hysteresis
+        if max_step is None and window_s is not None:
+            max_step = window_s / 2
+        self.max_step = max_step
+        # Último intervalo entre frames: peso del primer voto tras un reset
+        self.last_step = 0.0
+
+        self.votes = deque()
+        self.counts = {}
+        self.committed = None
+        self.last_time = None
+
+    @classmethod
+    def timed(cls, window_s, threshold_s, hysteresis_s=0.0, max_step=None):
+        """Votador con ventana y umbral en segundos"""
+        return cls(threshold=threshold_s, maxlen=None, window_s=window_s,
+                   hysteresis=hysteresis_s, max_step=max_step)
+
+    def __len__(self):
+        return len(self.votes)
+
+    def reset(self):
+        """Vacía la ventana y olvida el último símbolo confirmado"""
+        self.votes.clear()
+        self.counts.clear()
+        self.committed = None
+        self.last_time = None
+
+    def push(self, symbol, now=None):
+        """
+        Agrega un voto y devuelve el símbolo si quedó estable y es distinto
+        del último confirmado; None en otro caso
+        """
+        weight = self._advance(now)
+        self.votes.append((self.last_time, symbol, weight))
+        self.counts[symbol] = self.counts.get(symbol, 0) + weight
+        if self.window_s is None and len(self.votes) > self.maxlen:
+            self._pop()
+
+        # Solo el símbolo que acaba de sumar puede haber cruzado el umbral
+        if symbol == self.committed or not self.is_stable(symbol):
+            return None
+        return symbol
+
+    def miss(self, now=None):
+        """
+        Registra un frame sin detección; devuelve True si la ventana quedó vacía
+
+        Con la ventana vacía se olvida el último símbolo confirmado, así la
+        misma seña puede volver a confirmarse después de bajar la mano.
+        """
+        if self.window_s is None:
+            if self.votes:
+                self._pop()
+        else:
+            self._advance(now)
+        if not self.votes:
+            self.committed = None
+            return True
+        return False
+
+    def commit(self, symbol):
+        """Marca el símbolo como confirmado (no se repite hasta que cambie o se vacíe la ventana)"""
+        self.committed = symbol
+
+    def weight(self, symbol):
+        """Votos (o segundos) acumulados por el símbolo dentro de la ventana"""
+        return self.counts.get(symbol, 0)
+
+    def is_stable(self, symbol):
+        """Indica si el símbolo alcanza el umbral, con histéresis frente al último confirmado"""
+        required = self.threshold
+        if self.hysteresis and self.committed is not None and symbol != self.committed \
+                and self.counts.get(self.committed, 0) > _EPSILON:
+            required += self.hysteresis
+        return self.counts.get(symbol, 0) >= required - _EPSILON
+
+    def leader(self):
+        """Símbolo con más peso en la ventana (recorre solo los símbolos distintos)"""
+        if not self.counts:
+            return None
+        return max(self.counts, key=self.counts.get)
+
+    def _advance(self, now):
+        """Avanza el reloj, descarta votos vencidos y devuelve el peso del voto actual"""
+        if self.window_s is None:
+            self.last_time = None
+            return 1
+
+        now = time.perf_counter() if now is None else now
+        if self.last_time is None:
+            weight = self.last_step
+        else:
+            weight = min(max(now - self.last_time, 0.0), self.max_step)
+            self.last_step = weight
+        self.last_time = now
+        limit = now - self.window_s
+        while self.votes and self.votes[0][0] <= limit:
+            self._pop()
+        return weight
+
+    def _pop(self):
+        _, symbol, weight = self.votes.popleft()
+        remaining = self.counts[symbol] - weight
+        if remaining > _EPSILON:
+            self.counts[symbol] = remaining
+        else:
+            del self.counts[symbol]
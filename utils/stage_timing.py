@@ -0,0 +1,175 @@
+"""
+Tiempo por etapa de cada frame
+Mide captura, preparación (espejo y RGB), MediaPipe, reconocimiento, dibujo,
+codificación y render, y mantiene los percentiles p50/p95/p99 de las últimas
+N mediciones de cada etapa. Medir cuesta ~2 µs por etapa, así que siempre
+está activo. Opcionalmente los percentiles se dibujan sobre el video y se
+escriben cada cierto tiempo en un JSON (lo primero que mirar cuando un
+equipo reporta lentitud).
+
+SIGNS_STAGE_TIMING=ruta.json activa el volcado periódico y
+SIGNS_STAGE_OVERLAY=1 el texto sobre el video.
+"""
+
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from utils.startup import lazy_import
+
+cv2 = lazy_import('cv2')
+
+# Archivo JSON donde se vuelcan los percentiles (vacío = sin volcado)
+DUMP_ENV = 'SIGNS_STAGE_TIMING'
+# Dibuja los percentiles sobre el video
+OVERLAY_ENV = 'SIGNS_STAGE_OVERLAY'
+
+PERCENTILES = (50, 95, 99)
+
+
+class RollingPercentiles:
+    """Últimas window mediciones (ms) en un buffer circular"""
+
+    def __init__(self, window=300):
+        # Lista de Python: asignar un float es más barato que en un arreglo NumPy
+        self.values = [0.0] * window
+        self.index = 0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def add(self, ms):
+        with self.lock:
+            self.values[self.index] = ms
+            self.index = (self.index + 1) % len(self.values)
+            self.count += 1
+
+    def summary(self):
+        """{'p50', 'p95', 'p99', 'max', 'count'} en ms, o None sin mediciones"""
+        with self.lock:
+            filled = np.array(self.values[:min(self.count, len(self.values))])
+            count = self.count
+        if not len(filled):
+            return None
+        result = {f'p{p}': round(float(v), 3)
+                  for p, v in zip(PERCENTILES, np.percentile(filled, PERCENTILES))}
+        result['max'] = round(float(filled.max()), 3)
+        result['count'] = count
+        return result
+
+
+class _Span:
+    """Bloque with que suma su duración a una etapa"""
+
+    __slots__ = ('stats', 't0')
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add((time.perf_counter() - self.t0) * 1000)
+
+
+class StageTimer:
+    """
+    Percentiles por etapa, con volcado a JSON y texto para el video
+
+    Uso: with timer.stage('mediapipe'): results = hands.process(rgb)
+    o timer.add('render', segundos) cuando el tiempo ya está medido.
+    Cada etapa se mide por llamada (con dos manos, el dibujo cuenta dos veces).
+    """
+
+    def __init__(self, app_name='', window=300, dump_path=None, dump_interval=5.0, overlay=None):
+        self.app_name = app_name
+        self.window = window
+        self.stages = {}
+        self.lock = threading.Lock()
+        self.dump_path = dump_path if dump_path is not None else os.environ.get(DUMP_ENV)
+        self.dump_interval = dump_interval
+        self.overlay = overlay if overlay is not None else bool(os.environ.get(OVERLAY_ENV))
+        self.overlay_lines = []
+        self.overlay_updated = 0.0
+        self.dump_thread = None
+        self.stopped = threading.Event()
+
+    def _stats(self, name):
+        stats = self.stages.get(name)
+        if stats is None:
+            with self.lock:
+                stats = self.stages.setdefault(name, RollingPercentiles(self.window))
+        return stats
+
+    def stage(self, name):
+        return _Span(self._stats(name))
+
+    def add(self, name, seconds):
+        self._stats(name).add(seconds * 1000)
+
+    def snapshot(self):
+        """{etapa: {'p50', 'p95', 'p99', 'max', 'count'}} en el orden en que aparecieron"""
+        with self.lock:
+            stages = list(self.stages.items())
+        summaries = {name: stats.summary() for name, stats in stages}
+        return {name: summary for name, summary in summaries.items() if summary}
+
+    def format_lines(self):
+        return [f"{name:<14} p50 {s['p50']:5.1f}  p95 {s['p95']:5.1f}  p99 {s['p99']:5.1f} ms"
+                for name, s in self.snapshot().items()]
+
+    def draw_overlay(self, frame, interval=0.5):
+        """Dibuja los percentiles sobre el frame (BGR); el texto se recalcula cada interval s"""
+        if not self.overlay:
+            return frame
+        now = time.perf_counter()
+        if now - self.overlay_updated >= interval:
+            self.overlay_lines = self.format_lines()
+            self.overlay_updated = now
+        height = frame.shape[0]
+        y0 = height - 10 - 18 * (len(self.overlay_lines) - 1)
+        for i, line in enumerate(self.overlay_lines):
+            y = y0 + 18 * i
+            # Contorno oscuro para que se lea sobre cualquier fondo
+            cv2.putText(frame, line, (10, y), cv2.FONT_HERSHEY_PLAIN, 1.0, (0, 0, 0), 3)
+            cv2.putText(frame, line, (10, y), cv2.FONT_HERSHEY_PLAIN, 1.0, (255, 255, 255), 1)
+        return frame
+
+    def dump(self, path=None):
+        """Escribe los percentiles en JSON (reemplazo atómico: nunca queda un archivo a medias)"""
+        path = path or self.dump_path
+        if not path:
+            return
+        data = {'app': self.app_name, 'time': time.time(), 'window': self.window,
+                'stages_ms': self.snapshot()}
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"No se pudo escribir el tiempo por etapa: {e}")
+
+    def start(self):
+        """Arranca el volcado periódico en un hilo (si hay ruta configurada)"""
+        if self.dump_path and self.dump_thread is None:
+            self.stopped.clear()
+            self.dump_thread = threading.Thread(target=self._dump_loop, daemon=True)
+            self.dump_thread.start()
+        return self
+
+    def stop(self):
+        """Detiene el volcado y escribe el último estado"""
+        if self.dump_thread is not None:
+            self.stopped.set()
+            self.dump_thread.join(1.0)
+            self.dump_thread = None
+            self.dump()
+
+    def _dump_loop(self):
+        while not self.stopped.wait(self.dump_interval):
+            self.dump()
@@ -0,0 +1,208 @@
+"""
+Arranque rápido de las apps
+Los módulos pesados (OpenCV, MediaPipe, pyttsx3) se importan de forma
+diferida y se cargan en un hilo después de pintar la interfaz, con el
+avance visible. StartupTimer mide desde el inicio del proceso hasta el
+primer pintado, la carga de modelos y el primer reconocimiento.
+"""
+
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+import types
+
+# Archivo donde se escribe el informe de arranque (lo usa benchmarks/bench_startup.py)
+REPORT_ENV = 'SIGNS_STARTUP_REPORT'
+# Activa la cámara apenas terminan de cargar los modelos (para medir sin intervención)
+AUTOSTART_ENV = 'SIGNS_AUTOSTART_CAMERA'
+# Reconocedor de las apps: 'reglas' o 'modelo' (ver utils/landmark_classifier.py)
+RECOGNIZER_ENV = 'SIGNS_RECOGNIZER'
+RECOGNIZER_MODES = ('reglas', 'modelo')
+
+
+class LazyModule(types.ModuleType):
+    """Módulo que se importa al primer acceso a uno de sus atributos"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_lock'] = threading.Lock()
+
+    def _load(self):
+        with self.__dict__['_lazy_lock']:
+            module = importlib.import_module(self.__name__)
+            # Los atributos quedan en el propio proxy: los accesos siguientes no pasan por aquí
+            self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+def lazy_import(name):
+    """Devuelve el módulo si ya está importado, o un proxy que lo importa al usarlo"""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def preload(*names):
+    """Importa de verdad los módulos (pensado para el hilo de carga)"""
+    return [importlib.import_module(name) for name in names]
+
+
+def process_start_time():
+    """Hora (epoch) de inicio del proceso; None si el sistema no la expone"""
+    try:
+        with open('/proc/self/stat') as f:
+            # El nombre del proceso puede tener espacios: se parte después del ')'
+            fields = f.read().rsplit(')', 1)[1].split()
+        # Edad del proceso con /proc/uptime (btime solo tiene resolución de segundos)
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        age = uptime - int(fields[19]) / os.sysconf('SC_CLK_TCK')
+        return time.time() - max(age, 0.0)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupTimer:
+    """
+    Marcas de tiempo del arranque en segundos desde el inicio del proceso
+
+    Si el sistema no expone el inicio del proceso se mide desde la creación
+    del temporizador (al importar la app).
+    """
+
+    def __init__(self, app_name=''):
+        self.app_name = app_name
+        self.origin = process_start_time() or time.time()
+        self.marks = {}
+        self.durations = {}
+        self.lock = threading.Lock()
+
+    def mark(self, name):
+        """Registra la primera vez que ocurre un hito; las siguientes se ignoran"""
+        with self.lock:
+            if name in self.marks:
+                return False
+            self.marks[name] = time.time() - self.origin
+        print(f"[arranque] {name}: {self.marks[name]:.2f} s")
+        self.write_report()
+        return True
+
+    def elapsed(self, name):
+        return self.marks.get(name)
+
+    def record(self, name, seconds):
+        """Registra una duración que no se mide desde el inicio (la última gana)"""
+        with self.lock:
+            self.durations[name] = seconds
+        print(f"[arranque] {name}: {seconds * 1000:.0f} ms")
+        self.write_report()
+
+    def write_report(self):
+        path = os.environ.get(REPORT_ENV)
+        if not path:
+            return
+        try:
+            with open(path, 'w') as f:
+                json.dump({'app': self.app_name, 'marks': dict(self.marks),
+                           'durations': dict(self.durations)}, f)
+        except OSError as e:
+            print(f"No se pudo escribir el informe de arranque: {e}")
+
+
+class OneShotTimer:
+    """Mide el tiempo entre start() y el primer stop() posterior (p. ej. botón -> primer frame)"""
+
+    def __init__(self):
+        self.started = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            self.started = time.perf_counter()
+
+    def stop(self):
+        """Segundos desde start(), o None si no estaba corriendo"""
+        with self.lock:
+            if self.started is None:
+                return None
+            elapsed = time.perf_counter() - self.started
+            self.started = None
+        return elapsed
+
+
+def autostart_requested():
+    return bool(os.environ.get(AUTOSTART_ENV))
+
+
+def recognizer_mode_requested(default='reglas'):
+    """Modo pedido con SIGNS_RECOGNIZER; un valor desconocido avisa y usa default"""
+    mode = os.environ.get(RECOGNIZER_ENV, '').strip().lower()
+    if not mode:
+        return default
+    if mode not in RECOGNIZER_MODES:
+        print(f"{RECOGNIZER_ENV}={mode!r} no es válido (opciones: {', '.join(RECOGNIZER_MODES)}). Se usa '{default}'")
+        return default
+    return mode
+
+
+class BackgroundLoader:
+    """
+    Ejecuta pasos de carga en orden en un hilo aparte
+
+    steps: lista de (descripción, función sin argumentos)
+    on_progress(fracción, descripción): antes de cada paso y al terminar (1.0, None)
+    on_done(error): al final, con la excepción del paso que falló o None
+    """
+
+    def __init__(self, steps, on_progress=None, on_done=None):
+        self.steps = list(steps)
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.ready = threading.Event()
+        self.error = None
+        self.durations = {}
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        """Espera el final de la carga; devuelve True si terminó sin errores"""
+        self.ready.wait(timeout)
+        return self.ready.is_set() and self.error is None
+
+    @property
+    def loaded(self):
+        return self.ready.is_set() and self.error is None
+
+    def _notify(self, fraction, description):
+        if self.on_progress:
+            try:
+                self.on_progress(fraction, description)
+            except Exception as e:
+                print(f"Error mostrando el progreso de carga: {e}")
+
+    def _run(self):
+        total = len(self.steps)
+        for i, (description, step) in enumerate(self.steps):
+            self._notify(i / total, description)
+            t0 = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                print(f"Error en la carga ({description}): {e}")
+                self.error = e
+                break
+            self.durations[description] = time.perf_counter() - t0
+        if self.error is None:
+            self._notify(1.0, None)
+        self.ready.set()
+        if self.on_done:
+            self.on_done(self.error)
@@ -0,0 +1,132 @@
+"""
+Inferencia de modelos TFLite (fp32, fp16 o int8) en CPU
+Envuelve el intérprete con XNNPACK y una cantidad de hilos configurable. El
+tensor de entrada se reutiliza: la muestra se escribe (y cuantiza si el
+modelo es int8) directamente en el buffer del intérprete, sin copias
+intermedias por frame. El intérprete se importa al crear el clasificador, de
+ai_edge_litert o tflite_runtime si están instalados y de TensorFlow si no.
+"""
+
+import os
+
+import numpy as np
+
+from utils.landmark_classifier import normalize_landmarks
+
+
+def metadata_path(path):
+    """Archivo con etiquetas y estandarización que acompaña a cada .tflite"""
+    return os.path.splitext(path)[0] + '.meta.npz'
+
+
+def save_metadata(path, labels, mean=None, std=None):
+    """Guarda etiquetas y, si el modelo no la incluye, la estandarización de la entrada"""
+    arrays = {'labels': np.asarray(labels).astype(str)}
+    if mean is not None:
+        arrays['mean'] = np.asarray(mean, np.float32)
+        arrays['std'] = np.asarray(std, np.float32)
+    np.savez(metadata_path(path), **arrays)
+
+
+def load_interpreter_class():
+    """Clase Interpreter del runtime más liviano disponible"""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    import tensorflow as tf
+    return tf.lite.Interpreter
+
+
+class TFLiteClassifier:
+    """
+    Clasificador con la misma interfaz que LandmarkClassifier sobre un .tflite
+
+    num_threads: hilos de XNNPACK (None = los que elija el runtime)
+    labels / mean / std: si faltan se leen del .meta.npz junto al modelo
+    """
+
+    def __init__(self, model_path, labels=None, mean=None, std=None, num_threads=None):
+        if labels is None:
+            with np.load(metadata_path(model_path), allow_pickle=False) as meta:
+                labels = meta['labels']
+                if mean is None and 'mean' in meta.files:
+                    mean, std = meta['mean'], meta['std']
+        self.labels = np.asarray(labels)
+        self.mean = None if mean is None else np.asarray(mean, np.float32)
+        self.std = None if std is None else np.asarray(std, np.float32)
+        self.model_path = model_path
+        self.num_threads = num_threads
+
+        interpreter_class = load_interpreter_class()
+        self.interpreter = interpreter_class(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self.input_detail = self.interpreter.get_input_details()[0]
+        self.output_detail = self.interpreter.get_output_details()[0]
+        self.input_dtype = self.input_detail['dtype']
+        self.input_scale, self.input_zero = self.input_detail['quantization']
+        self.output_scale, self.output_zero = self.output_detail['quantization']
+        self.batch_size = int(self.input_detail['shape'][0])
+
+    @property
+    def num_classes(self):
+        return len(self.labels)
+
+    @property
+    def quantized(self):
+        return self.input_dtype != np.float32
+
+    def _ensure_batch(self, batch_size):
+        """Redimensiona la entrada solo cuando cambia el tamaño del lote"""
+        if batch_size == self.batch_size:
+            return
+        shape = list(self.input_detail['shape'])
+        shape[0] = batch_size
+        self.interpreter.resize_tensor_input(self.input_detail['index'], shape)
+        self.interpreter.allocate_tensors()
+        self.input_detail = self.interpreter.get_input_details()[0]
+        self.output_detail = self.interpreter.get_output_details()[0]
+        self.batch_size = batch_size
+
+    def forward(self, x):
+        """
+        Evalúa el modelo sobre un lote ya preparado (N, ...) y devuelve las
+        salidas en float; en modelos int8 x se cuantiza en el lugar
+        """
+        self._ensure_batch(len(x))
+        # Vista del buffer de entrada del intérprete: se escribe en el lugar.
+        # Se descarta antes de invoke() porque el intérprete no admite vistas vivas
+        target = self.interpreter.tensor(self.input_detail['index'])()
+        if self.quantized:
+            np.divide(x, self.input_scale, out=x)
+            x += self.input_zero
+            info = np.iinfo(self.input_dtype)
+            np.clip(np.rint(x, out=x), info.min, info.max, out=x)
+        target[...] = x
+        del target
+
+        self.interpreter.invoke()
+        output = self.interpreter.get_tensor(self.output_detail['index'])
+        if output.dtype != np.float32:
+            output = (output.astype(np.float32) - self.output_zero) * self.output_scale
+        return output
+
+    def predict_proba(self, points):
+        """Probabilidades (N, clases) para un lote de landmarks (N, 21, 3)"""
+        x = normalize_landmarks(points)
+        if self.mean is not None:
+            x -= self.mean
+            x /= self.std
+        return self.forward(x)
+
+    def predict(self, points):
+        """Devuelve (etiquetas, probabilidades) del lote"""
+        proba = self.predict_proba(points)
+        best = proba.argmax(axis=1)
+        return self.labels[best], proba[np.arange(len(best)), best]
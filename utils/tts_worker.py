@@ -0,0 +1,238 @@
+"""
+Voz en un único hilo con un motor persistente
+pyttsx3 tarda cientos de ms en inicializarse y su driver no soporta que
+varios hilos lo usen a la vez (a veces se traba). TTSWorker crea un solo
+motor, en su propio hilo, y lee frases de una cola con prioridad:
+
+  - coalesce: las palabras que llegan seguidas se dicen juntas en una frase
+  - max_age: una frase que esperó más que eso ya no tiene sentido y se descarta
+  - key: una frase nueva reemplaza a las pendientes con la misma clave
+  - cancel(): vacía la cola y corta la frase en curso (en la próxima palabra)
+
+stats() informa el largo de la cola y la latencia (de encolar a empezar a
+hablar) con percentiles; con un StageTimer la latencia aparece además como
+la etapa 'voz_latencia'.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+from utils.stage_timing import RollingPercentiles
+from utils.startup import lazy_import
+
+pyttsx3 = lazy_import('pyttsx3')
+
+# Prioridades: menor número, antes se dice
+URGENT = 0
+NORMAL = 1
+LOW = 2
+
+
+class Utterance:
+    __slots__ = ('text', 'priority', 'coalesce', 'max_age', 'key', 'on_start', 'on_done', 'queued_at')
+
+    def __init__(self, text, priority, coalesce, max_age, key, on_start, on_done):
+        self.text = text
+        self.priority = priority
+        self.coalesce = coalesce
+        self.max_age = max_age
+        self.key = key
+        self.on_start = on_start
+        self.on_done = on_done
+        self.queued_at = time.perf_counter()
+
+
+class TTSWorker:
+    """
+    Dueño del motor de voz
+
+    start(): crea el motor en el hilo de voz; wait_ready() dice si quedó disponible
+    say(texto, ...): encola sin bloquear (False si no hay voz)
+    close(): corta lo pendiente y termina el hilo
+    """
+
+    def __init__(self, rate=150, volume=0.9, engine_factory=None, timer=None, max_queue=32):
+        self.rate = rate
+        self.volume = volume
+        # None: pyttsx3.init, importado recién en el hilo de voz
+        self.engine_factory = engine_factory
+        self.timer = timer
+        self.max_queue = max_queue
+        self.heap = []
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.engine = None
+        self.available = False
+        self.closed = False
+        self.speaking = None
+        self.cancel_current = False
+        self.ready = threading.Event()
+        self.thread = None
+        self.init_ms = None
+        self.latency = RollingPercentiles(100)
+        self.counts = {'dichas': 0, 'unidas': 0, 'descartadas': 0, 'canceladas': 0, 'errores': 0}
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        return self
+
+    def wait_ready(self, timeout=None):
+        """Espera a que el motor se inicialice; True si hay voz"""
+        self.ready.wait(timeout)
+        return self.available
+
+    def say(self, text, priority=NORMAL, coalesce=False, max_age=None, key=None, on_start=None, on_done=None):
+        """
+        Encola una frase
+
+        on_start(texto) se llama al empezar a decirla y on_done(texto, error)
+        al terminar, ambos desde el hilo de voz.
+        """
+        text = text.strip()
+        if not text or self.closed or (self.ready.is_set() and not self.available):
+            return False
+        utterance = Utterance(text, priority, coalesce, max_age, key, on_start, on_done)
+        with self.condition:
+            if key is not None:
+                self._remove(lambda u: u.key == key)
+            if len(self.heap) >= self.max_queue:
+                # Cola llena: se pierde lo menos importante y más viejo
+                worst = max(self.heap, key=lambda item: (item[0], -item[1]))
+                self.heap.remove(worst)
+                heapq.heapify(self.heap)
+                self.counts['descartadas'] += 1
+            heapq.heappush(self.heap, (priority, next(self.sequence), utterance))
+            self.condition.notify()
+        return True
+
+    def cancel(self):
+        """
+        Vacía la cola y corta la frase que se está diciendo
+
+        La frase en curso se corta recién en el próximo callback 'started-word'
+        del motor; con drivers que no lo emiten se termina de decir entera.
+        """
+        with self.condition:
+            self.counts['canceladas'] += len(self.heap)
+            self.heap.clear()
+            if self.speaking is not None:
+                # El motor se detiene desde su propio hilo (callback de pyttsx3)
+                self.cancel_current = True
+
+    def close(self, timeout=2.0):
+        if self.closed:
+            return
+        self.cancel()
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def queue_depth(self):
+        with self.condition:
+            return len(self.heap)
+
+    def stats(self):
+        """{'cola', 'motor_ms', 'latencia_ms': {p50, p95, p99, max, count} o None, dichas, unidas, ...}"""
+        with self.condition:
+            result = {'cola': len(self.heap), 'motor_ms': self.init_ms, **self.counts}
+        result['latencia_ms'] = self.latency.summary()
+        return result
+
+    def _remove(self, predicate):
+        kept = [item for item in self.heap if not predicate(item[2])]
+        removed = len(self.heap) - len(kept)
+        if removed:
+            self.heap[:] = kept
+            heapq.heapify(self.heap)
+            self.counts['descartadas'] += removed
+
+    def _next(self):
+        """Próxima frase (unida con las que se pueden decir juntas); None al cerrar"""
+        with self.condition:
+            while True:
+                while not self.heap and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return None
+                _, _, first = heapq.heappop(self.heap)
+                now = time.perf_counter()
+                if first.max_age is not None and now - first.queued_at > first.max_age:
+                    self.counts['descartadas'] += 1
+                    continue
+                batch = [first]
+                if first.coalesce:
+                    # Las que esperan con la misma prioridad se dicen de corrido
+                    while self.heap and self.heap[0][0] == first.priority and self.heap[0][2].coalesce:
+                        u = heapq.heappop(self.heap)[2]
+                        if u.max_age is not None and now - u.queued_at > u.max_age:
+                            self.counts['descartadas'] += 1
+                        else:
+                            batch.append(u)
+                    self.counts['unidas'] += len(batch) - 1
+                self.speaking = batch
+                self.cancel_current = False
+                return batch
+
+    def _on_word(self, *args):
+        if self.cancel_current:
+            self.engine.stop()
+
+    def _run(self):
+        t0 = time.perf_counter()
+        try:
+            self.engine = (self.engine_factory or pyttsx3.init)()
+            self.engine.setProperty('rate', self.rate)
+            self.engine.setProperty('volume', self.volume)
+            try:
+                self.engine.connect('started-word', self._on_word)
+            except (AttributeError, NotImplementedError):
+                pass
+            self.available = True
+        except Exception as e:
+            print(f"TTS no disponible: {e}")
+        self.init_ms = (time.perf_counter() - t0) * 1000
+        self.ready.set()
+        if not self.available:
+            return
+
+        while True:
+            batch = self._next()
+            if batch is None:
+                break
+            text = " ".join(u.text for u in batch)
+            started = time.perf_counter()
+            for u in batch:
+                latency = started - u.queued_at
+                self.latency.add(latency * 1000)
+                if self.timer is not None:
+                    self.timer.add('voz_latencia', latency)
+            error = None
+            try:
+                if batch[0].on_start:
+                    batch[0].on_start(text)
+                self.engine.say(text)
+                self.engine.runAndWait()
+                self.counts['dichas'] += 1
+            except Exception as e:
+                print(f"Error TTS: {e}")
+                self.counts['errores'] += 1
+                error = e
+            with self.condition:
+                self.speaking = None
+            for u in batch:
+                if u.on_done:
+                    try:
+                        u.on_done(text, error)
+                    except Exception as e:
+                        print(f"Error al terminar de leer: {e}")
+
+        try:
+            self.engine.stop()
+        except Exception:
+            pass
@@ -0,0 +1,93 @@
+"""
+Actualizaciones dirigidas de la interfaz
+En lugar de llamar page.update() en cada frame (que compara todo el árbol de
+controles), se registra qué controles cambiaron realmente y solo esos se
+envían a Flet. Los textos se actualizan únicamente cuando cambia su valor y
+con una frecuencia máxima; la imagen de la cámara se envía en cada frame.
+"""
+
+import threading
+import time
+
+_MISSING = object()
+
+
+class UIRefresher:
+    """
+    Registro de controles modificados entre dos envíos a Flet
+
+    page: página de Flet donde se publican los cambios
+    min_interval: segundos mínimos entre envíos de controles de texto
+    """
+
+    def __init__(self, page, min_interval=0.1):
+        self.page = page
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.dirty = {}
+        self.urgent = {}
+        self.last_flush = 0.0
+
+        # Métricas para comparar con el refresco completo
+        self.flushes = 0
+        self.controls_sent = 0
+        self.skipped_sets = 0
+
+    def set(self, control, **props):
+        """
+        Asigna propiedades a un control y lo marca solo si algo cambió
+
+        Devuelve True si el control quedó pendiente de actualizar.
+        """
+        changed = False
+        with self.lock:
+            for name, value in props.items():
+                if getattr(control, name, _MISSING) != value:
+                    setattr(control, name, value)
+                    changed = True
+            if changed:
+                self.dirty[id(control)] = control
+            else:
+                self.skipped_sets += 1
+        return changed
+
+    def mark(self, control, immediate=False):
+        """Marca un control ya modificado; immediate lo envía en el próximo flush"""
+        with self.lock:
+            if immediate:
+                self.urgent[id(control)] = control
+            else:
+                self.dirty[id(control)] = control
+
+    def flush(self, force=False):
+        """Envía a Flet los controles pendientes; devuelve cuántos se enviaron"""
+        now = time.perf_counter()
+        with self.lock:
+            pending = dict(self.urgent)
+            self.urgent.clear()
+            if self.dirty and (force or now - self.last_flush >= self.min_interval):
+                pending.update(self.dirty)
+                self.dirty.clear()
+                self.last_flush = now
+        controls = list(pending.values())
+
+        if not controls or not self.page:
+            return 0
+        try:
+            self.page.update(*controls)
+        except Exception as e:
+            print(f"Error actualizando la interfaz: {e}")
+            return 0
+        self.flushes += 1
+        self.controls_sent += len(controls)
+        return len(controls)
+
+    def stats(self):
+        """Métricas del refresco para reportes"""
+        with self.lock:
+            return {
+                'flushes': self.flushes,
+                'controls_sent': self.controls_sent,
+                'skipped_sets': self.skipped_sets,
+                'pending': len(self.dirty) + len(self.urgent),
+            }
@@ -0,0 +1,248 @@
+"""
+Transporte de video MJPEG
+Servidor HTTP local que publica los frames como JPEG crudos en un flujo
+multipart/x-mixed-replace; el control Image de Flet apunta a su URL en lugar
+de recibir cada frame en base64 dentro de page.update().
+
+Por defecto escucha solo en 127.0.0.1 y cada servidor exige un token
+aleatorio en la URL, así nadie más en la red puede ver la cámara.
+SIGNS_STREAM_HOST=0.0.0.0 lo abre a clientes remotos (con el mismo token).
+"""
+
+import hmac
+import os
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+BOUNDARY = 'frame'
+
+# Interfaz donde escucha el flujo (por defecto solo este equipo)
+HOST_ENV = 'SIGNS_STREAM_HOST'
+DEFAULT_HOST = '127.0.0.1'
+_LOCAL_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    """Atiende /video.mjpg (flujo continuo) y /frame.jpg (último frame)"""
+
+    protocol_version = 'HTTP/1.0'
+
+    def do_GET(self):
+        stream = self.server.stream
+        url = urlparse(self.path)
+        if not stream.authorized(parse_qs(url.query).get('token', [''])[0]):
+            self.send_error(403)
+            return
+        path = url.path
+        if path == stream.path:
+            self._send_stream(stream)
+        elif path == stream.snapshot_path:
+            self._send_snapshot(stream)
+        else:
+            self.send_error(404)
+
+    def _send_snapshot(self, stream):
+        _, frame = stream.latest()
+        if frame is None:
+            self.send_error(503, "Sin frames")
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(frame)))
+        self.send_header('Cache-Control', 'no-cache, no-store')
+        self.end_headers()
+        self.wfile.write(frame)
+        stream._count_sent(len(frame))
+
+    def _send_stream(self, stream):
+        if not stream._add_client():
+            self.send_error(503, "Demasiados clientes")
+            return
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', f'multipart/x-mixed-replace; boundary={BOUNDARY}')
+            self.send_header('Cache-Control', 'no-cache, no-store')
+            self.send_header('Pragma', 'no-cache')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+
+            seq = -1
+            while stream.running:
+                seq, frame = stream.wait_frame(seq)
+                if frame is None:
+                    continue
+                # Solo se envía el frame más reciente: un cliente lento salta
+                # frames en lugar de acumular retraso
+                self.wfile.write(
+                    f'--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n'
+                    f'Content-Length: {len(frame)}\r\n\r\n'.encode('ascii')
+                )
+                self.wfile.write(frame)
+                self.wfile.write(b'\r\n')
+                stream._count_sent(len(frame))
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            pass
+        finally:
+            stream._remove_client()
+
+    def log_message(self, format, *args):
+        # Sin log por petición: el flujo genera una conexión larga por cliente
+        pass
+
+
+class MJPEGStreamServer:
+    """
+    Servidor MJPEG con el último frame publicado
+
+    host: interfaz donde escuchar ('127.0.0.1' para la app de escritorio,
+    '0.0.0.0' para servir clientes remotos en modo navegador)
+    port: 0 elige un puerto libre
+    token: se exige como ?token= en cada petición (por defecto uno aleatorio)
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=0, path='/video.mjpg',
+                 snapshot_path='/frame.jpg', max_clients=8, public_host=None, token=None):
+        self.host = host
+        self.port = port
+        self.public_host = public_host
+        self.token = token or secrets.token_urlsafe(16)
+        self.sessions = 0
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.max_clients = max_clients
+
+        self.cond = threading.Condition()
+        self.frame = None
+        self.seq = 0
+        self.running = False
+        self.server = None
+        self.thread = None
+
+        # Métricas del transporte
+        self.clients = 0
+        self.frames_published = 0
+        self.frames_sent = 0
+        self.bytes_sent = 0
+
+    def start(self):
+        """Arranca el servidor en un hilo propio y devuelve la URL del flujo"""
+        if self.running:
+            return self.url()
+        self.server = ThreadingHTTPServer((self.host, self.port), _StreamHandler)
+        self.server.daemon_threads = True
+        self.server.stream = self
+        self.port = self.server.server_address[1]
+        self.running = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True,
+                                       name="mjpeg-stream")
+        self.thread.start()
+        return self.url()
+
+    def stop(self):
+        """Cierra el servidor y despierta a los clientes conectados"""
+        if not self.running:
+            return
+        self.running = False
+        with self.cond:
+            self.cond.notify_all()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def url(self, fresh=False):
+        """
+        URL del flujo para los clientes
+
+        fresh: agrega un parámetro nuevo para que el navegador vuelva a abrir
+        el flujo en lugar de mostrar la conexión anterior en caché
+        """
+        host = self.public_host or ('127.0.0.1' if self.host in ('', '0.0.0.0') else self.host)
+        url = f"http://{host}:{self.port}{self.path}?token={self.token}"
+        if fresh:
+            self.sessions += 1
+            url += f"&s={self.sessions}"
+        return url
+
+    def authorized(self, token):
+        return hmac.compare_digest(token.encode('utf-8'), self.token.encode('utf-8'))
+
+    def publish(self, jpeg_bytes):
+        """Publica un frame JPEG ya codificado (bytes)"""
+        with self.cond:
+            self.frame = jpeg_bytes
+            self.seq += 1
+            self.frames_published += 1
+            self.cond.notify_all()
+
+    def latest(self):
+        """Devuelve (secuencia, frame) del último frame publicado"""
+        with self.cond:
+            return self.seq, self.frame
+
+    def wait_frame(self, last_seq, timeout=0.5):
+        """Espera un frame más nuevo que last_seq; devuelve (secuencia, frame o None)"""
+        with self.cond:
+            if self.seq == last_seq and self.running:
+                self.cond.wait(timeout)
+            if self.seq == last_seq:
+                return last_seq, None
+            return self.seq, self.frame
+
+    def stats(self):
+        """Métricas del transporte para reportes"""
+        with self.cond:
+            return {
+                'clients': self.clients,
+                'frames_published': self.frames_published,
+                'frames_sent': self.frames_sent,
+                'bytes_sent': self.bytes_sent,
+            }
+
+    def _add_client(self):
+        with self.cond:
+            if self.clients >= self.max_clients:
+                return False
+            self.clients += 1
+            return True
+
+    def _remove_client(self):
+        with self.cond:
+            self.clients -= 1
+
+    def _count_sent(self, size):
+        with self.cond:
+            self.frames_sent += 1
+            self.bytes_sent += size
+
+
+def start_stream_for_page(page, host=None):
+    """
+    Arranca el flujo MJPEG si la app corre en el navegador; si no, devuelve None
+
+    En escritorio el control Image de Flutter no reproduce flujos multipart,
+    así que ahí se mantiene src_base64. host (o SIGNS_STREAM_HOST, por
+    defecto 127.0.0.1) es la interfaz donde escuchar; la URL usa el mismo
+    host con el que el cliente abrió la página. Si el flujo no sería
+    alcanzable (página remota con el servidor solo local) o el navegador lo
+    bloquearía (página por HTTPS y flujo por HTTP) también se devuelve None y
+    el video sigue en base64.
+    """
+    if not getattr(page, 'web', False):
+        return None
+    host = host or os.environ.get(HOST_ENV) or DEFAULT_HOST
+    page_url = urlparse(getattr(page, 'url', None) or '')
+    public_host = page_url.hostname
+    if page_url.scheme == 'https':
+        print("Página servida por HTTPS: el flujo MJPEG (HTTP) se bloquearía, se usa base64")
+        return None
+    if host in _LOCAL_HOSTS and public_host and public_host not in _LOCAL_HOSTS:
+        print(f"El flujo de video solo escucha en {host}; para clientes remotos usar {HOST_ENV}=0.0.0.0")
+        return None
+    stream = MJPEGStreamServer(host=host, public_host=public_host)
+    try:
+        stream.start()
+    except OSError as e:
+        print(f"No se pudo iniciar el flujo de video: {e}")
+        return None
+    return stream
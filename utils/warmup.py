@@ -0,0 +1,80 @@
+"""
+Calentamiento de MediaPipe Hands
+La primera llamada a hands.process inicializa el grafo y el detector de
+palmas, y la primera mano detectada inicializa el modelo de landmarks: sin
+calentar, el primer segundo de cámara se traba. Aquí se pasan por el grafo
+frames sintéticos (una mano dibujada y frames vacíos) antes de que llegue el
+primer frame real, y se termina sin mano para no dejar un seguimiento
+fantasma. La misma instancia de Hands se reutiliza en toda la sesión.
+"""
+
+import time
+
+import numpy as np
+
+from utils.startup import lazy_import
+
+cv2 = lazy_import('cv2')
+
+# Dedos de la mano sintética: (desplazamiento x, largo, ángulo) en píxeles a 480 de alto
+_FINGERS = [(-30, 120, -8), (0, 130, 0), (28, 120, 8), (52, 95, 18)]
+
+
+def synthetic_hand_frame(width=640, height=480, seed=0):
+    """
+    Frame RGB con una mano abierta dibujada sobre fondo claro
+
+    El desenfoque hace que el detector de palmas la acepte, así el
+    calentamiento también ejercita el modelo de landmarks.
+    """
+    rng = np.random.default_rng(seed)
+    frame = np.full((height, width, 3), (200, 200, 210), np.uint8)
+    skin = (224, 172, 140)
+    s = height / 480
+    cx, cy = width // 2 + int(rng.integers(-10, 10) * s), int(height * 0.62)
+
+    cv2.ellipse(frame, (cx, cy), (int(70 * s), int(80 * s)), 0, 0, 360, skin, -1)
+    # Pulgar hacia un costado y los demás dedos hacia arriba
+    fingers = [(cx - int(65 * s), cy, np.deg2rad(-150), 90)]
+    fingers += [(cx + int(dx * s), cy - int(50 * s), np.deg2rad(angle - 90), length)
+                for dx, length, angle in _FINGERS]
+    for x0, y0, angle, length in fingers:
+        x1 = x0 + int(length * s * np.cos(angle))
+        y1 = y0 + int(length * s * np.sin(angle))
+        cv2.line(frame, (x0, y0), (x1, y1), skin, max(1, int(26 * s)))
+        cv2.circle(frame, (x1, y1), max(1, int(13 * s)), skin, -1)
+    return cv2.GaussianBlur(frame, (0, 0), 3 * s)
+
+
+def warm_up_hands(hands, width=640, height=480, hand_frames=3, max_blank_frames=5):
+    """
+    Pasa frames sintéticos por hands.process y devuelve un resumen
+
+    Orden: un frame vacío (grafo y detector de palmas), varias manos
+    (modelo de landmarks y seguimiento) y frames vacíos hasta que el
+    seguimiento suelta la mano. Devuelve {'first_ms', 'total_ms', 'frames',
+    'hand_detected'}.
+    """
+    blank = np.zeros((height, width, 3), np.uint8)
+    timings = []
+    hand_detected = False
+
+    def run(frame):
+        t0 = time.perf_counter()
+        results = hands.process(frame)
+        timings.append((time.perf_counter() - t0) * 1000)
+        return bool(results.multi_hand_landmarks)
+
+    run(blank)
+    for seed in range(hand_frames):
+        hand_detected |= run(synthetic_hand_frame(width, height, seed))
+    for _ in range(max_blank_frames):
+        if not run(blank):
+            break
+
+    return {
+        'first_ms': timings[0],
+        'total_ms': sum(timings),
+        'frames': len(timings),
+        'hand_detected': hand_detected,
+    }